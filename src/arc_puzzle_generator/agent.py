@@ -1,12 +1,8 @@
-import logging
-from typing import Iterator, Iterable, Optional, Sequence, Union
+from typing import Iterator, Iterable, Optional, Sequence, Union, Callable
 
 from arc_puzzle_generator.geometry import PointSet, Direction
 from arc_puzzle_generator.rule import RuleNode
 from arc_puzzle_generator.state import AgentState, AgentStateMapping
-from arc_puzzle_generator.utils.callable import get_callable_name
-
-logger = logging.getLogger(__name__)
 
 
 class Agent:
@@ -55,6 +51,7 @@ class Agent:
             self,
             collision: PointSet,
             collision_mapping: AgentStateMapping,
+            on_rule: Optional[Callable[[RuleNode, Optional[AgentState]], None]] = None,
     ) -> tuple[Iterable[AgentState], list['Agent']]:
         states = [self.state]
         children: list['Agent'] = []
@@ -68,9 +65,11 @@ class Agent:
             current = stack.pop()
             result = current.rule(states, self.colors, collision, collision_mapping)
 
+            if on_rule is not None:
+                on_rule(current, None if result is None else result[0])
+
             if result is not None:
                 state, colors, rule_children = result
-                logger.debug(f"Rule {get_callable_name(current.rule)} produced state: {state}")
 
                 self.position = state.position
                 self.direction = state.direction
@@ -0,0 +1,145 @@
+"""
+The augmentation module transforms already computed pairs and trajectories with the symmetries of the square (D4)
+and color permutations, without re-running the puzzle.
+"""
+from typing import Literal, NamedTuple, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from arc_puzzle_generator.playground import ModelSetup
+from arc_puzzle_generator.utils.data_loader import Pair
+
+Symmetry = Literal["identity", "rot90", "rot180", "rot270", "flip_horizontal", "flip_vertical", "transpose",
+                   "anti_transpose"]
+"""
+The eight symmetries of the square (dihedral group D4).
+"""
+
+SYMMETRIES: Sequence[Symmetry] = (
+    "identity", "rot90", "rot180", "rot270", "flip_horizontal", "flip_vertical", "transpose", "anti_transpose"
+)
+
+
+class Augmentation(NamedTuple):
+    """
+    An augmentation consisting of a symmetry and a color permutation.
+
+    :param symmetry: The symmetry applied to the grid.
+    :param permutation: Maps every color to its new color, i.e. `permutation[color]`.
+    """
+    symmetry: Symmetry
+    permutation: np.ndarray
+
+
+def apply_symmetry(grids: np.ndarray, symmetry: Symmetry) -> np.ndarray:
+    """
+    Apply a symmetry to a grid or a stack of grids, the symmetry is applied to the last two axes.
+
+    :param grids: A grid (H, W) or a trajectory of grids (T, H, W).
+    :param symmetry: The symmetry to apply.
+    :return: The transformed grid(s).
+    """
+
+    match symmetry:
+        case "identity":
+            return grids
+        case "rot90":
+            return np.rot90(grids, k=1, axes=(-2, -1))
+        case "rot180":
+            return np.rot90(grids, k=2, axes=(-2, -1))
+        case "rot270":
+            return np.rot90(grids, k=3, axes=(-2, -1))
+        case "flip_horizontal":
+            return np.flip(grids, axis=-1)
+        case "flip_vertical":
+            return np.flip(grids, axis=-2)
+        case "transpose":
+            return np.swapaxes(grids, -2, -1)
+        case "anti_transpose":
+            return np.rot90(np.swapaxes(grids, -2, -1), k=2, axes=(-2, -1))
+
+    raise ValueError(f"Unknown symmetry: {symmetry}")
+
+
+def augment(grids: np.ndarray, augmentation: Augmentation) -> np.ndarray:
+    """
+    Apply an augmentation to a grid or a stack of grids.
+
+    :param grids: A grid (H, W) or a trajectory of grids (T, H, W).
+    :param augmentation: The augmentation to apply.
+    :return: The augmented grid(s) as a new contiguous array.
+    """
+
+    return np.ascontiguousarray(augmentation.permutation[apply_symmetry(grids, augmentation.symmetry)])
+
+
+def random_augmentation(
+        rng: np.random.Generator,
+        symmetries: Sequence[Symmetry] = SYMMETRIES,
+        fixed_colors: Iterable[int] = (),
+        num_colors: int = 10,
+) -> Augmentation:
+    """
+    Draw a random augmentation.
+
+    :param rng: The random number generator.
+    :param symmetries: The symmetries to choose from.
+    :param fixed_colors: Colors with a meaning in the puzzle, which are not permuted.
+    :param num_colors: The number of colors.
+    :return: A random augmentation.
+    """
+
+    fixed = set(fixed_colors)
+    free_colors = [color for color in range(num_colors) if color not in fixed]
+    permuted_colors = rng.permutation(free_colors)
+
+    permutation = np.arange(num_colors)
+    permutation[free_colors] = permuted_colors
+
+    return Augmentation(symmetry=symmetries[int(rng.integers(len(symmetries)))], permutation=permutation)
+
+
+def augment_pairs(
+        pairs: Iterable[Pair],
+        num_augmentations: int,
+        seed: Optional[int] = None,
+        symmetries: Sequence[Symmetry] = SYMMETRIES,
+        fixed_colors: Iterable[int] = (),
+        model_function: Optional[ModelSetup] = None,
+        verify_fraction: float = 0.0,
+) -> Iterator[Pair]:
+    """
+    Augment pairs with random symmetries and color permutations.
+    In verification mode a fraction of the augmented pairs is re-simulated, to catch puzzles that are not equivariant
+    under the augmentations.
+
+    :param pairs: The pairs to augment.
+    :param num_augmentations: The number of augmented pairs per pair.
+    :param seed: The seed for the random number generator.
+    :param symmetries: The symmetries to choose from, e.g. only those under which the puzzle is equivariant.
+    :param fixed_colors: Colors with a meaning in the puzzle, which are not permuted.
+    :param model_function: The puzzle setup, required for verification.
+    :param verify_fraction: The fraction of augmented pairs to re-simulate.
+    :return: An iterator over the augmented pairs.
+    """
+
+    if verify_fraction > 0 and model_function is None:
+        raise ValueError("A model function is required to verify augmented pairs.")
+
+    rng = np.random.default_rng(seed)
+    fixed_colors = list(fixed_colors)
+
+    for pair in pairs:
+        for _ in range(num_augmentations):
+            augmentation = random_augmentation(rng, symmetries, fixed_colors)
+            augmented_pair = Pair(input=augment(pair.input, augmentation), output=augment(pair.output, augmentation))
+
+            if model_function is not None and rng.random() < verify_fraction:
+                output_grid = augmented_pair.input
+                for output_grid in model_function(augmented_pair.input.copy()):
+                    pass
+
+                if not np.array_equal(output_grid, augmented_pair.output):
+                    raise ValueError(f"The puzzle is not equivariant under {augmentation}")
+
+            yield augmented_pair
@@ -0,0 +1,282 @@
+"""
+The dataset module streams generated records to disk and reads them back.
+
+Records are appended to size-capped shards in a compact binary format, where every cell is stored in 4 bits.
+Every shard has an index file containing the offset, length and content hash of each record. The index is written
+after the record, so it is authoritative: after an interruption, bytes beyond the last indexed record are discarded
+and writing resumes where it left off.
+"""
+import hashlib
+import struct
+from multiprocessing.queues import Queue
+from pathlib import Path
+from typing import NamedTuple, Optional, Iterator, BinaryIO
+
+import numpy as np
+
+HEADER = struct.Struct("<HHHHI")
+"""
+The record header: input rows, input columns, output rows, output columns and the number of trajectory steps.
+"""
+
+INDEX_ENTRY = struct.Struct("<QI16s")
+"""
+An index entry: the offset and length of a record within its shard and the content hash of the record.
+"""
+
+
+class Record(NamedTuple):
+    """
+    A dataset record.
+
+    :param input: The input grid.
+    :param output: The output grid.
+    :param trajectory: The optional trajectory from input to output, with the same grid shape as the input.
+    """
+    input: np.ndarray
+    output: np.ndarray
+    trajectory: Optional[np.ndarray] = None
+
+
+def pack_grid(grid: np.ndarray) -> bytes:
+    """
+    Pack a grid (or a stack of grids) with two cells per byte.
+
+    :param grid: The grid to pack, all colors must be smaller than 16.
+    :return: The packed bytes.
+    """
+
+    if grid.size > 0 and (grid.min() < 0 or grid.max() > 15):
+        raise ValueError("Only colors between 0 and 15 can be packed.")
+
+    flat: np.ndarray = grid.astype(np.uint8).ravel()
+
+    if flat.size % 2 == 1:
+        flat = np.append(flat, np.uint8(0))
+
+    return ((flat[0::2] << 4) | flat[1::2]).tobytes()
+
+
+def unpack_grid(data: bytes, shape: tuple[int, ...]) -> np.ndarray:
+    """
+    Unpack a grid packed by `pack_grid`.
+
+    :param data: The packed bytes.
+    :param shape: The shape of the grid.
+    :return: The unpacked grid.
+    """
+
+    packed = np.frombuffer(data, dtype=np.uint8)
+    flat = np.empty(packed.size * 2, dtype=np.uint8)
+    flat[0::2] = packed >> 4
+    flat[1::2] = packed & 0x0F
+
+    return flat[:int(np.prod(shape))].reshape(shape).astype(int)
+
+
+def encode_record(record: Record) -> bytes:
+    """
+    Encode a record in the binary dataset format.
+
+    :param record: The record to encode.
+    :return: The encoded record.
+    """
+
+    num_steps = 0 if record.trajectory is None else len(record.trajectory)
+    data = [
+        HEADER.pack(*record.input.shape, *record.output.shape, num_steps),
+        pack_grid(record.input),
+        pack_grid(record.output),
+    ]
+
+    if record.trajectory is not None:
+        if record.trajectory.shape[1:] != record.input.shape:
+            raise ValueError("The trajectory grids must have the same shape as the input grid.")
+
+        data.append(pack_grid(record.trajectory))
+
+    return b"".join(data)
+
+
+def decode_record(data: bytes) -> Record:
+    """
+    Decode a record from the binary dataset format.
+
+    :param data: The encoded record.
+    :return: The decoded record.
+    """
+
+    input_rows, input_cols, output_rows, output_cols, num_steps = HEADER.unpack_from(data)
+    offset = HEADER.size
+
+    input_length = (input_rows * input_cols + 1) // 2
+    input_grid = unpack_grid(data[offset:offset + input_length], (input_rows, input_cols))
+    offset += input_length
+
+    output_length = (output_rows * output_cols + 1) // 2
+    output_grid = unpack_grid(data[offset:offset + output_length], (output_rows, output_cols))
+    offset += output_length
+
+    trajectory = None
+    if num_steps > 0:
+        trajectory = unpack_grid(data[offset:], (num_steps, input_rows, input_cols))
+
+    return Record(input=input_grid, output=output_grid, trajectory=trajectory)
+
+
+def content_hash(record: Record) -> bytes:
+    """
+    The content hash of a record, which only depends on its input and output grids.
+
+    :param record: The record to hash.
+    :return: A 16-byte digest.
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(HEADER.pack(*record.input.shape, *record.output.shape, 0))
+    digest.update(pack_grid(record.input))
+    digest.update(pack_grid(record.output))
+    return digest.digest()
+
+
+def _shard_paths(directory: Path) -> list[Path]:
+    return sorted(directory.glob("shard-*.bin"))
+
+
+class DatasetWriter:
+    """
+    Appends records to size-capped shards, skipping records whose content hash has been written before.
+    Opening a writer on an existing dataset resumes it: the hashes of all indexed records are loaded and any record
+    which was not fully written before an interruption is discarded.
+
+    A writer must only be used by a single process. To write from multiple worker processes, the workers put their
+    records on a queue which is consumed by the writer, see `DatasetWriter.consume`.
+    """
+
+    def __init__(self, directory: Path, max_shard_size: int = 64 * 2 ** 20) -> None:
+        """
+        Open a dataset for writing.
+        :param directory: The directory of the dataset, created if it does not exist.
+        :param max_shard_size: The size in bytes after which a new shard is started.
+        """
+        self.directory = directory
+        self.max_shard_size = max_shard_size
+        self.hashes: set[bytes] = set()
+        self.num_written = 0
+        self.num_duplicates = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        shard_paths = _shard_paths(directory)
+        for shard_path in shard_paths:
+            self._recover(shard_path)
+
+        self.shard_idx = len(shard_paths) - 1 if len(shard_paths) > 0 else 0
+        self._shard: Optional[BinaryIO] = None
+        self._index: Optional[BinaryIO] = None
+        self._open_shard()
+
+    def _recover(self, shard_path: Path) -> None:
+        index_path = shard_path.with_suffix(".idx")
+        entries = index_path.read_bytes() if index_path.exists() else b""
+
+        # drop a partially written index entry
+        num_entries = len(entries) // INDEX_ENTRY.size
+        end = 0
+        for offset, length, digest in INDEX_ENTRY.iter_unpack(entries[:num_entries * INDEX_ENTRY.size]):
+            self.hashes.add(digest)
+            end = max(end, offset + length)
+
+        # drop records which were written but not indexed
+        with index_path.open("ab") as index:
+            index.truncate(num_entries * INDEX_ENTRY.size)
+        with shard_path.open("ab") as shard:
+            shard.truncate(end)
+
+    def _open_shard(self) -> None:
+        self.close()
+        shard_path = self.directory / f"shard-{self.shard_idx:05d}.bin"
+        self._shard = shard_path.open("ab")
+        self._index = shard_path.with_suffix(".idx").open("ab")
+
+    def write(self, record: Record) -> bool:
+        """
+        Append a record to the dataset.
+
+        :param record: The record to write.
+        :return: Whether the record was written, False if it is a duplicate.
+        """
+        digest = content_hash(record)
+        if digest in self.hashes:
+            self.num_duplicates += 1
+            return False
+
+        data = encode_record(record)
+
+        assert self._shard is not None and self._index is not None
+        offset = self._shard.tell()
+        if offset > 0 and offset + len(data) > self.max_shard_size:
+            self.shard_idx += 1
+            self._open_shard()
+            assert self._shard is not None and self._index is not None
+            offset = 0
+
+        self._shard.write(data)
+        self._shard.flush()
+        self._index.write(INDEX_ENTRY.pack(offset, len(data), digest))
+        self._index.flush()
+
+        self.hashes.add(digest)
+        self.num_written += 1
+        return True
+
+    def consume(self, queue: "Queue[Optional[Record]]", num_producers: int = 1) -> None:
+        """
+        Write records from a queue until every producer has put a `None` sentinel on it.
+
+        :param queue: The queue the worker processes put their records on.
+        :param num_producers: The number of worker processes feeding the queue.
+        """
+        finished = 0
+        while finished < num_producers:
+            record = queue.get()
+            if record is None:
+                finished += 1
+            else:
+                self.write(record)
+
+    def close(self) -> None:
+        """Close the current shard and its index."""
+        if self._shard is not None:
+            self._shard.close()
+            self._shard = None
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def __enter__(self) -> 'DatasetWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def read_dataset(directory: Path) -> Iterator[Record]:
+    """
+    Read all records of a dataset in the order they were written.
+
+    :param directory: The directory of the dataset.
+    :return: An iterator over the records.
+    """
+
+    for shard_path in _shard_paths(directory):
+        entries = shard_path.with_suffix(".idx").read_bytes()
+        num_entries = len(entries) // INDEX_ENTRY.size
+
+        with shard_path.open("rb") as shard:
+            for offset, length, _ in INDEX_ENTRY.iter_unpack(entries[:num_entries * INDEX_ENTRY.size]):
+                shard.seek(offset)
+                data = shard.read(length)
+
+                if len(data) == length:
+                    yield decode_record(data)
@@ -0,0 +1,263 @@
+"""
+Export module for ARC puzzle generators.
+
+This module renders the trajectory of a playground to GIF, MP4 or PNG sprite sheets without a GUI.
+Frames are rasterised directly from the ARC color palette into RGB arrays, so no matplotlib figures are involved
+and many tasks can be exported in parallel worker processes.
+"""
+import argparse
+import math
+import shutil
+import subprocess
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Iterable, Iterator, Literal, NamedTuple, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+from arc_puzzle_generator.puzzles import get_puzzle, TASKS
+from arc_puzzle_generator.utils.data_loader import load_puzzle
+from arc_puzzle_generator.utils.palette import ARC_PALETTE
+
+ExportFormat = Literal["gif", "mp4", "png"]
+
+LINE_COLOR = np.array([85, 85, 85], dtype=np.uint8)
+
+
+class ExportJob(NamedTuple):
+    """
+    Describes the export of a single example of a puzzle.
+
+    :param generator: The name of the puzzle generator, e.g. `puzzle_two`, or the ARC task id of its puzzle.
+    :param puzzle_path: The path to the ARC task file.
+    :param example_type: Whether to use a "train" or "test" example.
+    :param example_index: The index of the example.
+    :param output_path: The path of the exported file, its suffix determines the format.
+    """
+    generator: str
+    puzzle_path: Path
+    example_type: Literal["train", "test"]
+    example_index: int
+    output_path: Path
+
+
+def rasterize(grid: np.ndarray, cell_size: int = 16, line_width: int = 1) -> np.ndarray:
+    """
+    Convert a grid of colors to an RGB image.
+
+    :param grid: The grid to rasterise.
+    :param cell_size: The size of a single cell in pixels, including grid lines.
+    :param line_width: The width of the grid lines in pixels.
+    :return: An RGB image of shape (rows * cell_size, cols * cell_size, 3).
+    """
+
+    image = ARC_PALETTE[grid].repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+
+    if line_width > 0:
+        image[np.arange(image.shape[0]) % cell_size < line_width, :] = LINE_COLOR
+        image[:, np.arange(image.shape[1]) % cell_size < line_width] = LINE_COLOR
+
+    return image
+
+
+def unique_frames(frames: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+    """
+    Skip frames which are identical to their predecessor.
+
+    :param frames: The frames to filter.
+    :return: An iterator over the frames which differ from their predecessor.
+    """
+
+    previous: Optional[np.ndarray] = None
+    for frame in frames:
+        if previous is None or previous.shape != frame.shape or np.any(previous != frame):
+            yield frame
+        previous = frame
+
+
+def sprite_sheet(images: Sequence[np.ndarray], columns: Optional[int] = None, padding: int = 4) -> np.ndarray:
+    """
+    Arrange images of the same size in a grid.
+
+    :param images: The RGB images to arrange.
+    :param columns: The number of columns, defaults to a square layout.
+    :param padding: The padding between two images in pixels.
+    :return: The RGB sprite sheet.
+    """
+
+    if columns is None:
+        columns = math.ceil(math.sqrt(len(images)))
+
+    rows = math.ceil(len(images) / columns)
+    height, width, _ = images[0].shape
+    sheet = np.full(
+        (rows * (height + padding) - padding, columns * (width + padding) - padding, 3), 255, dtype=np.uint8
+    )
+
+    for index, image in enumerate(images):
+        row, col = divmod(index, columns)
+        top, left = row * (height + padding), col * (width + padding)
+        sheet[top:top + height, left:left + width] = image
+
+    return sheet
+
+
+def _write_mp4(images: Sequence[np.ndarray], output_path: Path, fps: int) -> None:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is required to export MP4 files.")
+
+    height, width, _ = images[0].shape
+    process = subprocess.Popen(
+        [
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", "-vcodec", "libx264",
+            str(output_path),
+        ],
+        stdin=subprocess.PIPE,
+    )
+
+    assert process.stdin is not None
+    for image in images:
+        process.stdin.write(image.tobytes())
+    process.stdin.close()
+
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed to export {output_path}")
+
+
+def export_frames(
+        frames: Iterable[np.ndarray],
+        output_path: Path,
+        fps: int = 4,
+        cell_size: int = 16,
+        columns: Optional[int] = None,
+) -> int:
+    """
+    Export a trajectory of grids, the format is determined by the suffix of the output path.
+
+    :param frames: The grids of the trajectory, e.g. a `Playground`.
+    :param output_path: The path of the exported file, either `.gif`, `.mp4` or `.png`.
+    :param fps: The frames per second for animations.
+    :param cell_size: The size of a single cell in pixels.
+    :param columns: The number of columns for PNG sprite sheets.
+    :return: The number of exported frames.
+    """
+
+    images = [rasterize(frame, cell_size=cell_size) for frame in unique_frames(frames)]
+    if len(images) == 0:
+        raise ValueError("There are no frames to export.")
+
+    output_format = output_path.suffix.lstrip(".").lower()
+
+    if output_format == "gif":
+        first, *rest = [Image.fromarray(image) for image in images]
+        first.save(output_path, save_all=True, append_images=rest, duration=1000 // fps, loop=0)
+    elif output_format == "mp4":
+        _write_mp4(images, output_path, fps)
+    elif output_format == "png":
+        Image.fromarray(sprite_sheet(images, columns=columns)).save(output_path)
+    else:
+        raise ValueError(f"Unknown export format: {output_format}")
+
+    return len(images)
+
+
+def run_export_job(job: ExportJob) -> int:
+    """
+    Simulate a single puzzle example and export its trajectory.
+
+    :param job: The export job.
+    :return: The number of exported frames.
+    """
+
+    model_function = get_puzzle(job.generator)
+    puzzle = load_puzzle(job.puzzle_path)
+    examples = puzzle.train if job.example_type == "train" else puzzle.test
+
+    return export_frames(model_function(examples[job.example_index].input), job.output_path)
+
+
+def export_puzzles(jobs: Sequence[ExportJob], processes: Optional[int] = None) -> list[int]:
+    """
+    Export many puzzle examples in parallel worker processes.
+
+    :param jobs: The export jobs.
+    :param processes: The number of worker processes, defaults to the number of CPUs.
+    :return: The number of exported frames per job.
+    """
+
+    with Pool(processes=processes) as pool:
+        return pool.map(run_export_job, jobs)
+
+
+def main():
+    """
+    Main entry point for the export CLI.
+    """
+    parser = argparse.ArgumentParser(description="Export ARC puzzle generator trajectories as animations")
+
+    parser.add_argument(
+        "tasks",
+        nargs="+",
+        help="Tasks to export, given as generator:puzzle_id or puzzle_id, e.g. puzzle_two:3e6067c3 or 3e6067c3"
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["gif", "mp4", "png"],
+        default="gif",
+        help="Export format (default: gif)"
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        default="exports",
+        help="Directory for exported files (default: exports)"
+    )
+
+    parser.add_argument(
+        "--base-dir",
+        default="tests/data",
+        help="Base directory for puzzles (default: tests/data)"
+    )
+
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)"
+    )
+
+    args = parser.parse_args()
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs: list[ExportJob] = []
+    try:
+        for task in args.tasks:
+            generator, puzzle_id = task.split(":") if ":" in task else (TASKS[task], task)
+            puzzle_path = Path(args.base_dir) / f"{puzzle_id}.json"
+            puzzle = load_puzzle(puzzle_path)
+
+            for example_type, examples in (("train", puzzle.train), ("test", puzzle.test)):
+                for index in range(len(examples)):
+                    jobs.append(ExportJob(
+                        generator=generator,
+                        puzzle_path=puzzle_path,
+                        example_type=example_type,
+                        example_index=index,
+                        output_path=output_dir / f"{puzzle_id}_{example_type}_{index}.{args.format}",
+                    ))
+
+        export_puzzles(jobs, processes=args.processes)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
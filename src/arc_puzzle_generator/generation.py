@@ -0,0 +1,135 @@
+"""
+The generation module produces new (input, output) pairs for puzzles.
+Input grids are drawn from per-puzzle samplers and the outputs are computed by simulating the puzzle.
+"""
+import os
+from collections import deque
+from multiprocessing import Pool
+from multiprocessing.pool import AsyncResult
+from typing import Protocol, NamedTuple, Iterator, Optional, Mapping
+
+import numpy as np
+
+from arc_puzzle_generator.geometry import Point
+from arc_puzzle_generator.playground import ModelSetup
+from arc_puzzle_generator.puzzles.puzzle_hundredfive import puzzle_hundredfive, sample_puzzle_hundredfive
+from arc_puzzle_generator.puzzles.puzzle_one import puzzle_one, sample_puzzle_one
+from arc_puzzle_generator.puzzles.puzzle_two import puzzle_two, sample_puzzle_two
+from arc_puzzle_generator.utils.data_loader import Pair
+
+
+class InputSampler(Protocol):
+    """
+    An input sampler is a callable that produces a new valid input grid for a puzzle.
+    """
+
+    def __call__(self, rng: np.random.Generator, grid_size: Point, num_entities: int) -> np.ndarray:
+        pass
+
+
+class SamplerConfig(NamedTuple):
+    """
+    Controls the grids produced by an input sampler, sizes and entity counts are drawn uniformly from the ranges.
+
+    :param min_size: The minimum grid size.
+    :param max_size: The maximum grid size (inclusive).
+    :param min_entities: The minimum number of entities.
+    :param max_entities: The maximum number of entities (inclusive).
+    """
+    min_size: Point = (10, 10)
+    max_size: Point = (30, 30)
+    min_entities: int = 2
+    max_entities: int = 4
+
+
+SAMPLERS: Mapping[str, tuple[ModelSetup, InputSampler]] = {
+    "puzzle_one": (puzzle_one, sample_puzzle_one),
+    "puzzle_two": (puzzle_two, sample_puzzle_two),
+    "puzzle_hundredfive": (puzzle_hundredfive, sample_puzzle_hundredfive),
+}
+"""
+Maps puzzle names to the puzzle setup and its input sampler.
+"""
+
+
+def sample_pairs(
+        puzzle: str,
+        num_pairs: int,
+        config: SamplerConfig = SamplerConfig(),
+        seed: Optional[np.random.SeedSequence | int] = None,
+) -> list[Pair]:
+    """
+    Sample input grids for a puzzle and simulate the puzzle to obtain the outputs.
+
+    :param puzzle: The name of the puzzle, e.g. `puzzle_two`.
+    :param num_pairs: The number of pairs to sample.
+    :param config: The sampler configuration.
+    :param seed: The seed for the random number generator.
+    :return: A list of (input, output) pairs.
+    """
+
+    model_function, sampler = SAMPLERS[puzzle]
+    rng = np.random.default_rng(seed)
+    pairs: list[Pair] = []
+
+    for _ in range(num_pairs):
+        grid_size = (
+            int(rng.integers(config.min_size[0], config.max_size[0] + 1)),
+            int(rng.integers(config.min_size[1], config.max_size[1] + 1)),
+        )
+        num_entities = int(rng.integers(config.min_entities, config.max_entities + 1))
+        input_grid = sampler(rng, grid_size, num_entities)
+
+        output_grid = input_grid
+        for output_grid in model_function(input_grid.copy()):
+            pass
+
+        pairs.append(Pair(input=input_grid, output=output_grid))
+
+    return pairs
+
+
+def generate_pairs(
+        puzzle: str,
+        num_pairs: Optional[int] = None,
+        config: SamplerConfig = SamplerConfig(),
+        processes: Optional[int] = None,
+        chunk_size: int = 64,
+        seed: Optional[int] = None,
+) -> Iterator[Pair]:
+    """
+    Stream (input, output) pairs for a puzzle, sampled and simulated in parallel worker processes.
+    Only a bounded number of chunks is in flight at any time, so the stream can be consumed indefinitely.
+
+    :param puzzle: The name of the puzzle, e.g. `puzzle_two`.
+    :param num_pairs: The number of pairs to generate, infinite if None.
+    :param config: The sampler configuration.
+    :param processes: The number of worker processes, defaults to the number of CPUs.
+    :param chunk_size: The number of pairs sampled by a worker at once.
+    :param seed: The seed, the same seed produces the same stream of pairs.
+    :return: An iterator over (input, output) pairs.
+    """
+
+    if puzzle not in SAMPLERS:
+        raise KeyError(f"No input sampler found for '{puzzle}'")
+
+    seed_sequence = np.random.SeedSequence(seed)
+    remaining = num_pairs
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    max_pending = 2 * processes
+
+    with Pool(processes=processes) as pool:
+        pending: deque[AsyncResult[list[Pair]]] = deque()
+
+        while remaining is None or remaining > 0 or len(pending) > 0:
+            while len(pending) < max_pending and (remaining is None or remaining > 0):
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                pending.append(pool.apply_async(sample_pairs, (puzzle, size, config, seed_sequence.spawn(1)[0])))
+
+                if remaining is not None:
+                    remaining -= size
+
+            yield from pending.popleft().get()
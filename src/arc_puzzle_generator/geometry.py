@@ -1,4 +1,4 @@
-from typing import Mapping, Literal
+from typing import Mapping, Literal, Optional, Iterable, AbstractSet
 
 import numpy as np
 
@@ -23,18 +23,101 @@ The axis of a line.
 """
 
 
+Bounds = tuple[int, int, int, int]
+"""
+The bounding box of a point set as (min_row, min_col, max_row, max_col).
+"""
+
+
 class PointSet(set[tuple[int, int]]):
     """
     A set of points represented as tuples of (x, y) coordinates.
     This class provides methods to move the points by adding or subtracting another point.
+    The bounding box is computed lazily and cached, shifting a point set shifts its cached bounding box.
     """
 
+    _bounds: Optional[Bounds] = None
+
+    @property
+    def bounds(self) -> Optional[Bounds]:
+        """
+        The bounding box of the point set, or None if the point set is empty.
+        """
+        if self._bounds is None and len(self) > 0:
+            xs, ys = zip(*self)
+            self._bounds = (min(xs), min(ys), max(xs), max(ys))
+
+        return self._bounds
+
     def shift(self, other: 'Point') -> 'PointSet':
         positions = {
             (position[0] + other[0], position[1] + other[1])
             for position in self
         }
-        return PointSet(positions)
+        shifted = PointSet(positions)
+
+        if self._bounds is not None:
+            min_x, min_y, max_x, max_y = self._bounds
+            shifted._bounds = (min_x + other[0], min_y + other[1], max_x + other[0], max_y + other[1])
+
+        return shifted
+
+    def add(self, point: 'Point') -> None:
+        super().add(point)
+
+        if self._bounds is not None:
+            min_x, min_y, max_x, max_y = self._bounds
+            self._bounds = (min(min_x, point[0]), min(min_y, point[1]), max(max_x, point[0]), max(max_y, point[1]))
+
+    # all other mutations invalidate the cached bounding box
+
+    def update(self, *others: Iterable['Point']) -> None:
+        self._bounds = None
+        super().update(*others)
+
+    def discard(self, point: 'Point') -> None:
+        self._bounds = None
+        super().discard(point)
+
+    def remove(self, point: 'Point') -> None:
+        self._bounds = None
+        super().remove(point)
+
+    def pop(self) -> 'Point':
+        self._bounds = None
+        return super().pop()
+
+    def clear(self) -> None:
+        self._bounds = None
+        super().clear()
+
+    def difference_update(self, *others: Iterable['Point']) -> None:
+        self._bounds = None
+        super().difference_update(*others)
+
+    def intersection_update(self, *others: Iterable['Point']) -> None:
+        self._bounds = None
+        super().intersection_update(*others)
+
+    def symmetric_difference_update(self, other: Iterable['Point']) -> None:
+        self._bounds = None
+        super().symmetric_difference_update(other)
+
+    def __ior__(self, other: AbstractSet['Point']) -> 'PointSet':  # type: ignore[override,misc]
+        self._bounds = None
+        return super().__ior__(other)
+
+    def __iand__(self, other: AbstractSet[object]) -> 'PointSet':
+        self._bounds = None
+        return super().__iand__(other)
+
+    def __isub__(self, other: AbstractSet[object]) -> 'PointSet':
+        self._bounds = None
+        return super().__isub__(other)
+
+    def __ixor__(self, other: AbstractSet['Point']) -> 'PointSet':  # type: ignore[override,misc]
+        self._bounds = None
+        return super().__ixor__(other)
 
     @staticmethod
     def from_numpy(array: np.ndarray) -> 'PointSet':
@@ -54,3 +137,41 @@ def in_grid(point: Point, grid_size: Point) -> bool:
     :return: A boolean indicating whether the point is within the grid bounds.
     """
     return 0 <= point[0] < grid_size[0] and 0 <= point[1] < grid_size[1]
+
+
+def point_set_in_grid(point_set: PointSet, grid_size: Point) -> bool:
+    """
+    Checks if all points of a point set are within the bounds of a grid, using the cached bounding box.
+    :param point_set: The point set to check.
+    :param grid_size: The size of the grid, represented as a tuple (width, height).
+    :return: A boolean indicating whether all points are within the grid bounds.
+    """
+    bounds = point_set.bounds
+    if bounds is None:
+        return True
+
+    min_x, min_y, max_x, max_y = bounds
+    return 0 <= min_x and max_x < grid_size[0] and 0 <= min_y and max_y < grid_size[1]
+
+
+def translation(source: PointSet, target: PointSet) -> Optional[Point]:
+    """
+    Determines the vector by which a point set was moved, if it was moved without changing its shape.
+    :param source: The point set before the move.
+    :param target: The point set after the move.
+    :return: The translation vector, or None if the target is not a translation of the source.
+    """
+    if len(source) != len(target) or len(source) == 0:
+        return None
+
+    source_bounds, target_bounds = source.bounds, target.bounds
+    assert source_bounds is not None and target_bounds is not None
+
+    vector = (target_bounds[0] - source_bounds[0], target_bounds[1] - source_bounds[1])
+    if (target_bounds[2] - source_bounds[2], target_bounds[3] - source_bounds[3]) != vector:
+        return None
+
+    if vector == (0, 0):
+        return vector if source == target else None
+
+    return vector if source.shift(vector) == target else None
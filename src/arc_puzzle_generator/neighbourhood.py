@@ -1,11 +1,22 @@
 from itertools import chain
-from typing import Protocol, cast
+from typing import Protocol, cast, Optional, Mapping
+
+import numpy as np
 
 from arc_puzzle_generator.geometry import Point, PointSet, Axis
 
+DILATION_MASK_THRESHOLD = 4096
+"""
+Above this number of (point, offset) pairs point sets are dilated on a boolean mask instead of a set.
+"""
+
 
 class Neighbourhood(Protocol):
-    """Protocol for neighbourhoods."""
+    """
+    Protocol for neighbourhoods.
+    Neighbourhoods which are the same for every point may declare their offsets in a `stencil` attribute, which
+    allows resolving the neighbourhood of whole point sets by dilation.
+    """
 
     def __call__(self, point: Point) -> PointSet:
         """Return the neighbourhood of a point."""
@@ -21,6 +32,9 @@ class VonNeumannNeighbourhood(Neighbourhood):
 
     def __init__(self, size: int = 1) -> None:
         self.size = size
+        self.stencil = PointSet(
+            offset for i in range(1, size + 1) for offset in ((-i, 0), (i, 0), (0, -i), (0, i))
+        )
 
     def __call__(self, point: Point) -> PointSet:
         x, y = point
@@ -46,6 +60,9 @@ class MooreNeighbourhood(Neighbourhood):
 
     def __init__(self, size: int = 1) -> None:
         self.size = size
+        self.stencil = PointSet(
+            (dx, dy) for dx in range(-size, size + 1) for dy in range(-size, size + 1) if (dx, dy) != (0, 0)
+        )
 
     def __call__(self, point: Point) -> PointSet:
         x, y = point
@@ -133,14 +150,99 @@ class AxisNeighbourhood(Neighbourhood):
         return PointSet(neighbours)
 
 
+FUNCTION_STENCILS: Mapping[Neighbourhood, PointSet] = {
+    von_neumann_neighbours: von_neumann_neighbours((0, 0)),
+    moore_neighbours: moore_neighbours((0, 0)),
+    zero_neighbours: PointSet(),
+}
+"""
+The stencils of the neighbourhood functions.
+"""
+
+
+def neighbourhood_stencil(neighbourhood: Neighbourhood) -> Optional[PointSet]:
+    """
+    Return the stencil of a neighbourhood, if it declares one.
+
+    :param neighbourhood: The neighbourhood.
+    :return: The offsets of the neighbours of a point, or None if the neighbourhood depends on the point.
+    """
+
+    stencil = getattr(neighbourhood, "stencil", None)
+    if stencil is None:
+        stencil = FUNCTION_STENCILS.get(neighbourhood)
+
+    return stencil
+
+
+def dilate(point_set: PointSet, stencil: PointSet) -> PointSet:
+    """
+    Dilate a point set with a stencil, i.e. the union of the point set shifted by every offset of the stencil.
+    Small point sets are dilated with set operations, large ones on a boolean mask with one numpy shift per offset.
+    Stencils which fill their bounding box, e.g. Moore neighbourhoods, are dilated separably along both axes.
+
+    :param point_set: The point set to dilate.
+    :param stencil: The offsets to shift the point set by.
+    :return: The dilated point set.
+    """
+
+    if len(point_set) == 0 or len(stencil) == 0:
+        return PointSet()
+
+    if len(point_set) * len(stencil) <= DILATION_MASK_THRESHOLD:
+        return PointSet({(x + dx, y + dy) for x, y in point_set for dx, dy in stencil})
+
+    bounds, stencil_bounds = point_set.bounds, stencil.bounds
+    assert bounds is not None and stencil_bounds is not None
+    min_x, min_y, max_x, max_y = bounds
+    min_dx, min_dy, max_dx, max_dy = stencil_bounds
+    height, width = max_x - min_x + 1, max_y - min_y + 1
+    stencil_height, stencil_width = max_dx - min_dx + 1, max_dy - min_dy + 1
+
+    points = np.array(list(point_set))
+    mask = np.zeros((height, width), dtype=bool)
+    mask[points[:, 0] - min_x, points[:, 1] - min_y] = True
+
+    dilated = np.zeros((height + stencil_height - 1, width + stencil_width - 1), dtype=bool)
+
+    if len(stencil | {(0, 0)}) == stencil_height * stencil_width and min_dx <= 0 <= max_dx and min_dy <= 0 <= max_dy:
+        # the stencil fills its bounding box, possibly except for the origin: the number of points reaching every cell
+        # is counted separably over the box, without the origin every point of the set reaches itself once too often
+        rows = np.zeros((height + stencil_height - 1, width), dtype=np.int64)
+        for dx in range(stencil_height):
+            rows[dx:dx + height] += mask
+        counts = np.zeros(dilated.shape, dtype=np.int64)
+        for dy in range(stencil_width):
+            counts[:, dy:dy + width] += rows
+
+        if (0, 0) not in stencil:
+            counts[-min_dx:-min_dx + height, -min_dy:-min_dy + width] -= mask
+
+        dilated[...] = counts > 0
+    else:
+        for dx, dy in stencil:
+            dilated[dx - min_dx:dx - min_dx + height, dy - min_dy:dy - min_dy + width] |= mask
+
+    xs, ys = np.nonzero(dilated)
+    return PointSet(zip((xs + min_x + min_dx).tolist(), (ys + min_y + min_dy).tolist()))
+
+
 def resolve_point_set_neighbourhood(point_set: PointSet, neighbourhood: Neighbourhood) -> PointSet:
     """
     Return a neighbourhood that returns the points in the point set.
+    Neighbourhoods with a stencil are resolved by dilation, all others point by point.
 
     :param point_set: The point set for which to resolve neighbours.
     :param neighbourhood: The neighbourhood to return.
     :return: All neighbours of all given points in a point set.
     """
 
+    stencil = neighbourhood_stencil(neighbourhood)
+
+    if stencil is not None:
+        neighbours = dilate(point_set, stencil)
+        neighbours.difference_update(point_set)
+        return neighbours
+
     point_neighbours = set(chain.from_iterable([neighbourhood(point) for point in point_set]))
     return cast(PointSet, point_neighbours - point_set)
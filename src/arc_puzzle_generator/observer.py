@@ -0,0 +1,170 @@
+"""
+The observer module contains the hooks through which a simulation can be instrumented, see the `observers` parameter
+of `Playground`. Without observers the hooks cost nothing, and a `SampledObserver` restricts an observer to a random
+subset of the agents.
+"""
+import logging
+from typing import Optional
+
+import numpy as np
+
+from arc_puzzle_generator.agent import Agent
+from arc_puzzle_generator.rule import RuleNode
+from arc_puzzle_generator.state import AgentState, AgentStep
+from arc_puzzle_generator.utils.callable import get_callable_name
+
+
+class Observer:
+    """
+    Observes the dynamic agents of a playground, which are identified by the order in which they were added.
+    Subclasses override the hooks they are interested in, the hooks do nothing by default.
+
+    If the playground evaluates agents with an executor, `agent_started`, `agent_finished`, `collisions_resolved`,
+    `rule_evaluated` and `rule_fired` are called from the worker threads.
+    Rules evaluated in the worker processes of a `PartitionedPlayground` are not observed.
+    """
+
+    def agent_added(self, agent_id: int, agent: Agent) -> None:
+        """
+        Called when an agent, including a spawned child, is added to the playground.
+        :param agent_id: The index of the agent.
+        :param agent: The agent.
+        """
+        pass
+
+    def agent_started(self, agent_id: int) -> None:
+        """
+        Called before an agent is advanced by one step.
+        :param agent_id: The index of the agent.
+        """
+        pass
+
+    def agent_finished(self, agent_id: int) -> None:
+        """
+        Called after an agent was advanced by one step, before its children are added.
+        :param agent_id: The index of the agent.
+        """
+        pass
+
+    def collisions_resolved(self, agent_id: int) -> None:
+        """
+        Called after the collisions of an agent were resolved, before its first rule is evaluated.
+        :param agent_id: The index of the agent.
+        """
+        pass
+
+    def rule_evaluated(self, agent_id: int, node: RuleNode, fired: bool) -> None:
+        """
+        Called after the rule of a node was evaluated for an agent, before `rule_fired`.
+        :param agent_id: The index of the agent.
+        :param node: The node of the rule.
+        :param fired: Whether the rule produced a new state.
+        """
+        pass
+
+    def rule_fired(self, agent_id: int, node: RuleNode, state: AgentState) -> None:
+        """
+        Called when the rule of a node produced a new state for an agent.
+        :param agent_id: The index of the agent.
+        :param node: The node of the rule.
+        :param state: The new state.
+        """
+        pass
+
+    def cells_written(self, agent_id: int, step: AgentStep) -> None:
+        """
+        Called when a step of an agent is written to the grid.
+        :param agent_id: The index of the agent.
+        :param step: The step, including the written cells.
+        """
+        pass
+
+    def agent_terminated(self, agent_id: int, agent: Agent) -> None:
+        """
+        Called when an agent ran out of charge.
+        :param agent_id: The index of the agent.
+        :param agent: The agent.
+        """
+        pass
+
+
+class SampledObserver(Observer):
+    """
+    Forwards the hooks of a random fraction of the agents to another observer.
+    Agents are sampled when they are added, so the hooks of a sampled agent are forwarded over its whole lifetime.
+    """
+
+    def __init__(self, observer: Observer, fraction: float, seed: Optional[int] = None):
+        """
+        Initialize a sampled observer.
+        :param observer: The observer receiving the hooks of the sampled agents.
+        :param fraction: The fraction of agents to sample.
+        :param seed: The seed for the random number generator.
+        """
+        if not 0 <= fraction <= 1:
+            raise ValueError("The sampled fraction must be between 0 and 1.")
+
+        self.observer = observer
+        self.fraction = fraction
+        self.rng = np.random.default_rng(seed)
+        self.sampled: set[int] = set()
+
+    def agent_added(self, agent_id: int, agent: Agent) -> None:
+        if self.rng.random() < self.fraction:
+            self.sampled.add(agent_id)
+            self.observer.agent_added(agent_id, agent)
+
+    def agent_started(self, agent_id: int) -> None:
+        if agent_id in self.sampled:
+            self.observer.agent_started(agent_id)
+
+    def agent_finished(self, agent_id: int) -> None:
+        if agent_id in self.sampled:
+            self.observer.agent_finished(agent_id)
+
+    def collisions_resolved(self, agent_id: int) -> None:
+        if agent_id in self.sampled:
+            self.observer.collisions_resolved(agent_id)
+
+    def rule_evaluated(self, agent_id: int, node: RuleNode, fired: bool) -> None:
+        if agent_id in self.sampled:
+            self.observer.rule_evaluated(agent_id, node, fired)
+
+    def rule_fired(self, agent_id: int, node: RuleNode, state: AgentState) -> None:
+        if agent_id in self.sampled:
+            self.observer.rule_fired(agent_id, node, state)
+
+    def cells_written(self, agent_id: int, step: AgentStep) -> None:
+        if agent_id in self.sampled:
+            self.observer.cells_written(agent_id, step)
+
+    def agent_terminated(self, agent_id: int, agent: Agent) -> None:
+        if agent_id in self.sampled:
+            self.observer.agent_terminated(agent_id, agent)
+
+
+class LoggingObserver(Observer):
+    """
+    Logs all hooks at debug level.
+    """
+
+    def __init__(self, logger: logging.Logger = logging.getLogger("arc_puzzle_generator")):
+        """
+        Initialize a logging observer.
+        :param logger: The logger.
+        """
+        self.logger = logger
+
+    def agent_added(self, agent_id: int, agent: Agent) -> None:
+        self.logger.debug("Agent %s added at position: %s, Color: %s", agent_id, agent.position, agent.color)
+
+    def rule_fired(self, agent_id: int, node: RuleNode, state: AgentState) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Agent %s rule %s produced state: %s", agent_id, get_callable_name(node.rule), state)
+
+    def cells_written(self, agent_id: int, step: AgentStep) -> None:
+        self.logger.debug("Agent %s position: %s, Color: %s", agent_id, step.state.position, step.state.color)
+
+    def agent_terminated(self, agent_id: int, agent: Agent) -> None:
+        self.logger.debug("Agent %s terminated at position: %s", agent_id, agent.position)
+
@@ -0,0 +1,425 @@
+"""
+The partition module runs the synchronous execution mode of a playground on grids far beyond the size of ARC puzzles.
+
+The grid is split into tiles, every tile is owned by a worker process which evaluates the agents whose top-left cell
+lies in the tile. Once per tick, every worker receives the grid writes of the previous tick, the agents migrating into
+its tile and the states of the agents of other tiles within a halo of neighbourhood width around its agents. The
+workers evaluate their agents against this snapshot and report back their grid writes, which are committed in the
+same order as in a single-process playground.
+
+Agents, their rules and color sources are sent between processes and therefore must be picklable. Every worker holds
+its own copy of the agents it owns, so rules and color sources shared by agents of different tiles are not shared
+across workers.
+"""
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from typing import NamedTuple, Optional, Sequence, Any
+
+import numpy as np
+
+from arc_puzzle_generator.agent import Agent
+from arc_puzzle_generator.geometry import Point, PointSet
+from arc_puzzle_generator.neighbourhood import Neighbourhood, zero_neighbours, neighbourhood_stencil
+from arc_puzzle_generator.observer import Observer
+from arc_puzzle_generator.playground import Playground
+from arc_puzzle_generator.state import AgentState, AgentStep, GridWrite
+from arc_puzzle_generator.trace import TraceRecorder
+from arc_puzzle_generator.topology import Topology, identity_topology
+from arc_puzzle_generator.utils.color_stream import ColorStream
+
+AgentKey = tuple[Any, ...]
+"""
+Orders the agents like a single-process playground: initial agents are keyed by `(0, index)`, children spawned in tick
+`t` by `(t, parent_key, index)`.
+"""
+
+
+class Tiling(NamedTuple):
+    """
+    Splits a grid into equally sized tiles.
+
+    :param grid_size: The size of the grid.
+    :param tiles: The number of tile rows and columns.
+    """
+    grid_size: Point
+    tiles: Point
+
+    def owner(self, position: PointSet) -> int:
+        """
+        Determine the tile owning a position, which is the tile of its top-left cell.
+        Positions outside the grid are owned by the nearest tile.
+
+        :param position: The position of an agent.
+        :return: The index of the tile.
+        """
+
+        bounds = position.bounds
+        if bounds is None:
+            return 0
+
+        rows, cols = self.tiles
+        row = min(max(bounds[0] * rows // self.grid_size[0], 0), rows - 1)
+        col = min(max(bounds[1] * cols // self.grid_size[1], 0), cols - 1)
+        return row * cols + col
+
+
+class TileTick(NamedTuple):
+    """
+    The message sent to a worker once per tick.
+
+    :param tick: The index of the tick, starting at 1.
+    :param writes: The grid writes of the previous tick.
+    :param incoming: The agents migrating into the tile.
+    :param ghosts: The states of the agents of other tiles within the halo, with their keys and labels.
+    """
+    tick: int
+    writes: list[GridWrite]
+    incoming: list[tuple[AgentKey, Agent]]
+    ghosts: list[tuple[AgentKey, str, AgentState]]
+
+
+class AgentUpdate(NamedTuple):
+    """
+    The outcome of evaluating an agent.
+
+    :param key: The key of the agent.
+    :param steps: The steps of the agent which change the grid.
+    :param state: The state of the agent after the tick.
+    """
+    key: AgentKey
+    steps: list[AgentStep]
+    state: AgentState
+
+
+class TileResult(NamedTuple):
+    """
+    The message a worker replies with.
+
+    :param updates: The updates of all evaluated agents.
+    :param children: The agents spawned within the tick.
+    :param emigrants: The agents which moved to another tile.
+    """
+    updates: list[AgentUpdate]
+    children: list[tuple[AgentKey, Agent]]
+    emigrants: list[tuple[AgentKey, Agent]]
+
+
+class TileWorker:
+    """
+    Evaluates the agents of a tile, using a playground which mirrors the grid and contains the owned agents and the
+    ghosts of the agents of other tiles.
+    """
+
+    def __init__(
+            self,
+            index: int,
+            tiling: Tiling,
+            grid: np.ndarray,
+            labels: Sequence[str],
+            static_agents: Sequence[Agent],
+            neighbourhood: Neighbourhood,
+            topology: Topology,
+            backfill_color: Optional[int],
+    ) -> None:
+        """
+        Initialize a tile worker.
+        :param index: The index of the tile.
+        :param tiling: The tiling of the grid.
+        :param grid: The grid at the start of the simulation.
+        :param labels: All labels in the order they were interned, so overlapping agents resolve like in a
+        single-process playground.
+        :param static_agents: The inert agents, which are part of every tile.
+        :param neighbourhood: The neighbourhood of the playground.
+        :param topology: The topology of the playground.
+        :param backfill_color: The backfill color of the playground.
+        """
+        self.index = index
+        self.tiling = tiling
+        self.agents: dict[AgentKey, Agent] = {}
+
+        self.playground = Playground(
+            grid,
+            [],
+            neighbourhood=neighbourhood,
+            topology=topology,
+            execution_mode="synchronous",
+            backfill_color=backfill_color,
+        )
+        for label in labels:
+            self.playground._add_label(label)
+        for agent in static_agents:
+            self.playground.add_agent(agent)
+
+    def tick(self, tick: TileTick) -> TileResult:
+        playground = self.playground
+
+        for position, color in tick.writes:
+            playground.output_grid[position[:, 0], position[:, 1]] = color
+
+        self.agents.update(tick.incoming)
+
+        members: list[tuple[AgentKey, Agent]] = [*self.agents.items()]
+        for key, label, state in tick.ghosts:
+            ghost = Agent(
+                position=state.position,
+                direction=state.direction,
+                label=label,
+                colors=ColorStream([state.color]),
+                charge=state.charge,
+            )
+            members.append((key, ghost))
+
+        # the label groups are live lists, they are refilled in agent order
+        members.sort(key=lambda member: member[0])
+        for group in playground.agents_by_label.values():
+            group.clear()
+        for _, agent in members:
+            playground._add_label(agent.label)
+            playground.agents_by_label[agent.label].append(agent)
+
+        snapshot = {agent: (agent.state, len(agent.history)) for _, agent in members}
+
+        updates: list[AgentUpdate] = []
+        children: list[tuple[AgentKey, Agent]] = []
+        emigrants: list[tuple[AgentKey, Agent]] = []
+
+        for key, agent in sorted(self.agents.items(), key=lambda item: item[0]):
+            if not agent.active:
+                continue
+
+            agent_steps, agent_children = playground._evaluate_agent(agent, snapshot)
+            updates.append(AgentUpdate(key=key, steps=agent_steps, state=agent.state))
+
+            for child_idx, child in enumerate(agent_children):
+                child_key = (tick.tick, key, child_idx)
+                children.append((child_key, child))
+
+                if self.tiling.owner(child.position) == self.index:
+                    self.agents[child_key] = child
+
+            if self.tiling.owner(agent.position) != self.index:
+                emigrants.append((key, self.agents.pop(key)))
+                playground.neighbourhood_cache.pop(agent, None)
+
+        return TileResult(updates=updates, children=children, emigrants=emigrants)
+
+
+def _run_worker(connection: Connection, worker: TileWorker) -> None:
+    while True:
+        tick = connection.recv()
+        if tick is None:
+            break
+
+        try:
+            connection.send(worker.tick(tick))
+        except Exception as e:
+            connection.send(e)
+
+    connection.close()
+
+
+class PartitionedPlayground(Playground):
+    """
+    A playground in synchronous execution mode, whose agents are evaluated by one worker process per tile.
+    The trajectory is the same as the trajectory of a single-process playground in synchronous mode.
+    """
+
+    def __init__(
+            self,
+            output_grid: np.ndarray,
+            agents: Sequence[Agent],
+            tiles: Point = (2, 2),
+            neighbourhood: Neighbourhood = zero_neighbours,
+            topology: Topology = identity_topology,
+            backfill_color: Optional[int] = None,
+            max_steps: Optional[int] = None,
+            halo: Optional[int] = None,
+            recorder: Optional[TraceRecorder] = None,
+            observers: Sequence[Observer] = (),
+    ):
+        """
+        Initialize a partitioned playground, the worker processes are started with the first step.
+        :param output_grid: The grid.
+        :param agents: The agents.
+        :param tiles: The number of tile rows and columns, every tile is owned by a worker process.
+        :param neighbourhood: The neighbourhood function.
+        :param topology: The topology function.
+        :param backfill_color: If supplied, this color will be used to fill the grid where agents previously used to be.
+        :param max_steps: If supplied, this number will be used to determine the maximum number of steps performed.
+        :param halo: The width of the halo around the agents of a tile, by default the reach of the stencil of the
+        neighbourhood. Neighbourhoods without a stencil require a halo.
+        :param recorder: If supplied, the trajectory is recorded into a compact trace, see `Playground`.
+        :param observers: The observers of the playground, rules fired in the worker processes are not observed.
+        """
+
+        if halo is None:
+            stencil = neighbourhood_stencil(neighbourhood)
+            if stencil is None:
+                raise ValueError("A halo is required for neighbourhoods without a stencil.")
+
+            halo = max((max(abs(dx), abs(dy)) for dx, dy in stencil), default=0)
+
+        self.halo = halo
+        self.tiling = Tiling(grid_size=(output_grid.shape[0], output_grid.shape[1]), tiles=tiles)
+        self.tick_idx = 0
+        self.started = False
+        self.keys: dict[Agent, AgentKey] = {}
+        self.by_key: dict[AgentKey, Agent] = {}
+        self.owners: dict[Agent, int] = {}
+        self.connections: list[Connection] = []
+        self.workers: list[Process] = []
+        self.pending_writes: list[GridWrite] = []
+        self.incoming: list[list[tuple[AgentKey, Agent]]] = []
+
+        super().__init__(
+            output_grid,
+            agents,
+            neighbourhood=neighbourhood,
+            topology=topology,
+            execution_mode="synchronous",
+            backfill_color=backfill_color,
+            max_steps=max_steps,
+            recorder=recorder,
+            observers=observers,
+        )
+
+    def _track(self, key: AgentKey, agent: Agent, owner: int) -> None:
+        self.keys[agent] = key
+        self.by_key[key] = agent
+        self.owners[agent] = owner
+
+    def _start(self) -> None:
+        self.started = True
+        num_tiles = self.tiling.tiles[0] * self.tiling.tiles[1]
+        self.incoming = [[] for _ in range(num_tiles)]
+
+        for index, agent in enumerate(self.dynamic_agents):
+            owner = self.tiling.owner(agent.position)
+            self._track((0, index), agent, owner)
+            self.incoming[owner].append(((0, index), agent))
+
+        static_agents = [agent for agent in self.agents if agent not in self.owners]
+        labels = sorted(self.label_ids, key=self._intern_label)
+
+        for index in range(num_tiles):
+            worker = TileWorker(
+                index, self.tiling, self.output_grid, labels, static_agents, self.neighbourhood, self.topology,
+                self.backfill_color,
+            )
+            connection, worker_connection = Pipe()
+            process = Process(target=_run_worker, args=(worker_connection, worker), daemon=True)
+            process.start()
+            worker_connection.close()
+
+            self.connections.append(connection)
+            self.workers.append(process)
+
+    def _ghosts(self) -> list[list[tuple[AgentKey, str, AgentState]]]:
+        """
+        Determine the ghosts of every tile, i.e. the agents of other tiles within the halo around the active agents of
+        the tile.
+        :return: The ghosts of every tile.
+        """
+
+        ghosts: list[list[tuple[AgentKey, str, AgentState]]] = [[] for _ in self.workers]
+        agents = [agent for agent in self.dynamic_agents if agent.position.bounds is not None]
+        if len(agents) == 0:
+            return ghosts
+
+        bounds = np.array([agent.position.bounds for agent in agents])
+        owners = np.array([self.owners[agent] for agent in agents])
+        active = np.array([agent.active for agent in agents])
+
+        for index in range(len(self.workers)):
+            owned = (owners == index) & active
+            if not np.any(owned):
+                continue
+
+            top, left = bounds[owned, :2].min(axis=0) - self.halo
+            bottom, right = bounds[owned, 2:].max(axis=0) + self.halo
+
+            near = (owners != index) & (bounds[:, 2] >= top) & (bounds[:, 0] <= bottom) & \
+                   (bounds[:, 3] >= left) & (bounds[:, 1] <= right)
+
+            for agent_idx in np.flatnonzero(near):
+                agent = agents[agent_idx]
+                ghosts[index].append((self.keys[agent], agent.label, agent.state))
+
+        return ghosts
+
+    def _synchronous_step(self) -> None:
+        if not self.started:
+            self._start()
+
+        self.tick_idx += 1
+
+        for connection, incoming, ghosts in zip(self.connections, self.incoming, self._ghosts()):
+            connection.send(TileTick(tick=self.tick_idx, writes=self.pending_writes, incoming=incoming, ghosts=ghosts))
+
+        results: list[TileResult] = []
+        for connection in self.connections:
+            result = connection.recv()
+            if isinstance(result, Exception):
+                self.close()
+                raise result
+            results.append(result)
+
+        self.pending_writes = []
+        self.incoming = [[] for _ in self.workers]
+
+        # commit the writes in agent order, like a single-process playground
+        updates = sorted((update for result in results for update in result.updates), key=lambda update: update.key)
+        for update in updates:
+            agent = self.by_key[update.key]
+            agent.position, agent.direction = update.state.position, update.state.direction
+            agent.color, agent.charge = update.state.color, update.state.charge
+
+            for step in update.steps:
+                self._commit(agent, step)
+                self.pending_writes.extend(step.writes)
+
+            if not agent.active:
+                self._terminate(agent)
+
+        if len(self.pending_writes) > 0:
+            self._append_frame()
+
+        for index, result in enumerate(results):
+            for key, agent in result.emigrants:
+                owner = self.tiling.owner(agent.position)
+                self.owners[self.by_key[key]] = owner
+                self.incoming[owner].append((key, agent))
+
+        children = sorted(
+            ((key, child, index) for index, result in enumerate(results) for key, child in result.children),
+            key=lambda item: item[0],
+        )
+        for key, child, index in children:
+            owner = self.tiling.owner(child.position)
+            self._track(key, child, owner)
+            if owner != index:
+                self.incoming[owner].append((key, child))
+
+            self.add_agent(child)
+            if child.active:
+                self.pending_writes.append((np.array(sorted(child.position)), child.color))
+
+        if not self.active:
+            self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for process in self.workers:
+            process.join()
+
+        self.connections = []
+        self.workers = []
+
+    def __enter__(self) -> 'PartitionedPlayground':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -1,6 +1,9 @@
 """
 The physics module contains world *physics*, for instance, calculating direction vectors and other physical properties.
 """
+from typing import Iterable, Sequence
+
+import numpy as np
 
 from arc_puzzle_generator.geometry import Point, PointSet, Axis, Direction
 
@@ -109,3 +112,211 @@ def relative_point_direction(
     down = point1[0] < point2[0]
 
     return combine_directions((left, right, up, down))
+
+
+DENSE_DISTANCE_LIMIT = 2 ** 16
+"""
+The maximum number of row and column pairs for which `squared_distance_field` compares all columns of a row at once.
+"""
+
+
+def squared_distance_field(mask: np.ndarray) -> np.ndarray:
+    """
+    Computes the exact squared Euclidean distance from every cell of a grid to the closest marked cell.
+    The transform is separable: first the distance to the closest marked cell in the same column is computed, then the
+    squared distances are combined along the rows with the lower envelope of parabolas (Felzenszwalb and Huttenlocher).
+    All rows are processed at once, so time and memory are linear in the size of the grid. Small grids compare every
+    pair of columns instead, which is faster for grids of ARC sizes.
+    :param mask: A boolean grid in which the target cells are marked.
+    :return: An integer grid of squared distances, cells are -1 if no cell is marked.
+    """
+
+    rows, cols = mask.shape
+    if not mask.any():
+        return np.full(mask.shape, -1, dtype=np.int64)
+
+    # vertical distance to the closest marked cell in the same column
+    indices = np.arange(rows)[:, None]
+    unreachable = 2 * (rows + cols)
+    above = np.maximum.accumulate(np.where(mask, indices, -unreachable), axis=0)
+    below = np.minimum.accumulate(np.where(mask, indices, unreachable)[::-1], axis=0)[::-1]
+    vertical = np.minimum(indices - above, below - indices).astype(np.int64) ** 2
+
+    if rows * cols * cols <= DENSE_DISTANCE_LIMIT:
+        offsets = np.arange(cols)
+        horizontal = (offsets[:, None] - offsets[None, :]) ** 2
+        return np.min(vertical[:, None, :] + horizontal[None, :, :], axis=2)
+
+    # the lower envelope of the parabolas rooted at every column: the columns of the parabolas in the envelope and
+    # the boundaries between them, the envelope of every row ends at its top index
+    row_indices = np.arange(rows)
+    roots = np.zeros((rows, cols), dtype=np.int64)
+    boundaries = np.full((rows, cols + 1), np.inf)
+    boundaries[:, 0] = -np.inf
+    top = np.zeros(rows, dtype=np.int64)
+
+    def intersection(column: int) -> np.ndarray:
+        root = roots[row_indices, top]
+        return (
+                (vertical[:, column] + column ** 2 - vertical[row_indices, root] - root ** 2) / (2 * (column - root))
+        )
+
+    for column in range(1, cols):
+        crossing = intersection(column)
+        hidden = crossing <= boundaries[row_indices, top]
+        while hidden.any():
+            top[hidden] -= 1
+            crossing = intersection(column)
+            hidden = crossing <= boundaries[row_indices, top]
+
+        top += 1
+        roots[row_indices, top] = column
+        boundaries[row_indices, top] = crossing
+        boundaries[row_indices, top + 1] = np.inf
+
+    distances = np.empty((rows, cols), dtype=np.int64)
+    top[:] = 0
+    for column in range(cols):
+        behind = boundaries[row_indices, top + 1] < column
+        while behind.any():
+            top[behind] += 1
+            behind = boundaries[row_indices, top + 1] < column
+
+        root = roots[row_indices, top]
+        distances[:, column] = (column - root) ** 2 + vertical[row_indices, root]
+
+    return distances
+
+
+RAY_DIRECTIONS: Sequence[Direction] = (
+    "left", "top_left", "up", "top_right", "right", "bottom_right", "down", "bottom_left"
+)
+"""
+The directions of the rays in a `RayIndex`, in the order of its free run arrays.
+"""
+
+
+def free_runs(occupied: np.ndarray, vector: Point) -> np.ndarray:
+    """
+    Computes the number of free cells ahead of every cell of a grid along a direction, before the ray reaches an
+    occupied cell or the edge of the grid. The grid is swept row by row against the direction.
+    :param occupied: A boolean grid in which the occupied cells are marked.
+    :param vector: The unit vector of the direction.
+    :return: An integer grid of free run lengths.
+    """
+
+    dx, dy = vector
+    if dx == 0 and dy == 0:
+        raise ValueError("The direction of a ray must not be none.")
+    if dx == 0:
+        return np.ascontiguousarray(free_runs(occupied.T, (dy, dx)).T)
+    if dx < 0:
+        return np.ascontiguousarray(free_runs(occupied[::-1], (-dx, dy))[::-1])
+
+    rows, cols = occupied.shape
+    free = np.zeros((rows, cols), dtype=np.int64)
+    source = slice(max(dy, 0), cols + min(dy, 0))
+    target = slice(max(-dy, 0), cols + min(-dy, 0))
+
+    # every row depends on the row below it, cells whose ray leaves the grid sideways have no free cells
+    for x in range(rows - 2, -1, -1):
+        free[x, target] = np.where(occupied[x + 1, source], 0, free[x + 1, source] + 1)
+
+    return free
+
+
+class RayIndex:
+    """
+    Keeps the free run length of every cell of a grid for all eight directions, i.e. the number of free cells ahead of
+    the cell before the ray reaches an occupied cell or the edge of the grid.
+    Ray queries, e.g. whether an agent collides within k steps, are answered by a lookup. When cells change, only the
+    cells whose rays pass through them are updated. Cells may be occupied by several occupants, e.g. overlapping agents,
+    which are counted with `add` and `remove`.
+    """
+
+    def __init__(self, occupied: np.ndarray) -> None:
+        """
+        Build the index for a grid.
+        :param occupied: A boolean grid in which the occupied cells are marked.
+        """
+        self.occupied = occupied.astype(bool)
+        self.counts = self.occupied.astype(np.int64)
+        self.vectors = [direction_to_unit_vector(direction) for direction in RAY_DIRECTIONS]
+        self.free = np.stack([free_runs(self.occupied, vector) for vector in self.vectors])
+
+    def update(self, points: Iterable[Point], occupied: bool) -> None:
+        """
+        Mark cells as occupied or free and update the rays passing through them.
+        :param points: The cells to update, which must be inside the grid.
+        :param occupied: Whether the cells are occupied.
+        """
+
+        points = list(points)
+        for x, y in points:
+            self.occupied[x, y] = occupied
+            self.counts[x, y] = int(occupied)
+
+        rows, cols = self.occupied.shape
+        for index, (dx, dy) in enumerate(self.vectors):
+            free = self.free[index]
+
+            for x, y in points:
+                # walk backwards along the ray, the cells behind an occupied cell are not affected
+                px, py = x - dx, y - dy
+                while 0 <= px < rows and 0 <= py < cols:
+                    ax, ay = px + dx, py + dy
+                    free[px, py] = 0 if self.occupied[ax, ay] else free[ax, ay] + 1
+
+                    if self.occupied[px, py]:
+                        break
+
+                    px, py = px - dx, py - dy
+
+    def add(self, points: Iterable[Point]) -> None:
+        """
+        Add an occupant to cells, the cells which become occupied are updated.
+        :param points: The cells of the occupant, which must be inside the grid.
+        """
+
+        occupied = []
+        for x, y in points:
+            self.counts[x, y] += 1
+            if self.counts[x, y] == 1:
+                occupied.append((x, y))
+
+        if len(occupied) > 0:
+            self.update(occupied, True)
+
+    def remove(self, points: Iterable[Point]) -> None:
+        """
+        Remove an occupant from cells, the cells which become free are updated.
+        :param points: The cells of the occupant, which must be inside the grid.
+        """
+
+        freed = []
+        for x, y in points:
+            self.counts[x, y] -= 1
+            if self.counts[x, y] == 0:
+                freed.append((x, y))
+
+        if len(freed) > 0:
+            self.update(freed, False)
+
+    def free_run(self, point: Point, direction: Direction) -> int:
+        """
+        The number of free cells ahead of a cell.
+        :param point: The cell, which must be inside the grid.
+        :param direction: The direction of the ray.
+        :return: The free run length.
+        """
+        return self.free[RAY_DIRECTIONS.index(direction), point[0], point[1]].item()
+
+    def collides_within(self, points: np.ndarray, direction: Direction, steps: int) -> np.ndarray:
+        """
+        Check for a batch of cells whether their rays are blocked within a number of steps.
+        :param points: An array of cells of shape (n, 2), which must be inside the grid.
+        :param direction: The direction of the rays.
+        :param steps: The number of steps to look ahead.
+        :return: A boolean array of shape (n,).
+        """
+        return self.free[RAY_DIRECTIONS.index(direction), points[:, 0], points[:, 1]] < steps
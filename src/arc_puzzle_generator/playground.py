@@ -1,19 +1,25 @@
-import logging
-from collections import defaultdict
+from collections import defaultdict, deque
+from heapq import heapify, heappop, heappush
+from functools import partial
 from itertools import chain
-from typing import cast, Iterator, Iterable, Callable, Literal, Sequence, Optional, Mapping
+from concurrent.futures import Executor
+from typing import cast, Iterator, Iterable, Callable, Literal, Sequence, Optional, Mapping, Union
 
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
-from arc_puzzle_generator.geometry import PointSet
-from arc_puzzle_generator.neighbourhood import resolve_point_set_neighbourhood, Neighbourhood, zero_neighbours
-from arc_puzzle_generator.state import AgentState
-from arc_puzzle_generator.topology import Topology, identity_topology
-
-logger = logging.getLogger(__name__)
-
-ExecutionMode = Literal["sequential", "parallel"]
+from arc_puzzle_generator.geometry import PointSet, Point, translation, point_set_in_grid, in_grid
+from arc_puzzle_generator.observer import Observer
+from arc_puzzle_generator.neighbourhood import resolve_point_set_neighbourhood, Neighbourhood, zero_neighbours, \
+    neighbourhood_stencil
+from arc_puzzle_generator.physics import direction_to_unit_vector, RayIndex, RAY_DIRECTIONS
+from arc_puzzle_generator.rule import RuleNode, StraightLine, straight_line_chain
+from arc_puzzle_generator.state import AgentState, AgentStateMapping, AgentStep, GridWrite
+from arc_puzzle_generator.trace import TraceRecorder
+from arc_puzzle_generator.topology import Topology, identity_topology, is_static_topology
+from arc_puzzle_generator.utils.color_schedule import ColorSchedule
+
+ExecutionMode = Literal["sequential", "parallel", "synchronous", "event"]
 CollisionMode = Literal["current", "history"]
 
 
@@ -32,6 +38,10 @@ class Playground(Iterator[np.ndarray], Iterable[np.ndarray]):
             collision_mode: CollisionMode = "current",
             backfill_color: Optional[int] = None,
             max_steps: Optional[int] = None,
+            executor: Optional[Executor] = None,
+            fast_forward: bool = False,
+            recorder: Optional[TraceRecorder] = None,
+            observers: Sequence[Observer] = (),
     ):
         """
         The playground constructor accepts a grid and a list of agents, initializing the simulation environment.
@@ -39,27 +49,81 @@ class Playground(Iterator[np.ndarray], Iterable[np.ndarray]):
         :param agents: A sequence of Agent objects that will interact within the playground.
         :param neighbourhood: A neighbourhood function that defines how agents perceive their surroundings.
         :param topology: A topology function that defines the relationships between agent labels.
-        :param execution_mode: In which order agents are processed. Options are "sequential" or "parallel".
+        :param execution_mode: In which order agents are processed. Options are "sequential", "parallel" or
+        "synchronous". In parallel mode agents are processed one after another within a step and observe the moves of
+        the agents before them, in synchronous mode all agents observe the state at the start of the step and their
+        moves are committed at once, in agent order. The event mode produces the same trajectory as the parallel mode,
+        but agents whose rules did not fire sleep until a cell in their neighbourhood changes or they are woken up.
+        This requires rules which only depend on the agent and its surroundings, e.g. no random choices.
         :param collision_mode: Whether collisions are processed based on the current state of agents or their history.
         :param backfill_color: If supplied, this color will be used to fill the grid where agents previously used to be.
         :param max_steps: If supplied, this number will be used to determine the maximum number of steps performed.
+        :param executor: If supplied, agents are evaluated concurrently on this executor in synchronous mode, e.g. a
+        `ThreadPoolExecutor`. The rules of the agents must be thread-safe and must not rely on shared random state.
+        :param fast_forward: Whether agents moving in a straight line are advanced to the end of their free path at once,
+        if no other agent can move in the meantime, i.e. in sequential mode or if they are the only active agent.
+        The grids of all intermediate steps are still produced.
+        :param recorder: If supplied, the initial grid and every step of an agent which changes the grid are recorded
+        into a compact trace, from which the grids can be replayed.
+        :param observers: The observers notified when agents are added, rules fire, cells are written and agents
+        terminate, see `Observer`.
         """
         self.output_grid = output_grid.copy()
         self.agents: list[Agent] = []
+        # the agents which may still act, inert agents are only part of the static layers
+        self.dynamic_agents: list[Agent] = []
         self.neighbourhood = neighbourhood
         self.topology = topology
         self.execution_mode = execution_mode
         self.collision_mode = collision_mode
         self.backfill_color = backfill_color
         self.max_steps = max_steps
+        self.executor = executor
+        self.fast_forward = fast_forward
+        self.recorder = recorder
+        self.observers = list(observers)
 
         # initialize internal properties
         self.current_agent_idx = 0
         self.agents_by_label: Mapping[str, list[Agent]] = defaultdict(list)
         self.labels: set[str] = set()
-        self.steps = [output_grid.copy()]
-        self.step_iterator = iter(self.steps)
+        # labels are interned to integers in order of appearance, the eligible agent groups of each label are cached
+        self.label_ids: dict[str, int] = {}
+        self.eligible_groups: list[Optional[list[list[Agent]]]] = []
+        self.static_topology = is_static_topology(topology)
+        # inert agents (inactive and without rules) never change, their cells are rasterised per label into layers of
+        # indices into the static states, covering the grid and all inert agents
+        self.static_states: list[AgentState] = []
+        self.static_layers: dict[str, np.ndarray] = {}
+        self.static_origin: Point = (0, 0)
+        self.static_shape: Point = (output_grid.shape[0], output_grid.shape[1])
+        self.static_rasters: list[Optional[np.ndarray]] = []
+        # pending grids which have not been yielded yet, consumed grids are released
+        self.steps: deque[np.ndarray] = deque([output_grid.copy()])
         self.step_idx = 0
+        # the last resolved neighbourhood per agent, translation-invariant neighbourhoods move along with the agent
+        self.neighbourhood_cache: dict[Agent, tuple[PointSet, PointSet]] = {}
+        self.stencil = neighbourhood_stencil(neighbourhood)
+        self.translation_invariant = self.stencil is not None
+        # the detected straight line rule chains by their root node
+        self.straight_lines: dict[Optional[RuleNode], Optional[StraightLine]] = {}
+        # with fast-forward, the cells of all agents are kept in a ray index per label, along with the position at
+        # which every agent is indexed
+        self.ray_indices: dict[str, RayIndex] = {}
+        self.indexed_positions: dict[Agent, PointSet] = {}
+        # in event mode, agents which did not act sleep until a cell in their neighbourhood changes or their wake-up
+        # is due, agents are identified by their index in the dynamic agents
+        self.agent_indices: dict[Agent, int] = {}
+        self.awake: set[int] = set()
+        self.subscriptions: defaultdict[Point, set[int]] = defaultdict(set)
+        self.subscribed: dict[int, PointSet] = {}
+        self.wakeups: list[tuple[int, int]] = []
+        self.event_tick = 0
+        self.event_index = -1
+        self.event_queue: list[int] = []
+
+        if recorder is not None:
+            recorder.start(output_grid, backfill_color)
 
         for agent in agents:
             self.add_agent(agent)
@@ -67,17 +131,31 @@ class Playground(Iterator[np.ndarray], Iterable[np.ndarray]):
     @property
     def active(self) -> bool:
         """Check if any agent is active."""
-        return any(agent.active for agent in self.agents)
+        return any(agent.active for agent in self.dynamic_agents)
 
     def add_agent(self, agent: Agent) -> None:
         self.agents.append(agent)
-        self.labels.add(agent.label)
+        self._add_label(agent.label)
+        self._index(agent)
+
+        if self.execution_mode == "event":
+            self._notify(agent.position)
+
+        if agent.node is None and not agent.active:
+            self._add_static_agent(agent)
+            return
+
+        self.agent_indices[agent] = len(self.dynamic_agents)
+        self.dynamic_agents.append(agent)
+        self._wake(len(self.dynamic_agents) - 1)
         self.agents_by_label[agent.label].append(agent)
 
+        for observer in self.observers:
+            observer.agent_added(len(self.dynamic_agents) - 1, agent)
+
         if agent.active:
-            position = np.array(sorted(agent.position))
-            self.output_grid[position[:, 0], position[:, 1]] = agent.color
-            self.steps.append(self.output_grid.copy())
+            self._commit(agent, AgentStep(state=agent.state, writes=[(np.array(sorted(agent.position)), agent.color)]))
+            self._append_frame()
 
     def __iter__(self) -> 'Playground':
         return self
@@ -90,30 +168,190 @@ class Playground(Iterator[np.ndarray], Iterable[np.ndarray]):
             self.step()
 
         self.step_idx += 1
-        return next(self.step_iterator)
 
-    def _process_agent(self, agent: Agent) -> None:
-        # calculate the neighbourhood for the agent's position
+        if not self.steps:
+            raise StopIteration
+
+        return self.steps.popleft()
+
+    def _add_label(self, label: str) -> None:
+        if label not in self.labels:
+            self.labels.add(label)
+            self._intern_label(label)
+
+            # the set of labels has changed, which invalidates the groups of dynamic topologies
+            if not self.static_topology:
+                self.eligible_groups = [None] * len(self.eligible_groups)
+                self.static_rasters = [None] * len(self.static_rasters)
+
+    def _intern_label(self, label: str) -> int:
+        if label not in self.label_ids:
+            self.label_ids[label] = len(self.label_ids)
+            self.eligible_groups.append(None)
+            self.static_rasters.append(None)
+
+        return self.label_ids[label]
+
+    def _eligible_groups(self, label: str) -> list[list[Agent]]:
+        """
+        Resolve the groups of agents which are eligible for collisions with agents of a label.
+        The groups are the live agent lists per label, so agents added to a known label need no invalidation.
+        :param label: The label of the agent.
+        :return: The eligible agent groups, ordered by the interned label.
+        """
+
+        label_id = self._intern_label(label)
+        groups = self.eligible_groups[label_id]
+
+        if groups is None:
+            topology_labels = sorted(self.topology(label, self.labels), key=self._intern_label)
+            groups = [self.agents_by_label[topology_label] for topology_label in topology_labels]
+            self.eligible_groups[label_id] = groups
+
+        return groups
+
+    def _add_static_agent(self, agent: Agent) -> None:
+        """
+        Rasterise an inert agent into the static layer of its label.
+        :param agent: The inert agent.
+        """
+
+        bounds = agent.position.bounds
+        if bounds is None:
+            return
+
+        # grow the layers if the agent is outside of them
+        origin = (min(self.static_origin[0], bounds[0]), min(self.static_origin[1], bounds[1]))
+        end = (
+            max(self.static_origin[0] + self.static_shape[0], bounds[2] + 1),
+            max(self.static_origin[1] + self.static_shape[1], bounds[3] + 1),
+        )
+        shape = (end[0] - origin[0], end[1] - origin[1])
+
+        if origin != self.static_origin or shape != self.static_shape:
+            offset = (self.static_origin[0] - origin[0], self.static_origin[1] - origin[1])
+            for label, layer in self.static_layers.items():
+                grown = np.full(shape, -1)
+                grown[offset[0]:offset[0] + layer.shape[0], offset[1]:offset[1] + layer.shape[1]] = layer
+                self.static_layers[label] = grown
+
+            self.static_origin, self.static_shape = origin, shape
+
+        if agent.label not in self.static_layers:
+            self.static_layers[agent.label] = np.full(self.static_shape, -1)
+
+        position = np.array(list(agent.position))
+        self.static_layers[agent.label][
+            position[:, 0] - self.static_origin[0], position[:, 1] - self.static_origin[1]
+        ] = len(self.static_states)
+        self.static_states.append(agent.state)
+        self.static_rasters = [None] * len(self.static_rasters)
+
+    def _static_raster(self, label: str) -> Optional[np.ndarray]:
+        """
+        Merge the static layers which are eligible for collisions with agents of a label.
+        :param label: The label of the agent.
+        :return: The merged layer, or None if there are no eligible static layers.
+        """
+
+        if len(self.static_layers) == 0:
+            return None
+
+        label_id = self._intern_label(label)
+        raster = self.static_rasters[label_id]
+
+        if raster is None:
+            # an empty raster marks labels without eligible static layers
+            raster = np.full((0, 0), -1)
+            for topology_label in sorted(self.topology(label, self.labels), key=self._intern_label):
+                if topology_label in self.static_layers:
+                    layer = self.static_layers[topology_label]
+                    raster = np.where(layer >= 0, layer, raster) if raster.size > 0 else layer
+
+            self.static_rasters[label_id] = raster
+
+        return raster if raster.size > 0 else None
+
+    def _resolve_neighbourhood(self, agent: Agent) -> PointSet:
+        """
+        Resolve the neighbourhood of an agent, reusing the neighbourhood of its previous position if possible.
+        If the agent has only moved, its previous neighbourhood is moved along, if it has been teleported or resized
+        the neighbourhood is resolved from scratch.
+        :param agent: The agent to resolve the neighbourhood for.
+        :return: The neighbourhood of the agent.
+        """
+
+        if agent in self.neighbourhood_cache:
+            previous_position, neighbourhood = self.neighbourhood_cache[agent]
+
+            if previous_position is agent.position:
+                return neighbourhood
+
+            if self.translation_invariant:
+                vector = translation(previous_position, agent.position)
+
+                if vector is not None:
+                    neighbourhood = neighbourhood.shift(vector)
+                    self.neighbourhood_cache[agent] = (agent.position, neighbourhood)
+                    return neighbourhood
+
         neighbourhood = resolve_point_set_neighbourhood(agent.position, self.neighbourhood)
+        self.neighbourhood_cache[agent] = (agent.position, neighbourhood)
+        return neighbourhood
+
+    def _resolve_collisions(
+            self,
+            agent: Agent,
+            snapshot: Optional[Mapping[Agent, tuple[AgentState, int]]] = None,
+    ) -> tuple[PointSet, AgentStateMapping]:
+        """
+        Resolve the collisions of an agent with all eligible agents.
+        :param agent: The agent to resolve the collisions for.
+        :param snapshot: The states and history lengths of the agents at the start of the tick, if agents should not
+        observe the moves of other agents within the tick.
+        :return: The colliding points and the states of the agents at these points.
+        """
+
+        # calculate the neighbourhood for the agent's position
+        neighbourhood = self._resolve_neighbourhood(agent)
 
         # determine the eligible agents based on the agent's label and topology
-        topology_labels = self.topology(agent.label, self.labels)
-        eligible_agents = set(chain.from_iterable(self.agents_by_label[label] for label in topology_labels))
+        eligible_agents = chain.from_iterable(self._eligible_groups(agent.label))
 
         # create a mapping of agent positions to their states
         agent_position_mapping = {}
         for eligible_agent in eligible_agents:
-            for point in eligible_agent.position:
-                agent_position_mapping[point] = eligible_agent.state
+            if snapshot is not None and eligible_agent in snapshot:
+                state, history_length = snapshot[eligible_agent]
+            else:
+                state, history_length = eligible_agent.state, len(eligible_agent.history)
+
+            for point in state.position:
+                agent_position_mapping[point] = state
 
                 if self.collision_mode == "history":
-                    for history in eligible_agent.history:
+                    for history in eligible_agent.history[:history_length]:
                         for history_point in history.position:
                             agent_position_mapping[history_point] = history
 
         # determine possible collisions and their states
         eligible_positions = set(agent_position_mapping.keys())
         position_intersect = cast(PointSet, eligible_positions & neighbourhood)
+
+        # merge collisions with inert agents, active agents take precedence
+        static_raster = self._static_raster(agent.label)
+        if static_raster is not None and len(neighbourhood) > 0:
+            points = np.array(list(neighbourhood)) - self.static_origin
+            inside = np.all((points >= 0) & (points < self.static_shape), axis=1)
+            indices = np.full(len(points), -1)
+            indices[inside] = static_raster[points[inside, 0], points[inside, 1]]
+
+            for (x, y), index in zip((points[indices >= 0] + self.static_origin).tolist(),
+                                     indices[indices >= 0].tolist()):
+                if (x, y) not in agent_position_mapping:
+                    agent_position_mapping[(x, y)] = self.static_states[index]
+                    position_intersect.add((x, y))
+
         position_intersect_mapping = {
             point: AgentState(
                 position=agent_position_mapping[point].position,
@@ -124,37 +362,359 @@ class Playground(Iterator[np.ndarray], Iterable[np.ndarray]):
             for point in position_intersect
         }
 
+        return position_intersect, position_intersect_mapping
+
+    def _evaluate_agent(
+            self,
+            agent: Agent,
+            snapshot: Optional[Mapping[Agent, tuple[AgentState, int]]] = None,
+    ) -> tuple[list[AgentStep], list[Agent]]:
+        """
+        Advance an agent by one tick without modifying the grid.
+        :param agent: The agent to advance.
+        :param snapshot: The states of the agents at the start of the tick, see `_resolve_collisions`.
+        :return: The steps of the agent which change the grid and the spawned children.
+        """
+
+        collision, collision_mapping = self._resolve_collisions(agent, snapshot)
         previous_position = agent.position
 
-        steps, children = agent.steps(position_intersect, position_intersect_mapping)
+        for observer in self.observers:
+            observer.collisions_resolved(self.agent_indices[agent])
+
+        on_rule = partial(self._rule_evaluated, self.agent_indices[agent]) if self.observers else None
+        steps, children = agent.steps(collision, collision_mapping, on_rule=on_rule)
+        agent_steps: list[AgentStep] = []
 
         for step in steps:
             pos, direction, color, charge = step
             if charge > 0 or charge == -1:
-                position = np.array(sorted(pos))
-                logger.debug("Position: %s, Color: %s", pos, color)
-
-                self.output_grid[position[:, 0], position[:, 1]] = color
+                step_writes = [(np.array(sorted(pos)), color)]
 
                 diff = previous_position - pos
 
                 # Fill the previous position with the backfill color if specified
                 if self.backfill_color is not None and len(diff):
-                    previous_pos = np.array(list(diff))
-                    self.output_grid[previous_pos[:, 0], previous_pos[:, 1]] = self.backfill_color
+                    step_writes.append((np.array(list(diff)), self.backfill_color))
 
                 previous_position = agent.position
-                self.steps.append(self.output_grid.copy())
+                agent_steps.append(AgentStep(state=step, writes=step_writes))
+
+        if not agent.active:
+            self.neighbourhood_cache.pop(agent, None)
+
+        return agent_steps, children
+
+    def _write(self, writes: list[GridWrite]) -> None:
+        for position, color in writes:
+            self.output_grid[position[:, 0], position[:, 1]] = color
+
+    def _rule_evaluated(self, agent_id: int, node: RuleNode, state: Optional[AgentState]) -> None:
+        for observer in self.observers:
+            observer.rule_evaluated(agent_id, node, state is not None)
+
+            if state is not None:
+                observer.rule_fired(agent_id, node, state)
+
+    def _commit(self, agent: Agent, step: AgentStep) -> None:
+        self._write(step.writes)
+        self._index(agent)
+
+        if self.recorder is not None:
+            self.recorder.record(self.agent_indices[agent], step)
+
+        for observer in self.observers:
+            observer.cells_written(self.agent_indices[agent], step)
+
+    def _terminate(self, agent: Agent) -> None:
+        self._index(agent)
+
+        for observer in self.observers:
+            observer.agent_terminated(self.agent_indices[agent], agent)
+
+    def _append_frame(self) -> None:
+        self.steps.append(self.output_grid.copy())
 
+        if self.recorder is not None:
+            self.recorder.frame()
+
+    def _add_children(self, children: list[Agent]) -> None:
         for child in children:
             self.add_agent(child)
-            logger.debug("Spawned child agent at position: %s, Color %s", child.position, child.color)
+
+    def _index(self, agent: Agent) -> None:
+        """
+        Move the cells of an agent in the ray index of its label to its current position.
+        :param agent: The agent.
+        """
+
+        if not self.fast_forward:
+            return
+
+        previous_position = self.indexed_positions.get(agent, PointSet())
+        if previous_position is agent.position:
+            return
+
+        grid_size = (self.output_grid.shape[0], self.output_grid.shape[1])
+        if agent.label not in self.ray_indices:
+            self.ray_indices[agent.label] = RayIndex(np.zeros(grid_size, dtype=bool))
+
+        index = self.ray_indices[agent.label]
+        index.remove(point for point in previous_position - agent.position if in_grid(point, grid_size))
+        index.add(point for point in agent.position - previous_position if in_grid(point, grid_size))
+        self.indexed_positions[agent] = agent.position
+
+    def _free_run(self, agent: Agent) -> int:
+        """
+        The number of steps an agent can move ahead until one of its cells reaches a cell occupied by an agent eligible
+        for collisions with it, looked up in the ray indices of the eligible labels. The agent does not block itself.
+        :param agent: The agent, which must be inside the grid.
+        :return: The free run of the agent, which is not limited by the edge of the grid.
+        """
+
+        height, width = self.output_grid.shape[:2]
+        direction_index = RAY_DIRECTIONS.index(agent.direction)
+        dx, dy = direction_to_unit_vector(agent.direction)
+        points = np.array(list(agent.position))
+        free_run = height + width
+
+        for label in self.topology(agent.label, self.labels):
+            index = self.ray_indices.get(label)
+            if index is None:
+                continue
+
+            runs = index.free[direction_index, points[:, 0], points[:, 1]]
+            for (x, y), run in zip(points.tolist(), runs.tolist()):
+                blocker = (x + (run + 1) * dx, y + (run + 1) * dy)
+                if run >= free_run or not in_grid(blocker, (height, width)):
+                    continue
+
+                # a ray which ends at a cell only the agent occupies continues from that cell
+                if label == agent.label and blocker in agent.position and index.counts[blocker] == 1:
+                    continue
+
+                free_run = run
+
+        return free_run
+
+    def _fast_forward(self, agent: Agent) -> Optional[list[AgentStep]]:
+        """
+        Advance an agent moving in a straight line to the end of its free path at once.
+        The first blocked cell along the path is looked up in the ray indices of the agents, the agent only stops early
+        at the edge of the grid, where the rules decide how it continues.
+        :param agent: The agent to advance.
+        :return: The steps of the agent which change the grid, or None if the agent can not be fast-forwarded.
+        """
+
+        if agent.node not in self.straight_lines:
+            self.straight_lines[agent.node] = straight_line_chain(agent.node)
+
+        line = self.straight_lines[agent.node]
+        if line is None or agent.direction == "none" or not agent.active or self.stencil is None or \
+                self.collision_mode != "current":
+            return None
+
+        # other agents must not move while this agent is advanced
+        if self.execution_mode != "sequential" and sum(1 for other in self.dynamic_agents if other.active) > 1:
+            return None
+
+        height, width = self.output_grid.shape[:2]
+        bounds = agent.position.bounds
+        if (line.grid_size is not None and tuple(line.grid_size) != (height, width)) or bounds is None or \
+                not point_set_in_grid(agent.position, (height, width)):
+            return None
+
+        dx, dy = direction_to_unit_vector(agent.direction)
+        moves = min(
+            height - 1 - bounds[2] if dx > 0 else bounds[0] if dx < 0 else height,
+            width - 1 - bounds[3] if dy > 0 else bounds[1] if dy < 0 else width,
+        )
+        if agent.charge > 0:
+            moves = min(moves, agent.charge)
+
+        if (dx, dy) in self.stencil:
+            # the cell ahead of every cell is in the neighbourhood, the agent moves until one of them is occupied
+            if len(agent.position & agent.position.shift((dx, dy))) > 0:
+                return None
+
+            moves = min(moves, self._free_run(agent))
+        elif any((x + dx - qx, y + dy - qy) in self.stencil for x, y in agent.position for qx, qy in agent.position):
+            return None
+
+        if moves == 0:
+            return None
+
+        # the node of the straight line rule, which fires on every move
+        assert agent.node is not None
+        line_node = agent.node.alternative_node if line.grid_size is not None else agent.node
+        assert line_node is not None
+
+        colors: Sequence[Union[int, Sequence[int]]]
+        if isinstance(agent.colors, ColorSchedule):
+            colors = agent.colors.take(moves)
+        else:
+            colors = [next(agent.colors) for _ in range(moves)]
+
+        agent_steps: list[AgentStep] = []
+        for color in colors:
+            previous_position = agent.position
+            state = AgentState(
+                position=previous_position.shift((dx, dy)),
+                direction=agent.direction,
+                color=color,
+                charge=agent.charge - 1 if agent.charge > 0 else agent.charge,
+            )
+            agent.position, agent.color, agent.charge = state.position, state.color, state.charge
+            agent.history.append(state)
+
+            if self.observers:
+                self._rule_evaluated(self.agent_indices[agent], line_node, state)
+
+            if agent.active:
+                step_writes = [(np.array(sorted(state.position)), state.color)]
+
+                diff = previous_position - state.position
+                if self.backfill_color is not None and len(diff):
+                    step_writes.append((np.array(list(diff)), self.backfill_color))
+
+                agent_steps.append(AgentStep(state=state, writes=step_writes))
+
+        if not agent.active:
+            self.neighbourhood_cache.pop(agent, None)
+
+        return agent_steps
+
+    def _process_agent(self, agent: Agent) -> None:
+        for observer in self.observers:
+            observer.agent_started(self.agent_indices[agent])
+
+        agent_steps = self._fast_forward(agent) if self.fast_forward else None
+        children: list[Agent] = []
+        if agent_steps is None:
+            agent_steps, children = self._evaluate_agent(agent)
+
+        for step in agent_steps:
+            self._commit(agent, step)
+            self._append_frame()
+
+        for observer in self.observers:
+            observer.agent_finished(self.agent_indices[agent])
+
+        if not agent.active:
+            self._terminate(agent)
+
+        self._add_children(children)
+
+    def _synchronous_step(self) -> None:
+        """
+        Advance all active agents against a snapshot of the tick, and commit all their grid writes at once.
+        """
+
+        snapshot = {agent: (agent.state, len(agent.history)) for agent in self.dynamic_agents}
+        agents = [agent for agent in self.dynamic_agents if agent.active]
+
+        def evaluate(agent: Agent) -> tuple[list[AgentStep], list[Agent]]:
+            for observer in self.observers:
+                observer.agent_started(self.agent_indices[agent])
+
+            result = self._evaluate_agent(agent, snapshot)
+
+            for observer in self.observers:
+                observer.agent_finished(self.agent_indices[agent])
+
+            return result
+
+        if self.executor is not None:
+            results = list(self.executor.map(evaluate, agents))
+        else:
+            results = [evaluate(agent) for agent in agents]
+
+        # commit the writes in agent order, later agents overwrite earlier ones
+        committed = False
+        for agent, (agent_steps, _) in zip(agents, results):
+            for step in agent_steps:
+                self._commit(agent, step)
+                committed = True
+
+            if not agent.active:
+                self._terminate(agent)
+
+        if committed:
+            self._append_frame()
+
+        for _, children in results:
+            self._add_children(children)
+
+    def wake(self, agent: Agent, delay: int = 0) -> None:
+        """
+        Schedule a sleeping agent to be evaluated again in event mode.
+        :param agent: The agent to wake up.
+        :param delay: The number of steps after the next step at which the agent is woken up.
+        """
+
+        heappush(self.wakeups, (self.event_tick + 1 + delay, self.agent_indices[agent]))
+
+    def _wake(self, index: int) -> None:
+        for point in self.subscribed.pop(index, ()):
+            self.subscriptions[point].discard(index)
+
+        # agents after the current agent still act within the current step, like in parallel mode
+        if 0 <= self.event_index < index:
+            heappush(self.event_queue, index)
+        else:
+            self.awake.add(index)
+
+    def _notify(self, points: Iterable[Point]) -> None:
+        for point in points:
+            subscribers = self.subscriptions.get(point)
+            if subscribers:
+                for index in list(subscribers):
+                    self._wake(index)
+
+    def _event_step(self) -> None:
+        """
+        Process the awake agents in agent order, agents whose rules did not fire subscribe to their neighbourhood.
+        """
+
+        self.event_tick += 1
+        while self.wakeups and self.wakeups[0][0] <= self.event_tick:
+            _, index = heappop(self.wakeups)
+            if index in self.subscribed:
+                self._wake(index)
+
+        self.event_queue = list(self.awake)
+        self.awake = set()
+        heapify(self.event_queue)
+
+        while self.event_queue:
+            self.event_index = heappop(self.event_queue)
+            agent = self.dynamic_agents[self.event_index]
+            if not agent.active:
+                continue
+
+            previous_position = agent.position
+            num_states = len(agent.history)
+            self._process_agent(agent)
+
+            if len(agent.history) > num_states:
+                self._notify(previous_position)
+                for state in agent.history[num_states:]:
+                    self._notify(state.position)
+
+                self.awake.add(self.event_index)
+            else:
+                neighbourhood = self._resolve_neighbourhood(agent)
+                self.subscribed[self.event_index] = neighbourhood
+                for point in neighbourhood:
+                    self.subscriptions[point].add(self.event_index)
+
+        self.event_index = -1
 
     def step(self) -> None:
         if self.execution_mode == "sequential":
             # Sequential: process one agent at a time until it is inactive
-            if self.current_agent_idx < len(self.agents):
-                agent = self.agents[self.current_agent_idx]
+            if self.current_agent_idx < len(self.dynamic_agents):
+                agent = self.dynamic_agents[self.current_agent_idx]
                 if agent.active:
                     self._process_agent(agent)
                     if not agent.active:
@@ -163,9 +723,15 @@ class Playground(Iterator[np.ndarray], Iterable[np.ndarray]):
                     self.current_agent_idx += 1
         elif self.execution_mode == "parallel":
             # Parallel: process all active agents in one step
-            for agent in self.agents:
+            for agent in self.dynamic_agents:
                 if agent.active:
                     self._process_agent(agent)
+        elif self.execution_mode == "synchronous":
+            # Synchronous: all active agents observe the same tick and move at once
+            self._synchronous_step()
+        elif self.execution_mode == "event":
+            # Event: like parallel, but only agents whose surroundings changed are processed
+            self._event_step()
 
 
 ModelSetup = Callable[[np.ndarray], Playground]
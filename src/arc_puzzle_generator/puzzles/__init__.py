@@ -1,20 +1,118 @@
-from .puzzle_one import puzzle_one
-from .puzzle_two import puzzle_two
-from .puzzle_four import puzzle_four
-from .puzzle_ten import puzzle_ten
-from .puzzle_fourteen import puzzle_fourteen
-from .puzzle_eighteen import puzzle_eighteen
-from .puzzle_twentyfive import puzzle_twentyfive
-from .puzzle_twentyseven import puzzle_twentyseven
-from .puzzle_thirty import puzzle_thirty
-from .puzzle_thirtynine import puzzle_thirtynine
-from .puzzle_fourtyfour import puzzle_fourtyfour
-from .puzzle_fiftyfive import puzzle_fiftyfive
-from .puzzle_sixtyfour import puzzle_sixtyfour
-from .puzzle_sixtyseven import puzzle_sixtyseven
-from .puzzle_seventyfour import puzzle_seventyfour
-from .puzzle_eightysix import puzzle_eightysix
-from .puzzle_ninety import puzzle_ninety
-from .puzzle_ninetytwo import puzzle_ninetytwo
-from .puzzle_hundredfive import puzzle_hundredfive
-from .puzzle_hundredtwelve import puzzle_hundredtwelve
+"""
+The puzzles package contains the puzzle setups, one module per puzzle.
+
+Puzzle modules are imported on first access, e.g. `get_puzzle("puzzle_two")` only imports `puzzle_two`, so processes
+which need a single puzzle do not pay for importing all of them. As before, the names of the package refer to the
+setups, e.g. `from arc_puzzle_generator.puzzles import puzzle_two` imports the setup of `puzzle_two`.
+"""
+import importlib
+import importlib.util
+import sys
+from typing import TYPE_CHECKING, Mapping
+
+if TYPE_CHECKING:
+    from arc_puzzle_generator.playground import ModelSetup
+    from .puzzle_one import puzzle_one
+    from .puzzle_two import puzzle_two
+    from .puzzle_four import puzzle_four
+    from .puzzle_ten import puzzle_ten
+    from .puzzle_fourteen import puzzle_fourteen
+    from .puzzle_eighteen import puzzle_eighteen
+    from .puzzle_twentyfive import puzzle_twentyfive
+    from .puzzle_twentyseven import puzzle_twentyseven
+    from .puzzle_thirty import puzzle_thirty
+    from .puzzle_thirtynine import puzzle_thirtynine
+    from .puzzle_fourtyfour import puzzle_fourtyfour
+    from .puzzle_fiftyfive import puzzle_fiftyfive
+    from .puzzle_sixtyfour import puzzle_sixtyfour
+    from .puzzle_sixtyseven import puzzle_sixtyseven
+    from .puzzle_seventyfour import puzzle_seventyfour
+    from .puzzle_eightysix import puzzle_eightysix
+    from .puzzle_ninety import puzzle_ninety
+    from .puzzle_ninetytwo import puzzle_ninetytwo
+    from .puzzle_ninetyeight import puzzle_ninetyeight
+    from .puzzle_hundredfive import puzzle_hundredfive
+    from .puzzle_hundredtwelve import puzzle_hundredtwelve
+
+PUZZLES: Mapping[str, str] = {
+    "puzzle_one": "1ae2feb7",
+    "puzzle_two": "3e6067c3",
+    "puzzle_four": "142ca369",
+    "puzzle_ten": "195c6913",
+    "puzzle_fourteen": "221dfab4",
+    "puzzle_eighteen": "28a6681f",
+    "puzzle_twentyfive": "332f06d7",
+    "puzzle_twentyseven": "36a08778",
+    "puzzle_thirty": "3dc255db",
+    "puzzle_thirtynine": "53fb4810",
+    "puzzle_fourtyfour": "5961cc34",
+    "puzzle_fiftyfive": "7666fa5d",
+    "puzzle_sixtyfour": "80a900e0",
+    "puzzle_sixtyseven": "88e364bc",
+    "puzzle_seventyfour": "8f3a5a89",
+    "puzzle_eightysix": "aa4ec2a5",
+    "puzzle_ninety": "b5ca7ac4",
+    "puzzle_ninetytwo": "16de56c4",
+    "puzzle_ninetyeight": "cb2d8a2c",
+    "puzzle_hundredfive": "db695cfb",
+    "puzzle_hundredtwelve": "e376de54",
+}
+"""
+Maps the name of every puzzle, which is also the name of its module and of the setup in it, to its ARC task id.
+"""
+
+TASKS: Mapping[str, str] = {task: name for name, task in PUZZLES.items()}
+"""
+Maps ARC task ids to puzzle names.
+"""
+
+__all__ = ["PUZZLES", "TASKS", "get_puzzle", *PUZZLES]
+
+
+def get_puzzle(name: str) -> 'ModelSetup':
+    """
+    Look up a puzzle setup, its module is imported on first access.
+
+    :param name: The name of the puzzle, e.g. `puzzle_two`, or its ARC task id, e.g. `3e6067c3`.
+    :return: The puzzle setup.
+    """
+
+    puzzle = TASKS.get(name, name)
+    if puzzle not in PUZZLES:
+        raise KeyError(f"No puzzle found for '{name}'")
+
+    return getattr(importlib.import_module(f"{__name__}.{puzzle}"), puzzle)
+
+
+def _register(name: str) -> None:
+    # the module is registered before it is imported, so importing it does not bind the module to its name in the
+    # package, which refers to the setup instead
+    module_name = f"{__name__}.{name}"
+    if module_name in sys.modules:
+        return
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named '{module_name}'", name=module_name)
+
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+
+
+for _name in PUZZLES:
+    _register(_name)
+
+del _name
+
+
+def __getattr__(name: str) -> 'ModelSetup':
+    if name in PUZZLES:
+        return getattr(importlib.import_module(f"{__name__}.{name}"), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *PUZZLES})
@@ -1,5 +1,4 @@
 import random
-from itertools import cycle
 
 import numpy as np
 
@@ -9,6 +8,7 @@ from arc_puzzle_generator.neighbourhood import moore_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, GravityRule, CollisionConditionRule
 from arc_puzzle_generator.topology import all_topology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.grid import unmask
 
 
@@ -28,7 +28,7 @@ def puzzle_eighteen(input_grid: np.ndarray) -> Playground:
         position=unmask(input_grid == target_color),
         direction="none",
         label="border",
-        colors=cycle([target_color]),
+        colors=ColorStream(repeat=[target_color]),
         charge=0
     ) for target_color in colors if target_color not in [0, 1]]
 
@@ -50,7 +50,7 @@ def puzzle_eighteen(input_grid: np.ndarray) -> Playground:
                 )
             ),
         ),
-        colors=cycle([1]),
+        colors=ColorStream(repeat=[1]),
         charge=40 if point[0] < input_grid.shape[0] - 1 else 0
     ) for point in sorted(unmask(water_mask), reverse=True)]
 
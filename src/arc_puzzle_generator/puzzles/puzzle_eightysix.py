@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -10,6 +8,7 @@ from arc_puzzle_generator.physics import direction_to_unit_vector, shift
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, TerminateAtPointRule, CollisionConditionRule
 from arc_puzzle_generator.topology import all_topology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import find_connected_objects, extreme_point, find_holes
 from arc_puzzle_generator.utils.grid import unmask
 
@@ -41,7 +40,7 @@ def puzzle_eightysix(input_grid: np.ndarray) -> Playground:
             position=unmask(mask),
             direction="none",
             label=f"block_{i}",
-            colors=iter([1]),
+            colors=ColorStream([1]),
             charge=0,
         ))
 
@@ -55,7 +54,7 @@ def puzzle_eightysix(input_grid: np.ndarray) -> Playground:
             position=PointSet([start_point]),
             direction="right",
             label=f"frame_{i}",
-            colors=cycle([2]),
+            colors=ColorStream(repeat=[2]),
             charge=-1,
             node=RuleNode(
                 TerminateAtPointRule(PointSet([start_point]), direction_rule=identity_direction),
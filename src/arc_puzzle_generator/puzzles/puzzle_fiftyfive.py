@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -9,6 +7,7 @@ from arc_puzzle_generator.neighbourhood import moore_neighbours
 from arc_puzzle_generator.physics import direction_to_unit_vector, shift
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, CollisionConditionRule
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import colour_count, find_connected_objects
 
 
@@ -66,7 +65,7 @@ def puzzle_fiftyfive(
                         position=PointSet([shift(point, direction_to_unit_vector("bottom_right"))]),
                         direction="bottom_right",
                         label="agent",
-                        colors=cycle([foreground_color]),
+                        colors=ColorStream(repeat=[foreground_color]),
                         node=RuleNode(
                             CollisionConditionRule(
                                 direction_rule=identity_direction,
@@ -84,7 +83,7 @@ def puzzle_fiftyfive(
                             position=PointSet([shift(point, direction_to_unit_vector("right"))]),
                             direction="bottom_right",
                             label="agent",
-                            colors=cycle([foreground_color]),
+                            colors=ColorStream(repeat=[foreground_color]),
                             node=RuleNode(
                                 CollisionConditionRule(
                                     direction_rule=identity_direction,
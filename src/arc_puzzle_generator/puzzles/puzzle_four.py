@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -9,6 +7,7 @@ from arc_puzzle_generator.neighbourhood import moore_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import OutOfGridRule, RuleNode, CollisionConditionRule, COLLIDE_ALL
 from arc_puzzle_generator.topology import FixedGroupTopology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import find_colors, find_connected_objects, is_l_shape, starting_point
 from arc_puzzle_generator.utils.grid import make_smallest_square_from_mask
 
@@ -42,7 +41,7 @@ def puzzle_four(input_grid: np.ndarray) -> Playground:
         position=PointSet.from_numpy(bbox),
         direction="none",
         label="bbox",
-        colors=cycle([target_color]),
+        colors=ColorStream(repeat=[target_color]),
         charge=0
     ) for target_color, bbox in blocks]
 
@@ -82,7 +81,7 @@ def puzzle_four(input_grid: np.ndarray) -> Playground:
         direction=direction,
         label="puzzle_four_agent",
         node=node,
-        colors=cycle([color]),
+        colors=ColorStream(repeat=[color]),
         charge=-1,
     ) for color, bbox, direction in l_shapes]
 
@@ -1,4 +1,3 @@
-from itertools import cycle
 from typing import cast
 
 import numpy as np
@@ -11,6 +10,7 @@ from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, backtrack_rule, Rule, \
     CollisionConditionRule
 from arc_puzzle_generator.topology import FixedGroupTopology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import find_connected_objects
 from arc_puzzle_generator.utils.grid import unmask
 
@@ -49,7 +49,7 @@ def puzzle_fourteen(input_grid: np.ndarray) -> Playground:
         position=unmask(input_grid == foreground_color),
         direction="none",
         label="foreground",
-        colors=cycle([foreground_color]),
+        colors=ColorStream(repeat=[foreground_color]),
         charge=0,
     ), Agent(
         unmask(labeled_grid),
@@ -68,7 +68,7 @@ def puzzle_fourteen(input_grid: np.ndarray) -> Playground:
                 )
             )
         ),
-        colors=cycle([
+        colors=ColorStream(repeat=[
             start_color, background_color, start_color, background_color, fill_color, background_color
         ]),
         charge=input_grid.shape[0] if direction in ["up", "down"] else input_grid.shape[1],
@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -8,6 +6,7 @@ from arc_puzzle_generator.neighbourhood import moore_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, CollisionConditionRule
 from arc_puzzle_generator.topology import all_topology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import find_connected_objects, relative_box_direction, mask_to_bbox
 from arc_puzzle_generator.utils.grid import unmask
 
@@ -42,7 +41,7 @@ def puzzle_fourtyfour(input_grid: np.ndarray) -> Playground:
 
         colors = input_grid[labels == i]
 
-        color_iterator = iter([colors.flatten().tolist(), ])
+        color_iterator = ColorStream([colors.flatten().tolist(), ])
 
         agents.append(Agent(
             position=unmask(labels == i),
@@ -57,7 +56,7 @@ def puzzle_fourtyfour(input_grid: np.ndarray) -> Playground:
         position=unmask(input_grid == agent_tip_color),
         direction="up",
         label="shooter",
-        colors=cycle([agent_color]),
+        colors=ColorStream(repeat=[agent_color]),
         node=RuleNode(
             OutOfGridRule(grid_size=input_grid.shape),
             alternative_node=RuleNode(
@@ -1,4 +1,4 @@
-from itertools import combinations, cycle
+from itertools import combinations
 
 import numpy as np
 
@@ -8,6 +8,7 @@ from arc_puzzle_generator.geometry import Point, PointSet, Direction
 from arc_puzzle_generator.physics import shift, direction_to_unit_vector
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, CollisionConditionRule
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.grid import unmask
 
 
@@ -60,7 +61,7 @@ def puzzle_hundredfive(input_grid: np.ndarray) -> Playground:
                 charge=len(colors) - 1,
                 direction=direction,
                 label="blue",
-                colors=iter(colors),
+                colors=ColorStream(colors),
                 node=RuleNode(
                     CollisionConditionRule(
                         direction_rule=identity_direction,
@@ -75,7 +76,7 @@ def puzzle_hundredfive(input_grid: np.ndarray) -> Playground:
                     charge=-1,
                     direction=beam1,
                     label="purple",
-                    colors=cycle([6]),
+                    colors=ColorStream(repeat=[6]),
                     node=RuleNode(
                         OutOfGridRule(grid_size=input_grid.shape),
                         alternative_node=RuleNode(
@@ -93,7 +94,7 @@ def puzzle_hundredfive(input_grid: np.ndarray) -> Playground:
                     charge=-1,
                     direction=beam2,
                     label="purple",
-                    colors=cycle([6]),
+                    colors=ColorStream(repeat=[6]),
                     node=RuleNode(
                         OutOfGridRule(grid_size=input_grid.shape),
                         alternative_node=RuleNode(
@@ -110,3 +111,77 @@ def puzzle_hundredfive(input_grid: np.ndarray) -> Playground:
         output_grid=input_grid,
         agents=agents,
     )
+
+
+def sample_puzzle_hundredfive(
+        rng: np.random.Generator,
+        grid_size: Point,
+        num_entities: int,
+        max_attempts: int = 100,
+) -> np.ndarray:
+    """
+    Samples an input grid for puzzle 105.
+    Every entity is a pair of blue points on a diagonal, with purple points scattered on the line between them.
+    Placements are rejected and sampled again if the diagonal of the entity crosses a cell of another entity, if a
+    cell of the entity lies on the diagonal of another entity or if a blue point shares a diagonal with a blue point of
+    another entity, since the puzzle would pair such points up as well.
+
+    :param rng: The random number generator.
+    :param grid_size: The size of the grid, at least (3, 3).
+    :param num_entities: The number of blue diagonal pairs.
+    :param max_attempts: The maximum number of placements sampled per entity before giving up.
+    :return: The input grid.
+    """
+
+    background_color = rng.choice([color for color in range(10) if color not in (1, 6)]).item()
+    input_grid = np.full(grid_size, background_color)
+    blue_points: list[Point] = []
+    # the diagonals of the placed entities, identified by their direction and row - col or row + col
+    diagonals: set[tuple[Direction, int]] = set()
+    directions: tuple[Direction, Direction] = ("bottom_right", "bottom_left")
+
+    def diagonal(point: Point, direction: Direction) -> tuple[Direction, int]:
+        return direction, point[0] - point[1] if direction == "bottom_right" else point[0] + point[1]
+
+    for _ in range(num_entities):
+        occupied = unmask(input_grid != background_color)
+
+        for _ in range(max_attempts):
+            direction: Direction = "bottom_right" if rng.random() < 0.5 else "bottom_left"
+            length = int(rng.integers(2, min(grid_size)))
+            row = int(rng.integers(0, grid_size[0] - length))
+
+            if direction == "bottom_right":
+                col = int(rng.integers(0, grid_size[1] - length))
+            else:
+                col = int(rng.integers(length, grid_size[1]))
+
+            d_row, d_col = direction_to_unit_vector(direction)
+            line = [(row + i * d_row, col + i * d_col) for i in range(length + 1)]
+
+            crossed = any(diagonal(point, direction) == diagonal(line[0], direction) for point in occupied)
+            on_diagonal = any(
+                diagonal(point, other_direction) in diagonals
+                for point in line for other_direction in directions
+            )
+            paired = any(
+                same_diagonal(point, blue_point) for point in (line[0], line[-1]) for blue_point in blue_points
+            )
+            if not (crossed or on_diagonal or paired):
+                break
+        else:
+            raise ValueError(
+                f"No valid layout found for a grid of size {grid_size} with {num_entities} entities "
+                f"after {max_attempts} attempts."
+            )
+
+        input_grid[line[0]] = 1
+        input_grid[line[-1]] = 1
+        blue_points.extend([line[0], line[-1]])
+        diagonals.add(diagonal(line[0], direction))
+
+        for point in line[1:-1]:
+            if rng.random() < 0.3:
+                input_grid[point] = 6
+
+    return input_grid
@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -8,6 +6,7 @@ from arc_puzzle_generator.geometry import Direction, PointSet
 from arc_puzzle_generator.neighbourhood import moore_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, CollisionConditionRule
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import find_connected_objects
 
 
@@ -53,7 +52,7 @@ def puzzle_hundredtwelve(
             direction=orientation,
             label=f"agent_{i}",
             charge=charge,
-            colors=cycle([color]),
+            colors=ColorStream(repeat=[color]),
             node=RuleNode(
                 CollisionConditionRule(
                     direction_rule=identity_direction,
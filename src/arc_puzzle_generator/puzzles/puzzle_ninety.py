@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -9,6 +7,7 @@ from arc_puzzle_generator.neighbourhood import von_neumann_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, TrappedCollisionRule, CollisionConditionRule
 from arc_puzzle_generator.topology import identity_topology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import colour_count, find_5x5_grids_with_border
 
 
@@ -49,7 +48,7 @@ def puzzle_ninety(input_grid: np.ndarray) -> Playground:
             bbox[1, 0]:bbox[3, 0] + 1,
             bbox[1, 1]:bbox[3, 1] + 1,
         ]
-        color_iterator = cycle([colors.flatten().tolist(), ])
+        color_iterator = ColorStream(repeat=[colors.flatten().tolist(), ])
 
         agents.append(Agent(
             position=position,
@@ -73,7 +72,7 @@ def puzzle_ninety(input_grid: np.ndarray) -> Playground:
             bbox[1, 0]:bbox[3, 0] + 1,
             bbox[1, 1]:bbox[3, 1] + 1,
         ]
-        color_iterator = cycle([colors.flatten().tolist(), ])
+        color_iterator = ColorStream(repeat=[colors.flatten().tolist(), ])
 
         agents.append(Agent(
             position=position,
@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -9,6 +7,7 @@ from arc_puzzle_generator.neighbourhood import resolve_point_set_neighbourhood,
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, ProximityRule
 from arc_puzzle_generator.topology import all_topology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import find_connected_objects
 from arc_puzzle_generator.utils.grid import unmask
 
@@ -37,7 +36,7 @@ def puzzle_ninetyeight(input_grid: np.ndarray) -> Playground:
             position=extended_obstacle,
             direction="none",
             label=f"obstacle_{i}",
-            colors=iter([1]),
+            colors=ColorStream([1]),
             node=None,
             charge=0,
         ))
@@ -85,7 +84,7 @@ def puzzle_ninetyeight(input_grid: np.ndarray) -> Playground:
         position=agent_pos,
         direction=direction,
         label="snake",
-        colors=cycle([agent_color]),
+        colors=ColorStream(repeat=[agent_color]),
         node=RuleNode(
             OutOfGridRule(grid_size=input_grid.shape),
             alternative_node=RuleNode(
@@ -5,7 +5,7 @@ from arc_puzzle_generator.direction import identity_direction
 from arc_puzzle_generator.geometry import Direction, PointSet
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, CollisionConditionRule
-from arc_puzzle_generator.utils.color_sequence_iterator import ColorSequenceIterator
+from arc_puzzle_generator.utils.color_schedule import ColorSchedule
 
 
 def puzzle_ninetytwo(input_grid: np.ndarray, orientation: Direction = "right") -> Playground:
@@ -85,7 +85,7 @@ def puzzle_ninetytwo(input_grid: np.ndarray, orientation: Direction = "right") -
                 direction=orientation,
                 charge=end - start,
                 label=f"agent_{row_idx}",
-                colors=ColorSequenceIterator(patterns),
+                colors=ColorSchedule(patterns),
                 node=RuleNode(
                     CollisionConditionRule(
                         direction_rule=identity_direction,
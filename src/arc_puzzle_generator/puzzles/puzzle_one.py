@@ -4,12 +4,12 @@ import numpy as np
 
 from arc_puzzle_generator.agent import Agent
 from arc_puzzle_generator.direction import identity_direction
-from arc_puzzle_generator.geometry import PointSet, Direction
+from arc_puzzle_generator.geometry import Point, PointSet, Direction
 from arc_puzzle_generator.neighbourhood import zero_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, CollisionConditionRule
 from arc_puzzle_generator.topology import identity_topology
-from arc_puzzle_generator.utils.color_sequence_iterator import ColorSequenceIterator
+from arc_puzzle_generator.utils.color_schedule import ColorSchedule
 from arc_puzzle_generator.utils.entities import colour_count, find_connected_objects
 
 
@@ -72,8 +72,54 @@ def puzzle_one(input_grid: np.ndarray) -> Playground:
                 ),
             ),
             charge=charge,
-            colors=ColorSequenceIterator(color_sequence, background_color),
+            colors=ColorSchedule(color_sequence, background_color),
         ) for row, color_sequence in color_sequences],
         neighbourhood=zero_neighbours,
         topology=identity_topology,
     )
+
+
+def sample_puzzle_one(
+        rng: np.random.Generator,
+        grid_size: Point,
+        num_entities: int,
+        max_attempts: int = 100,
+) -> np.ndarray:
+    """
+    Samples an input grid for the color iteration puzzle.
+    Every entity is a row of colored runs next to a vertical separator line, which are repeated across the separator.
+    Layouts in which the separator is not the second most frequent color are rejected and sampled again.
+
+    :param rng: The random number generator.
+    :param grid_size: The size of the grid, at least (3, 4).
+    :param num_entities: The number of colored rows.
+    :param max_attempts: The maximum number of layouts sampled before giving up.
+    :return: The input grid.
+    """
+
+    for _ in range(max_attempts):
+        background_color, line_color, *colors = rng.permutation(10).tolist()
+        separator = int(rng.integers(1, max(grid_size[1] // 2, 2)))
+        rows = rng.choice(grid_size[0], size=min(num_entities, grid_size[0]), replace=False)
+
+        input_grid = np.full(grid_size, background_color)
+        input_grid[:, separator] = line_color
+
+        for row in rows.tolist():
+            num_runs = int(rng.integers(1, min(3, separator) + 1))
+            run_colors = rng.choice(colors, size=num_runs, replace=False).tolist()
+            boundaries = sorted(rng.choice(np.arange(1, separator), size=num_runs - 1, replace=False).tolist())
+            start = int(rng.integers(0, boundaries[0] if boundaries else separator))
+
+            for color, begin, end in zip(run_colors, [start] + boundaries, boundaries + [separator]):
+                input_grid[row, begin:end] = color
+
+        # the separator has to be the second most frequent color
+        counts = np.bincount(input_grid.ravel(), minlength=10)
+        if counts[background_color] > counts[line_color] > np.max(np.delete(counts, [background_color, line_color])):
+            return input_grid
+
+    raise ValueError(
+        f"No valid layout found for a grid of size {grid_size} with {num_entities} entities "
+        f"after {max_attempts} attempts."
+    )
@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -10,6 +8,7 @@ from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, TerminateAtPointRule, \
     CollisionConditionRule, OutOfGridRule
 from arc_puzzle_generator.topology import all_topology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.grid import unmask
 
 
@@ -26,7 +25,7 @@ def puzzle_seventyfour(input_grid: np.ndarray) -> Playground:
         position=unmask(input_grid == 1),
         direction="none",
         label="obstacle",
-        colors=iter([1]),
+        colors=ColorStream([1]),
         charge=0,
     ), Agent(
         position=start_point.shift(direction_to_unit_vector("right")),
@@ -67,7 +66,7 @@ def puzzle_seventyfour(input_grid: np.ndarray) -> Playground:
                 )
             )
         ),
-        colors=cycle([7]),
+        colors=ColorStream(repeat=[7]),
         charge=-1,
     )]
 
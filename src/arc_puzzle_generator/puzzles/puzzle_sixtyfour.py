@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -9,6 +7,7 @@ from arc_puzzle_generator.neighbourhood import moore_neighbours
 from arc_puzzle_generator.physics import direction_to_unit_vector
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, CollisionConditionRule
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import colour_count, find_connected_objects
 from arc_puzzle_generator.utils.grid import unmask
 
@@ -55,7 +54,7 @@ def puzzle_sixtyfour(input_grid: np.ndarray) -> Playground:
                             position=PointSet([min(beam_points)]),
                             direction=agent_direction,
                             label=f"{beam_color}_{agent_direction}_start",
-                            colors=cycle([beam_color]),
+                            colors=ColorStream(repeat=[beam_color]),
                             node=RuleNode(
                                 OutOfGridRule(grid_size=input_grid.shape),
                                 alternative_node=RuleNode(
@@ -71,7 +70,7 @@ def puzzle_sixtyfour(input_grid: np.ndarray) -> Playground:
                             position=PointSet([max(beam_points)]),
                             direction=agent_direction,
                             label=f"{beam_color}_{agent_direction}_end",
-                            colors=cycle([beam_color]),
+                            colors=ColorStream(repeat=[beam_color]),
                             node=RuleNode(
                                 OutOfGridRule(grid_size=input_grid.shape),
                                 alternative_node=RuleNode(
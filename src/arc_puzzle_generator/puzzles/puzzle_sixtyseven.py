@@ -10,6 +10,7 @@ from arc_puzzle_generator.neighbourhood import moore_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, TrappedCollisionRule, CollisionConditionRule
 from arc_puzzle_generator.topology import all_topology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import colour_count, find_connected_objects
 from arc_puzzle_generator.utils.grid import unmask
 
@@ -49,7 +50,7 @@ def puzzle_sixtyseven(
                     position=unmask(box_labels == i),
                     direction="none",
                     label=f"box_{box_color}_{i}",
-                    colors=cycle([box_color]),
+                    colors=ColorStream(repeat=[box_color]),
                 ))
 
     agent_color = 4
@@ -60,7 +61,7 @@ def puzzle_sixtyseven(
             position=unmask(agent_labels == i),
             label=f"agent_{agent_color}_{i}",
             direction=direction,
-            colors=cycle([agent_color]),
+            colors=ColorStream(repeat=[agent_color]),
             node=RuleNode(
                 TrappedCollisionRule(direction_rule=identity_direction, select_direction=True),
                 alternative_node=RuleNode(
@@ -1,5 +1,4 @@
 from collections import defaultdict
-from itertools import cycle
 from typing import Mapping, cast
 
 import numpy as np
@@ -12,6 +11,7 @@ from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import OutOfGridRule, TrappedCollisionRule, backtrack_rule, Rule, \
     RuleNode, CollisionConditionRule
 from arc_puzzle_generator.topology import FixedGroupTopology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import colour_count, find_colors, find_connected_objects
 from arc_puzzle_generator.utils.grid import unmask
 
@@ -58,7 +58,7 @@ def puzzle_ten(input_grid: np.ndarray) -> Playground:
         position=foreground_position,
         direction="none",
         label="foreground",
-        colors=cycle([outside_color]),
+        colors=ColorStream(repeat=[outside_color]),
         charge=0,
     )]
 
@@ -97,7 +97,7 @@ def puzzle_ten(input_grid: np.ndarray) -> Playground:
         direction="right",
         label="snake",
         node=node,
-        colors=cycle(color_sequence),
+        colors=ColorStream(repeat=color_sequence),
         charge=-1,
     ) for row in start_rows]
 
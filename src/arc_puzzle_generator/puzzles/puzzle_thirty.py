@@ -9,6 +9,7 @@ from arc_puzzle_generator.geometry import PointSet, Direction
 from arc_puzzle_generator.neighbourhood import moore_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, CollisionConditionRule
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import colour_count, find_connected_objects, box_contained, extreme_point
 
 
@@ -74,7 +75,7 @@ def puzzle_thirty(
                     ),
                 )
             ),
-            colors=iter(colors),
+            colors=ColorStream(colors),
             charge=charge,
         ))
 
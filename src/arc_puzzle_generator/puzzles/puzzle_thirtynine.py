@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -8,6 +6,7 @@ from arc_puzzle_generator.geometry import PointSet
 from arc_puzzle_generator.neighbourhood import moore_neighbours, resolve_point_set_neighbourhood
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import OutOfGridRule, RuleNode, CollisionConditionRule
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import find_connected_objects, relative_box_direction, get_bounding_box, \
     direction_to_numpy_unit_vector
 from arc_puzzle_generator.utils.grid import unmask
@@ -33,7 +32,7 @@ def puzzle_thirtynine(
             moore_neighbours
         )
 
-        neighbours_np = np.array(list(neighbours))
+        neighbours_np = np.array(sorted(neighbours))
         neighbours_idx = np.where(
             input_grid[neighbours_np[:, 0], neighbours_np[:, 1]] != background_color
         )
@@ -78,7 +77,7 @@ def puzzle_thirtynine(
                                 ),
                             ),
                         ),
-                        colors=cycle(color_sequence),
+                        colors=ColorStream(repeat=color_sequence),
                         charge=-1,
                     ))
 
@@ -1,5 +1,3 @@
-from itertools import cycle
-
 import numpy as np
 
 from arc_puzzle_generator.agent import Agent
@@ -9,6 +7,7 @@ from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, TrappedCollisionRule, ProximityRule, \
     CollisionConditionRule
 from arc_puzzle_generator.topology import all_topology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.grid import unmask
 
 
@@ -35,7 +34,7 @@ def puzzle_twentyfive(input_grid: np.ndarray) -> Playground:
             background_points,
             direction="none",
             label="background",
-            colors=iter([background_color]),
+            colors=ColorStream([background_color]),
             charge=0,
         ),
         Agent(
@@ -61,7 +60,7 @@ def puzzle_twentyfive(input_grid: np.ndarray) -> Playground:
                     )
                 ),
             ),
-            colors=cycle([agent_color]),
+            colors=ColorStream(repeat=[agent_color]),
             charge=50,
         )
     ]
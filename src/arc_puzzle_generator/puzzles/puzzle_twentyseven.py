@@ -1,5 +1,4 @@
 import random
-from itertools import cycle
 from typing import Sequence
 
 import numpy as np
@@ -11,6 +10,7 @@ from arc_puzzle_generator.neighbourhood import moore_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, TrappedCollisionRule, GravityRule, AgentSpawnRule
 from arc_puzzle_generator.topology import all_topology
+from arc_puzzle_generator.utils.color_stream import ColorStream
 from arc_puzzle_generator.utils.entities import find_connected_objects
 from arc_puzzle_generator.utils.grid import unmask
 
@@ -35,7 +35,7 @@ def puzzle_twentyseven(input_grid: np.ndarray) -> Playground:
             position=unmask(labels == i),
             direction="none",
             label="border",
-            colors=iter([border_color]),
+            colors=ColorStream([border_color]),
             charge=0,
         ))
 
@@ -68,7 +68,7 @@ def puzzle_twentyseven(input_grid: np.ndarray) -> Playground:
                     )
                 )
             ),
-            colors=cycle([agent_color]),
+            colors=ColorStream(repeat=[agent_color]),
             charge=-1,
         ))
 
@@ -5,12 +5,12 @@ import numpy as np
 
 from arc_puzzle_generator.agent import Agent
 from arc_puzzle_generator.direction import identity_direction
-from arc_puzzle_generator.geometry import PointSet, Direction
+from arc_puzzle_generator.geometry import Point, PointSet, Direction
 from arc_puzzle_generator.neighbourhood import zero_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, CollisionConditionRule
 from arc_puzzle_generator.topology import identity_topology
-from arc_puzzle_generator.utils.color_sequence_iterator import ColorSequenceIterator
+from arc_puzzle_generator.utils.color_schedule import ColorSchedule
 from arc_puzzle_generator.utils.entities import colour_count, find_connected_objects, starting_point, \
     relative_box_direction, box_distance
 
@@ -109,7 +109,7 @@ def puzzle_two(input_grid: np.ndarray) -> Playground:
                     conditions=[(False, "none")]
                 )),
                 charge=distance,
-                colors=ColorSequenceIterator(
+                colors=ColorSchedule(
                     [(box_color, distance), (boxes[box1][1], 1)],
                     background_color=background_color
                 ),
@@ -118,3 +118,68 @@ def puzzle_two(input_grid: np.ndarray) -> Playground:
         neighbourhood=zero_neighbours,
         topology=identity_topology,
     )
+
+
+def sample_puzzle_two(rng: np.random.Generator, grid_size: Point, num_entities: int) -> np.ndarray:
+    """
+    Samples an input grid for the rectangle iteration order puzzle.
+    Boxes are laid out on a lattice, `num_entities` of them form a path whose colors are given by the legend row.
+
+    :param rng: The random number generator.
+    :param grid_size: The size of the grid, at least (10, 10).
+    :param num_entities: The number of boxes on the path, between 2 and 8.
+    :return: The input grid.
+    """
+
+    background_color, box_color, *target_colors = rng.permutation(10).tolist()
+    inner_size = int(rng.integers(1, 3))
+    horizontal_gap, vertical_gap = rng.integers(1, 4, size=2).tolist()
+
+    # the last two rows contain the legend, the row above is kept empty
+    while True:
+        box_size = inner_size + 2
+        rows = (grid_size[0] - 4 + vertical_gap) // (box_size + vertical_gap)
+        cols = (grid_size[1] - 1 + horizontal_gap) // (box_size + horizontal_gap)
+
+        if rows * cols >= 2 or (inner_size, horizontal_gap, vertical_gap) == (1, 1, 1):
+            break
+
+        # fall back to the most compact layout on small grids
+        inner_size, horizontal_gap, vertical_gap = 1, 1, 1
+
+    num_entities = min(num_entities, rows * cols, len(target_colors), grid_size[1] // 2)
+
+    if num_entities < 2:
+        raise ValueError(f"The grid size {grid_size} is too small to sample puzzle two.")
+
+    # sample a self-avoiding walk on the lattice, restarting when the walk gets stuck
+    path: list[Point] = []
+    while len(path) < num_entities:
+        path = [(int(rng.integers(rows)), int(rng.integers(cols)))]
+        while len(path) < num_entities:
+            row, col = path[-1]
+            candidates = [
+                (row + d_row, col + d_col) for d_row, d_col in ((0, 1), (0, -1), (1, 0), (-1, 0))
+                if 0 <= row + d_row < rows and 0 <= col + d_col < cols and (row + d_row, col + d_col) not in path
+            ]
+            if len(candidates) == 0:
+                break
+            path.append(candidates[rng.integers(len(candidates))])
+
+    # boxes which are not on the path receive the remaining colors
+    boxes = dict(zip(path, target_colors))
+    remaining_colors = target_colors[num_entities:]
+    for cell in rng.permutation([(row, col) for row in range(rows) for col in range(cols)]).tolist():
+        if tuple(cell) not in boxes and len(remaining_colors) > 0 and rng.random() < 0.5:
+            boxes[(cell[0], cell[1])] = remaining_colors.pop()
+
+    input_grid = np.full(grid_size, background_color)
+    for (row, col), color in boxes.items():
+        top = 1 + row * (box_size + vertical_gap)
+        left = 1 + col * (box_size + horizontal_gap)
+        input_grid[top:top + box_size, left:left + box_size] = box_color
+        input_grid[top + 1:top + box_size - 1, left + 1:left + box_size - 1] = color
+
+    input_grid[-2, 1:2 * num_entities:2] = [boxes[cell] for cell in path]
+
+    return input_grid
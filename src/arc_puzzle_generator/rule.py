@@ -1,14 +1,19 @@
 import math
 import random
 from collections import deque
+from functools import lru_cache
 from itertools import chain, cycle
-from typing import Protocol, Optional, Sequence, Literal, Iterator
+from typing import Protocol, Optional, Sequence, Literal, Iterator, NamedTuple
+
+import numpy as np
 
 from arc_puzzle_generator.direction import DirectionTransformer
-from arc_puzzle_generator.direction import absolute_direction
-from arc_puzzle_generator.geometry import PointSet, Point, Direction, in_grid
-from arc_puzzle_generator.physics import direction_to_unit_vector, collision_axis, relative_point_direction, shift
-from arc_puzzle_generator.selection import resolve_point_set_selectors_with_direction, resolve_cell_selection
+from arc_puzzle_generator.direction import absolute_direction, identity_direction
+from arc_puzzle_generator.geometry import PointSet, Point, Direction, in_grid, point_set_in_grid
+from arc_puzzle_generator.physics import direction_to_unit_vector, collision_axis, relative_point_direction, shift, \
+    squared_distance_field
+from arc_puzzle_generator.selection import resolve_point_set_selectors_with_direction, resolve_cell_selection, \
+    occupancy_code, direction_bit
 from arc_puzzle_generator.state import AgentState, AgentStateMapping, ColorIterator
 
 RuleResult = Optional[tuple[AgentState, ColorIterator, list[AgentState]]]
@@ -155,6 +160,31 @@ class CollisionConditionRule(Rule):
         self.update_agent_color_on_collision = update_agent_color_on_collision
         self.entity_redirect = entity_redirect
         self.resize_entity_to_exit = resize_entity_to_exit
+        self._masks: dict[Direction, tuple[int, int]] = {}
+
+    def _compile_conditions(self, direction: Direction) -> tuple[int, int]:
+        """
+        Compile the conditions for an agent direction into bitmasks of occupancy codes.
+        :param direction: The direction of the agent.
+        :return: The bits which must be occupied and the bits which must be free.
+        """
+
+        if direction not in self._masks:
+            occupied, free = 0, 0
+            for condition, condition_direction in self.conditions:
+                if condition_direction != "none":
+                    condition_direction = absolute_direction(direction, condition_direction)
+                else:
+                    condition_direction = direction
+
+                if condition:
+                    occupied |= direction_bit(condition_direction)
+                else:
+                    free |= direction_bit(condition_direction)
+
+            self._masks[direction] = (occupied, free)
+
+        return self._masks[direction]
 
     def __call__(
             self,
@@ -172,29 +202,15 @@ class CollisionConditionRule(Rule):
         :return: A new state with the updated direction if all conditions are met, otherwise None.
         """
 
-        conditions_met = []
-        collision_met = PointSet()
-        for condition, condition_direction in self.conditions:
-            if condition_direction == "none":
-                direction = states[-1].direction
-            else:
-                direction = absolute_direction(states[-1].direction, condition_direction)
+        occupied, free = self._compile_conditions(states[-1].direction)
+        code = occupancy_code(states[-1].position, collision, occupied | free)
 
-            sub_collision = resolve_point_set_selectors_with_direction(
-                states[-1].position, collision, direction
-            )
-
-            if condition and len(sub_collision) > 0:
-                conditions_met.append(True)
-                collision_met.update(sub_collision)
-            elif not condition and len(sub_collision) == 0:
-                conditions_met.append(True)
-            else:
-                conditions_met.append(False)
+        if self.condition_mode == "AND":
+            conditions_met = (code & occupied) == occupied and (code & free) == 0
+        else:
+            conditions_met = (code & occupied) != 0 or (~code & free) != 0
 
-        if (self.condition_mode == "AND" and all(conditions_met)) or (
-                self.condition_mode == "OR" and any(conditions_met)) or (
-                len(self.conditions) == 0 and len(collision) > 0):
+        if conditions_met or (len(self.conditions) == 0 and len(collision) > 0):
             next_direction = states[-1].direction
 
             if self.direction_rule is not None:
@@ -209,6 +225,17 @@ class CollisionConditionRule(Rule):
             next_charge = states[-1].charge - 1 if states[-1].charge > 0 else states[-1].charge
             next_colors: Iterator[int | Sequence[int]]
 
+            collision_met = PointSet()
+            if self.update_agent_color_on_collision or self.border_color is not None:
+                for condition, condition_direction in self.conditions:
+                    direction = absolute_direction(states[-1].direction, condition_direction) \
+                        if condition_direction != "none" else states[-1].direction
+
+                    if condition and code & direction_bit(direction):
+                        collision_met.update(resolve_point_set_selectors_with_direction(
+                            states[-1].position, collision, direction
+                        ))
+
             if self.update_agent_color_on_collision:
                 next_colors = cycle([collision_mapping[col].color for col in collision_met])
 
@@ -311,7 +338,7 @@ class OutOfGridRule(Rule):
 
         next_position = states[-1].position.shift(direction_to_unit_vector(states[-1].direction))
 
-        if not all(in_grid(point, self.grid_size) for point in next_position):
+        if not point_set_in_grid(next_position, self.grid_size):
             if self.terminate_on_grid_leave:
                 return AgentState(
                     position=states[-1].position,
@@ -323,7 +350,7 @@ class OutOfGridRule(Rule):
                 alternative_direction = self.direction_rule(states[-1].direction)
                 alternative_position = states[-1].position.shift(direction_to_unit_vector(alternative_direction))
 
-                if all(in_grid(point, self.grid_size) for point in alternative_position):
+                if point_set_in_grid(alternative_position, self.grid_size):
                     return AgentState(
                         position=alternative_position,
                         direction=alternative_direction,
@@ -334,6 +361,63 @@ class OutOfGridRule(Rule):
         return None
 
 
+class StraightLine(NamedTuple):
+    """
+    A rule chain which moves an agent one cell in its direction per step, as long as the cell is free and the agent is
+    charged.
+
+    :param grid_size: The grid size of an `OutOfGridRule` at the root of the chain, which terminates the agent before it
+    leaves the grid, or None if the chain has no such rule.
+    """
+    grid_size: Optional[Point]
+
+
+def is_straight_line_rule(rule: Rule) -> bool:
+    """
+    Check whether a rule moves an agent one cell in its direction if that cell is free, and does nothing otherwise.
+
+    :param rule: The rule to check.
+    :return: True if the rule is a straight line rule.
+    """
+
+    return isinstance(rule, CollisionConditionRule) and \
+        rule.direction_rule in (None, identity_direction) and \
+        list(rule.conditions) == [(False, "none")] and \
+        rule.condition_mode == "AND" and \
+        rule.update_position and \
+        rule.border_color is None and \
+        rule.fill_color is None and \
+        not rule.update_agent_color_on_collision and \
+        not rule.entity_redirect and \
+        not rule.resize_entity_to_exit
+
+
+def straight_line_chain(node: Optional[RuleNode]) -> Optional[StraightLine]:
+    """
+    Detect rule chains which move an agent in a straight line: either a single straight line rule, or an `OutOfGridRule`
+    terminating the agent with a straight line rule as its alternative.
+
+    :param node: The root of the rule chain.
+    :return: The straight line, or None if the chain does anything else.
+    """
+
+    if node is None or node.next_node is not None:
+        return None
+
+    if isinstance(node.rule, OutOfGridRule):
+        alternative = node.alternative_node
+        if not node.rule.terminate_on_grid_leave or alternative is None or alternative.next_node is not None or \
+                alternative.alternative_node is not None or not is_straight_line_rule(alternative.rule):
+            return None
+
+        return StraightLine(grid_size=node.rule.grid_size)
+
+    if node.alternative_node is not None or not is_straight_line_rule(node.rule):
+        return None
+
+    return StraightLine(grid_size=None)
+
+
 class TrappedCollisionRule(Rule):
     """
     A rule that terminates the agent if it is trapped in a collision.
@@ -464,7 +548,7 @@ class GravityRule(Rule):
 
             if len(sub_collision) == 0:
                 next_position = states[-1].position.shift(direction_to_unit_vector(direction))
-                if all(in_grid(point, self.grid_size) for point in next_position):
+                if point_set_in_grid(next_position, self.grid_size):
                     return AgentState(
                         position=next_position,
                         direction=direction,
@@ -476,28 +560,44 @@ class GravityRule(Rule):
 
 
 class ProximityRule(Rule):
+    """
+    Moves the agent onto the neighbouring point which is closest to the target.
+    The Euclidean distance to the target is precomputed for all points as a distance field.
+    """
+
+    vectors: Sequence[Point] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
     def __init__(
             self,
             target: PointSet,
             points: PointSet
     ):
         self.target = target
-        distances = {
-            (point, target_point): math.dist(point, target_point)
-            for point in points for target_point in target
-        }
-        min_distance = min(distances.values())
-        max_distance = max(distances.values())
-        self.proximity_mapping = {
-            point: (
-                (min(distances[(point, target_point)] for target_point in target) - min_distance)
-                / (max_distance - min_distance) if max_distance > min_distance else 0.0
-            )
-            for point in points
-        }
+        self.points = points
+
+        coordinates = np.array(list(points | target))
+        self.origin: Point = (int(coordinates[:, 0].min()), int(coordinates[:, 1].min()))
+        shape = coordinates.max(axis=0) - self.origin + 1
+
+        target_indices = tuple((np.array(list(target)) - self.origin).T)
+        point_indices = tuple((np.array(list(points)) - self.origin).T)
+
+        target_mask = np.zeros(shape, dtype=bool)
+        target_mask[target_indices] = True
+        distances = squared_distance_field(target_mask)
 
-        for point in target:
-            self.proximity_mapping[point] = 0
+        # the squared distance orders points like their distance, -1 marks points the agent can not move to
+        self.proximity = np.full(shape, -1, dtype=np.int64)
+        self.proximity[point_indices] = distances[point_indices] - distances[point_indices].min()
+        self.proximity[target_indices] = 0
+
+        # points with the same proximity are tried in the iteration order of the candidates, ranked once for all calls
+        self.candidates = PointSet(chain(points, target))
+        self.ranks: dict[Point, int] = {point: rank for rank, point in enumerate(self.candidates)}
+
+    def _proximity(self, point: Point) -> tuple[int, int]:
+        x, y = point[0] - self.origin[0], point[1] - self.origin[1]
+        return int(self.proximity[x, y]), self.ranks[point]
 
     def __call__(
             self,
@@ -526,23 +626,21 @@ class ProximityRule(Rule):
                 charge=0,
             ), colors, []
 
-        possible_points = PointSet(self.proximity_mapping.keys()) - collision - current_position
-        eligible_points = [
-            point for point in possible_points
-            if any(math.dist(point, target_point) == 1 for target_point in current_position)
-        ]
-
-        if len(eligible_points) > 0:
-            sorted_eligible_points = sorted(
-                eligible_points,
-                key=lambda point: self.proximity_mapping[point]
+        # only the neighbours of the agent are considered, so a step does not depend on the number of candidates
+        eligible_points = {
+            neighbour for neighbour in (
+                shift(point, vector) for point in current_position for vector in self.vectors
             )
-            for min_point in sorted_eligible_points:
-                closest_point = min(current_position, key=lambda point: math.dist(point, min_point))
+            if neighbour in self.ranks and neighbour not in collision and neighbour not in current_position
+        }
 
-                relative_direction = relative_point_direction(
-                    closest_point, min_point
+        if len(eligible_points) > 0:
+            for min_point in sorted(eligible_points, key=self._proximity):
+                # the agent moves from its first point next to the eligible point
+                closest_point = next(
+                    point for point in current_position if math.dist(point, min_point) == 1
                 )
+                relative_direction = relative_point_direction(closest_point, min_point)
                 next_position = current_position.shift(direction_to_unit_vector(relative_direction))
 
                 if not any(
@@ -558,6 +656,91 @@ class ProximityRule(Rule):
         return None
 
 
+@lru_cache(maxsize=64)
+def reward_table(
+        grid_size: Point,
+        directions: tuple[Direction, ...],
+        target: tuple[Point, ...],
+        denylist: frozenset[Point],
+        gamma: float,
+        positive_reward: float,
+        negative_reward: float,
+) -> np.ndarray:
+    """
+    Computes the value of every point of a grid with a breadth-first search from the target points, in their order.
+    The value decays by gamma with every step away from the target, points on the denylist receive the negative reward.
+    A point receives its value from the point of the previous wavefront which reached it first.
+    Tables are cached, so agents with the same configuration share one read-only table.
+    :param grid_size: The size of the grid.
+    :param directions: The directions in which the search propagates.
+    :param target: The target points, which receive the positive reward.
+    :param denylist: The points which receive the negative reward.
+    :param gamma: The decay per step.
+    :param positive_reward: The reward of the target points.
+    :param negative_reward: The reward of the points on the denylist.
+    :return: The value table, points that are never reached have a value of 0.
+    """
+
+    if len(denylist) > 0:
+        # values differ within a wavefront, so the order in which points are reached matters
+        values = {point: positive_reward for point in target}
+        points = deque(target)
+
+        while len(points) > 0:
+            point = points.popleft()
+
+            for direction in directions:
+                next_point = shift(point, direction_to_unit_vector(direction))
+
+                if in_grid(next_point, grid_size) and next_point not in values:
+                    values[next_point] = negative_reward if next_point in denylist else values[point] * (1 - gamma)
+                    points.append(next_point)
+
+        table: np.ndarray = np.zeros(grid_size)
+        for point, value in values.items():
+            if in_grid(point, grid_size):
+                table[point] = value
+
+        table.setflags(write=False)
+        return table
+
+    # without a denylist all points of a wavefront have the same value, so the wavefront is propagated at once on a
+    # canvas covering the grid and all target points
+    target_points = np.array(target, dtype=int).reshape(-1, 2)
+    origin = np.minimum(target_points.min(axis=0, initial=0), 0)
+    shape = tuple(np.maximum(target_points.max(axis=0, initial=0) + 1, grid_size) - origin)
+    grid = (slice(-origin[0], -origin[0] + grid_size[0]), slice(-origin[1], -origin[1] + grid_size[1]))
+
+    inside = np.zeros(shape, dtype=bool)
+    inside[grid] = True
+
+    table = np.zeros(shape)
+    frontier = np.full(shape, -np.inf)
+    frontier[target_points[:, 0] - origin[0], target_points[:, 1] - origin[1]] = positive_reward
+    table[frontier > -np.inf] = positive_reward
+    visited = (frontier > -np.inf) | ~inside
+
+    while not visited.all():
+        wavefront = np.full(shape, -np.inf)
+        for direction in directions:
+            dx, dy = direction_to_unit_vector(direction)
+            target_slice = (slice(max(dx, 0), shape[0] + min(dx, 0)), slice(max(dy, 0), shape[1] + min(dy, 0)))
+            source_slice = (slice(max(-dx, 0), shape[0] - max(dx, 0)), slice(max(-dy, 0), shape[1] - max(dy, 0)))
+            np.maximum(wavefront[target_slice], frontier[source_slice], out=wavefront[target_slice])
+
+        reached = (wavefront > -np.inf) & ~visited
+        if not reached.any():
+            break
+
+        frontier = np.where(reached, wavefront * (1 - gamma), -np.inf)
+        table[reached] = frontier[reached]
+        visited |= reached
+
+    table = table[grid].copy()
+    table.setflags(write=False)
+    return table
+
+
 class RewardRule(Rule):
     """
     Implements a reward learning based rule using a Q-Learning table
@@ -575,33 +758,26 @@ class RewardRule(Rule):
     ):
         self.grid_size = grid_size
         self.directions = directions
-        self.q_table: dict[Point, float] = {
-            point: positive_reward for point in target
-        }
+        self.vectors = np.array([direction_to_unit_vector(direction) for direction in directions])
 
         if denylist is None:
             denylist = PointSet()
 
-        visited = PointSet(target)
-        points = deque(target)
-
-        while len(points) > 0:
-            point = points.popleft()
-
-            for direction in directions:
-                next_point = shift(point, direction_to_unit_vector(direction))
-
-                if in_grid(next_point, grid_size) and next_point not in visited:
-                    # mark as visited
-                    visited.add(next_point)
-                    # add as seed for further exploration
-                    points.append(next_point)
-
-                    # calculate the reward for the next point, if valid
-                    if next_point in denylist:
-                        self.q_table[next_point] = negative_reward
-                    else:
-                        self.q_table[next_point] = self.q_table[point] * (1 - gamma)
+        self.target = target
+        self.denylist = denylist
+        self.gamma = gamma
+        self.positive_reward = positive_reward
+        self.negative_reward = negative_reward
+
+        self.q_table = reward_table(
+            (int(grid_size[0]), int(grid_size[1])),
+            tuple(directions),
+            tuple(target),
+            frozenset(denylist),
+            gamma,
+            positive_reward,
+            negative_reward,
+        )
 
     def __call__(
             self,
@@ -621,21 +797,24 @@ class RewardRule(Rule):
         """
 
         current_position = states[-1].position
-        valid_positions: list[tuple[PointSet, Direction, float]] = []
 
-        for direction in self.directions:
-            next_position = current_position.shift(direction_to_unit_vector(direction))
+        # the positions for all directions at once, with the shape (directions, points, 2)
+        positions = np.array(list(current_position), dtype=int).reshape(1, -1, 2) + self.vectors[:, None, :]
+        inside = ((positions >= 0) & (positions < self.grid_size)).all(axis=(1, 2))
+
+        clipped = np.clip(positions, 0, np.array(self.grid_size) - 1)
+        rewards = np.where(inside, self.q_table[clipped[..., 0], clipped[..., 1]].sum(axis=1), -np.inf)
 
-            if all(in_grid(point, self.grid_size) for point in next_position) and len(next_position & collision) == 0:
-                reward = sum(self.q_table[point] for point in next_position)
-                valid_positions.append((next_position, direction, reward))
+        for index, direction in enumerate(self.directions):
+            if inside[index] and len(current_position.shift(direction_to_unit_vector(direction)) & collision) > 0:
+                rewards[index] = -np.inf
 
         # Select the position with the maximum Q-value
-        if len(valid_positions) > 0:
-            next_position, next_direction, _ = max(valid_positions, key=lambda x: x[2])
+        if np.isfinite(rewards).any():
+            index = int(np.argmax(rewards))
             return AgentState(
-                position=next_position,
-                direction=next_direction,
+                position=current_position.shift(direction_to_unit_vector(self.directions[index])),
+                direction=self.directions[index],
                 color=next(colors),
                 charge=states[-1].charge - 1 if states[-1].charge > 0 else states[-1].charge,
             ), colors, []
@@ -678,8 +857,7 @@ class AgentSpawnRule(Rule):
 
         for direction in self.directions:
             next_position = states[-1].position.shift(direction_to_unit_vector(direction))
-            if len(next_position & self.denylist) == 0 and all(
-                    in_grid(point, self.grid_size) for point in next_position):
+            if len(next_position & self.denylist) == 0 and point_set_in_grid(next_position, self.grid_size):
                 next_sub_collision = resolve_point_set_selectors_with_direction(
                     states[-1].position, collision, direction
                 ) if self.select_direction else collision
@@ -1,4 +1,4 @@
-from typing import cast
+from typing import cast, Sequence
 
 from arc_puzzle_generator.geometry import Point, PointSet, Direction
 from arc_puzzle_generator.physics import direction_to_unit_vector
@@ -30,6 +30,61 @@ def resolve_point_set_selectors_with_direction(
     return PointSet(set.union(*[direction_selector(point, neighbourhood, direction) for point in point_set]))
 
 
+OCCUPANCY_DIRECTIONS: Sequence[Direction] = (
+    "left", "top_left", "up", "top_right", "right", "bottom_right", "down", "bottom_left", "none"
+)
+"""
+The directions encoded in an occupancy code, the direction at index i is encoded in bit i.
+The last bit encodes direction none, i.e. whether the point set overlaps the neighbourhood.
+"""
+
+ALL_DIRECTIONS_MASK = (1 << len(OCCUPANCY_DIRECTIONS)) - 1
+
+
+def direction_bit(direction: Direction) -> int:
+    """
+    Returns the bit of a direction in an occupancy code.
+    :param direction: The direction.
+    :return: The bit of the direction.
+    """
+
+    return 1 << OCCUPANCY_DIRECTIONS.index(direction)
+
+
+def occupancy_code(point_set: PointSet, neighbourhood: PointSet, mask: int = ALL_DIRECTIONS_MASK) -> int:
+    """
+    Encodes in which directions the neighbourhood is occupied next to the point set.
+    A bit is set if `resolve_point_set_selectors_with_direction` would select any point for its direction.
+    :param point_set: The point set to encode for.
+    :param neighbourhood: The occupied points of the neighbourhood.
+    :param mask: The bits to compute, all other bits are zero.
+    :return: The occupancy code.
+    """
+
+    code = 0
+    if len(neighbourhood) == 0:
+        return code
+
+    vectors = [
+        (1 << index, direction_to_unit_vector(direction)) for index, direction in enumerate(OCCUPANCY_DIRECTIONS)
+        if mask & (1 << index)
+    ]
+
+    # iterate over the smaller of both sets
+    if len(neighbourhood) < len(point_set):
+        for x, y in neighbourhood:
+            for bit, (dx, dy) in vectors:
+                if (x - dx, y - dy) in point_set:
+                    code |= bit
+    else:
+        for x, y in point_set:
+            for bit, (dx, dy) in vectors:
+                if (x + dx, y + dy) in neighbourhood:
+                    code |= bit
+
+    return code
+
+
 def resolve_cell_selection(
         point_set: PointSet, direction: Direction,
 ):
@@ -41,10 +96,11 @@ def resolve_cell_selection(
     :return: A set of cells selected.
     """
 
-    min_row = min((x for x, y in point_set))
-    max_row = max((x for x, y in point_set))
-    min_col = min((y for x, y in point_set))
-    max_col = max((y for x, y in point_set))
+    bounds = point_set.bounds
+    if bounds is None:
+        raise ValueError("Cannot select cells from an empty point set.")
+
+    min_row, min_col, max_row, max_col = bounds
 
     match direction:
         case "up":
@@ -0,0 +1,314 @@
+"""
+The spec module describes playgrounds as plain data, which can be pickled, sent to worker processes or cached on disk.
+
+A `PlaygroundSpec` holds the initial grid, the agents, their rule graph, the neighbourhood, the topology and the options
+of a playground. Rules, neighbourhoods, topologies and their callable parameters are described by a `ComponentSpec`,
+a reference to a module-level function or class and, for instances, their constructor parameters. A puzzle is set up
+once and described with `describe_playground`, the spec compiles to an identical playground with `build_playground`.
+"""
+import importlib
+import inspect
+from typing import NamedTuple, Any, Optional, Mapping, Union, Iterator
+
+import numpy as np
+
+from arc_puzzle_generator.agent import Agent
+from arc_puzzle_generator.geometry import Point, PointSet, Direction
+from arc_puzzle_generator.playground import Playground
+from arc_puzzle_generator.rule import RuleNode
+from arc_puzzle_generator.utils.color_schedule import ColorSchedule
+from arc_puzzle_generator.utils.color_stream import ColorStream, Color
+
+
+class ComponentSpec(NamedTuple):
+    """
+    A function, class or instance, e.g. a rule, neighbourhood or topology.
+
+    :param reference: The module and qualified name of the function or class, e.g.
+    `arc_puzzle_generator.direction:identity_direction`.
+    :param params: The constructor parameters of an instance, None if the reference itself is the component.
+    Parameters may be component specs themselves.
+    """
+    reference: str
+    params: Optional[Mapping[str, Any]] = None
+
+
+class ColorSpec(NamedTuple):
+    """
+    A stream of colors, which first yields `colors` and then repeats `repeat` forever.
+
+    :param colors: The colors yielded once.
+    :param repeat: The colors which are repeated, the stream ends after `colors` if empty.
+    """
+    colors: list[Color]
+    repeat: list[Color]
+
+
+class NodeSpec(NamedTuple):
+    """
+    A node of a rule graph.
+
+    :param rule: The rule of the node.
+    :param next_node: The index of the next node, if any.
+    :param alternative_node: The index of the alternative node, if any.
+    """
+    rule: ComponentSpec
+    next_node: Optional[int]
+    alternative_node: Optional[int]
+
+
+class AgentSpec(NamedTuple):
+    """
+    An agent.
+
+    :param position: The sorted points of the agent.
+    :param direction: The direction of the agent.
+    :param label: The label of the agent.
+    :param color: The current color of the agent.
+    :param colors: The colors the agent uses after its current color.
+    :param node: The index of the root node of the rules of the agent, if any.
+    :param charge: The charge of the agent.
+    """
+    position: list[Point]
+    direction: Direction
+    label: str
+    color: Color
+    colors: Union[ComponentSpec, ColorSpec]
+    node: Optional[int]
+    charge: int
+
+
+class PlaygroundSpec(NamedTuple):
+    """
+    A playground before its first step.
+
+    :param grid: The initial grid, before the agents are drawn.
+    :param agents: The agents, in the order they are added to the playground.
+    :param nodes: The nodes of the rule graph shared by all agents.
+    :param neighbourhood: The neighbourhood.
+    :param topology: The topology.
+    :param options: The remaining constructor parameters of the playground, e.g. the execution mode.
+    """
+    grid: np.ndarray
+    agents: list[AgentSpec]
+    nodes: list[NodeSpec]
+    neighbourhood: ComponentSpec
+    topology: ComponentSpec
+    options: Mapping[str, Any]
+
+
+def _reference(target: Any) -> str:
+    qualname = getattr(target, "__qualname__", "")
+    if "<" in qualname or not hasattr(target, "__module__"):
+        raise ValueError(f"{target!r} is not defined at module level and can not be referenced.")
+
+    return f"{target.__module__}:{qualname}"
+
+
+def _resolve(reference: str) -> Any:
+    module_name, qualname = reference.split(":")
+    target: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        target = getattr(target, name)
+
+    return target
+
+
+def describe_component(component: Any) -> ComponentSpec:
+    """
+    Describe a module-level function or class, or an instance which stores its constructor parameters as attributes
+    of the same name.
+    :param component: The component.
+    :return: The component spec.
+    """
+    if inspect.isfunction(component) or inspect.isclass(component) or inspect.isbuiltin(component):
+        return ComponentSpec(reference=_reference(component))
+
+    params: dict[str, Any] = {}
+    for name, parameter in inspect.signature(type(component).__init__).parameters.items():
+        if name == "self" or parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            continue
+
+        if not hasattr(component, name):
+            raise ValueError(f"{type(component).__name__} does not store its parameter '{name}'.")
+
+        params[name] = _describe_value(getattr(component, name))
+
+    return ComponentSpec(reference=_reference(type(component)), params=params)
+
+
+def _describe_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str, np.generic, np.ndarray, PointSet)):
+        return value
+
+    if isinstance(value, (list, tuple)):
+        return type(value)(_describe_value(item) for item in value)
+
+    if isinstance(value, (set, frozenset)):
+        return type(value)(_describe_value(item) for item in value)
+
+    if isinstance(value, dict):
+        return {key: _describe_value(item) for key, item in value.items()}
+
+    return describe_component(value)
+
+
+def build_component(spec: ComponentSpec) -> Any:
+    """
+    Build a component from its spec.
+    :param spec: The component spec.
+    :return: The component.
+    """
+    target = _resolve(spec.reference)
+    if spec.params is None:
+        return target
+
+    return target(**{name: _build_value(value) for name, value in spec.params.items()})
+
+
+def _build_value(value: Any) -> Any:
+    if isinstance(value, ComponentSpec):
+        return build_component(value)
+
+    if isinstance(value, (list, tuple)):
+        return type(value)(_build_value(item) for item in value)
+
+    if isinstance(value, dict):
+        return {key: _build_value(item) for key, item in value.items()}
+
+    return value
+
+
+def describe_colors(colors: Iterator[Color]) -> Union[ComponentSpec, ColorSpec]:
+    """
+    Describe the remaining colors of an agent, supported are color schedules and color streams.
+    :param colors: The colors.
+    :return: The colors spec.
+    """
+    if isinstance(colors, ColorSchedule):
+        return ComponentSpec(reference=_reference(ColorSchedule), params={
+            "color_sequence": list(colors.color_sequence),
+            "background_color": colors.background_color,
+            "offset": colors.offset,
+        })
+
+    if isinstance(colors, ColorStream):
+        remaining, repeat = colors.remaining()
+        return ColorSpec(colors=remaining, repeat=repeat)
+
+    raise ValueError(f"The colors {colors!r} can not be described, use a ColorSchedule or a ColorStream.")
+
+
+def build_colors(spec: Union[ComponentSpec, ColorSpec]) -> Iterator[Color]:
+    """
+    Build the colors of an agent from their spec.
+    :param spec: The colors spec.
+    :return: The colors.
+    """
+    if isinstance(spec, ComponentSpec):
+        return build_component(spec)
+
+    return ColorStream(spec.colors, spec.repeat)
+
+
+def describe_playground(playground: Playground) -> PlaygroundSpec:
+    """
+    Describe a playground before its first step.
+    :param playground: The playground.
+    :return: The playground spec.
+    """
+    if playground.step_idx > 0 or any(len(agent.history) > 1 for agent in playground.agents):
+        raise ValueError("Only playgrounds which have not been advanced can be described.")
+
+    nodes: list[NodeSpec] = []
+    node_indices: dict[RuleNode, int] = {}
+
+    def describe_node(node: Optional[RuleNode]) -> Optional[int]:
+        if node is None:
+            return None
+
+        if node not in node_indices:
+            node_indices[node] = len(nodes)
+            nodes.append(NodeSpec(rule=describe_component(node.rule), next_node=None, alternative_node=None))
+            nodes[node_indices[node]] = nodes[node_indices[node]]._replace(
+                next_node=describe_node(node.next_node),
+                alternative_node=describe_node(node.alternative_node),
+            )
+
+        return node_indices[node]
+
+    agents = [
+        AgentSpec(
+            position=sorted(agent.position),
+            direction=agent.direction,
+            label=agent.label,
+            color=agent.color,
+            colors=describe_colors(agent.colors),
+            node=describe_node(agent.node),
+            charge=agent.charge,
+        )
+        for agent in playground.agents
+    ]
+
+    return PlaygroundSpec(
+        grid=playground.steps[0].copy(),
+        agents=agents,
+        nodes=nodes,
+        neighbourhood=describe_component(playground.neighbourhood),
+        topology=describe_component(playground.topology),
+        options={
+            "execution_mode": playground.execution_mode,
+            "collision_mode": playground.collision_mode,
+            "backfill_color": playground.backfill_color,
+            "max_steps": playground.max_steps,
+            "fast_forward": playground.fast_forward,
+        },
+    )
+
+
+def build_playground(spec: PlaygroundSpec, **kwargs: Any) -> Playground:
+    """
+    Compile a playground spec to a playground.
+    :param spec: The playground spec.
+    :param kwargs: Further constructor parameters of the playground, e.g. observers, overriding the options of the spec.
+    :return: The playground.
+    """
+    nodes = [RuleNode(build_component(node.rule)) for node in spec.nodes]
+    for node, node_spec in zip(nodes, spec.nodes):
+        node.next_node = nodes[node_spec.next_node] if node_spec.next_node is not None else None
+        node.alternative_node = nodes[node_spec.alternative_node] if node_spec.alternative_node is not None else None
+
+    agents: list[Agent] = []
+    for agent_spec in spec.agents:
+        # the agent takes its current color from its colors, the remaining colors are set afterwards
+        agent = Agent(
+            position=PointSet(agent_spec.position),
+            direction=agent_spec.direction,
+            label=agent_spec.label,
+            colors=ColorStream([agent_spec.color]),
+            node=nodes[agent_spec.node] if agent_spec.node is not None else None,
+            charge=agent_spec.charge,
+        )
+        agent.colors = build_colors(agent_spec.colors)
+        agents.append(agent)
+
+    return Playground(
+        spec.grid.copy(),
+        agents,
+        neighbourhood=build_component(spec.neighbourhood),
+        topology=build_component(spec.topology),
+        **{**spec.options, **kwargs},
+    )
+
+
+def simulate(spec: PlaygroundSpec) -> np.ndarray:
+    """
+    Run a playground spec to completion, e.g. in the worker processes of a pool.
+    :param spec: The playground spec.
+    :return: The final grid.
+    """
+    output_grid = spec.grid
+    for output_grid in build_playground(spec):
+        pass
+
+    return output_grid
@@ -1,5 +1,7 @@
 from typing import NamedTuple, Iterator, Mapping, Sequence, Union
 
+import numpy as np
+
 from arc_puzzle_generator.geometry import PointSet, Point, Direction
 
 ColorIterator = Iterator[Union[int, Sequence[int]]]
@@ -24,3 +26,19 @@ AgentStateMapping = Mapping[Point, AgentState]
 """
 Maps a point to a tuple containing the agent's state at the current step.
 """
+
+GridWrite = tuple[np.ndarray, Union[int, Sequence[int]]]
+"""
+Cells of the grid, as an array of points, and the color written to them.
+"""
+
+
+class AgentStep(NamedTuple):
+    """
+    A step of an agent which changed the grid.
+
+    :param state: The state of the agent after the step.
+    :param writes: The grid writes of the step, the sorted position of the agent followed by the backfilled cells, if any.
+    """
+    state: AgentState
+    writes: list[GridWrite]
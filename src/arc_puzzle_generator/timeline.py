@@ -0,0 +1,98 @@
+"""
+The timeline module exports where the steps of a simulation spend their time as Chrome trace events, which can be
+opened in Perfetto (https://ui.perfetto.dev) or `chrome://tracing`.
+
+Every agent gets its own track, with a span for every step of the agent and nested spans for the rules it evaluated.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from arc_puzzle_generator.agent import Agent
+from arc_puzzle_generator.observer import Observer
+from arc_puzzle_generator.rule import RuleNode
+
+
+class TimelineObserver(Observer):
+    """
+    Records a span for every step of an agent, i.e. every `Playground._process_agent` call, and nested spans for the
+    collision resolution and every evaluated rule, annotated with the class of the rule and whether it fired. A rule
+    span starts where the previous span of the step ended, so the spans of a step are contiguous.
+    """
+
+    def __init__(self, name: str = "playground"):
+        """
+        Initialize a timeline observer.
+        :param name: The name of the process in the trace.
+        """
+        self.name = name
+        self.origin = time.perf_counter_ns()
+        self.events: list[dict[str, Any]] = []
+        self.step_start: dict[int, float] = {}
+        self.rule_start: dict[int, float] = {}
+        self.lock = threading.Lock()
+
+    def _now(self) -> float:
+        return (time.perf_counter_ns() - self.origin) / 1000
+
+    def _span(self, agent_id: int, name: str, start: float, end: float, args: dict[str, Any]) -> None:
+        with self.lock:
+            self.events.append({
+                "name": name, "ph": "X", "ts": start, "dur": end - start, "pid": 0, "tid": agent_id, "args": args,
+            })
+
+    def agent_added(self, agent_id: int, agent: Agent) -> None:
+        with self.lock:
+            self.events.append({
+                "name": "thread_name", "ph": "M", "pid": 0, "tid": agent_id,
+                "args": {"name": f"{agent.label} {agent_id}"},
+            })
+            self.events.append({"name": "thread_sort_index", "ph": "M", "pid": 0, "tid": agent_id,
+                                "args": {"sort_index": agent_id}})
+
+    def agent_started(self, agent_id: int) -> None:
+        now = self._now()
+        self.step_start[agent_id] = now
+        self.rule_start[agent_id] = now
+
+    def collisions_resolved(self, agent_id: int) -> None:
+        now = self._now()
+        self._span(agent_id, "collisions", self.rule_start[agent_id], now, {})
+        self.rule_start[agent_id] = now
+
+    def rule_evaluated(self, agent_id: int, node: RuleNode, fired: bool) -> None:
+        now = self._now()
+        rule = type(node.rule).__name__
+        self._span(agent_id, rule, self.rule_start[agent_id], now, {"rule": rule, "fired": fired})
+        self.rule_start[agent_id] = now
+
+    def agent_finished(self, agent_id: int) -> None:
+        start = self.step_start.pop(agent_id)
+        self.rule_start.pop(agent_id)
+        self._span(agent_id, "step", start, self._now(), {})
+
+    def agent_terminated(self, agent_id: int, agent: Agent) -> None:
+        with self.lock:
+            self.events.append({
+                "name": "terminated", "ph": "i", "s": "t", "ts": self._now(), "pid": 0, "tid": agent_id,
+            })
+
+    def trace(self) -> dict[str, Any]:
+        """
+        The recorded timeline in the Chrome trace event format.
+        :return: A JSON serialisable trace.
+        """
+        metadata = {"name": "process_name", "ph": "M", "pid": 0, "args": {"name": self.name}}
+        with self.lock:
+            return {"traceEvents": [metadata, *self.events], "displayTimeUnit": "ms"}
+
+    def save(self, path: Path, indent: Optional[int] = None) -> None:
+        """
+        Write the recorded timeline as a Chrome trace event JSON file.
+        :param path: The path of the file.
+        :param indent: The indentation of the JSON file.
+        """
+        with path.open("w") as file:
+            json.dump(self.trace(), file, indent=indent)
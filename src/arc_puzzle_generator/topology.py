@@ -7,6 +7,8 @@ class Topology(Protocol):
     """
     A topology is a callable that takes a label and a set of labels and returns a set of labels.
     It defines the relationships between agents in a system, such as which agents are connected or related to each other.
+    Topologies whose result does not depend on the set of labels may declare themselves static with a `static`
+    attribute, which allows caching their result for the lifetime of a playground.
     """
 
     def __call__(self, label: str, labels: LabelSet) -> LabelSet:
@@ -41,8 +43,26 @@ class FixedGroupTopology(Topology):
     This is useful for defining a specific group of agents that are always considered together.
     """
 
+    static = True
+
     def __init__(self, group: LabelSet):
         self.group = group
 
     def __call__(self, label: str, labels: LabelSet) -> LabelSet:
         return self.group
+
+
+STATIC_TOPOLOGIES = {identity_topology}
+"""
+The topology functions which are static.
+"""
+
+
+def is_static_topology(topology: Topology) -> bool:
+    """
+    Whether the result of a topology only depends on the label, and not on the set of labels.
+
+    :param topology: The topology.
+    :return: True if the topology is static.
+    """
+    return getattr(topology, "static", False) or topology in STATIC_TOPOLOGIES
@@ -0,0 +1,351 @@
+"""
+The trace module records the trajectory of a playground as a compact trace and replays it without the puzzle code.
+
+A trace consists of the initial grid and one transition per agent step which changed the grid, stored column-wise:
+the frame in which the step became visible, the agent, the translation of its position since its previous transition,
+its direction, color and charge. Positions which are not a translation of the previous position, colors which are
+sequences and backfilled cells which are not the vacated cells are stored in side tables.
+"""
+from pathlib import Path
+from typing import NamedTuple, Iterator, Optional, Sequence, Union, Any, get_args
+
+import numpy as np
+
+from arc_puzzle_generator.geometry import PointSet, Direction, translation
+from arc_puzzle_generator.state import AgentState, AgentStep, GridWrite
+
+DIRECTIONS: Sequence[Direction] = get_args(Direction)
+"""
+The directions in the order of their codes in a trace.
+"""
+
+EXPLICIT_POSITION = 1
+"""
+The position of the transition is stored in the position table instead of as a translation.
+"""
+
+EXPLICIT_COLOR = 2
+"""
+The color of the transition is a color sequence, which is stored in the color table.
+"""
+
+BACKFILL = 4
+"""
+The cells vacated by the transition are filled with the backfill color.
+"""
+
+EXPLICIT_BACKFILL = 8
+"""
+The cells filled with the backfill color are stored in the backfill table, because they are not the vacated cells.
+"""
+
+_DELTA_LIMIT = np.iinfo(np.int16).max
+
+
+class Trace(NamedTuple):
+    """
+    A recorded trajectory.
+
+    :param initial_grid: The grid before any agent was drawn.
+    :param backfill_color: The backfill color of the playground, -1 if there is none.
+    :param num_frames: The number of frames after the initial grid.
+    :param frame: The frame of every transition, frames are counted from 1.
+    :param agent: The agent of every transition, in the order the agents were added to the playground.
+    :param dx: The row translation of every transition.
+    :param dy: The column translation of every transition.
+    :param direction: The direction code of every transition, see `DIRECTIONS`.
+    :param color: The color of every transition, -1 for color sequences.
+    :param charge: The charge of every transition.
+    :param flags: The flags of every transition.
+    :param positions: The explicit positions, concatenated as (row, column) points in sorted order.
+    :param position_lengths: The number of points of every explicit position.
+    :param colors: The color sequences, concatenated.
+    :param color_lengths: The length of every color sequence.
+    :param backfill: The explicit backfilled cells, concatenated as (row, column) points.
+    :param backfill_lengths: The number of points of every explicit backfill.
+    """
+    initial_grid: np.ndarray
+    backfill_color: int
+    num_frames: int
+    frame: np.ndarray
+    agent: np.ndarray
+    dx: np.ndarray
+    dy: np.ndarray
+    direction: np.ndarray
+    color: np.ndarray
+    charge: np.ndarray
+    flags: np.ndarray
+    positions: np.ndarray
+    position_lengths: np.ndarray
+    colors: np.ndarray
+    color_lengths: np.ndarray
+    backfill: np.ndarray
+    backfill_lengths: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The size of the trace in memory, in bytes.
+        """
+        return sum(value.nbytes for value in self if isinstance(value, np.ndarray))
+
+
+class Transition(NamedTuple):
+    """
+    A decoded transition of a trace.
+
+    :param frame: The frame in which the step became visible.
+    :param agent: The agent of the step.
+    :param step: The step, with the same state and grid writes as in the playground.
+    """
+    frame: int
+    agent: int
+    step: AgentStep
+
+
+class TraceRecorder:
+    """
+    Records the steps of the agents of a playground, see the `recorder` parameter of `Playground`.
+    A recorder records the trajectory of a single playground.
+    """
+
+    def __init__(self) -> None:
+        self.initial_grid: Optional[np.ndarray] = None
+        self.backfill_color = -1
+        self.num_frames = 0
+        self.positions: dict[int, PointSet] = {}
+        self.columns: list[tuple[int, int, int, int, int, int, int, int]] = []
+        self.explicit_positions: list[np.ndarray] = []
+        self.color_sequences: list[Sequence[int]] = []
+        self.explicit_backfill: list[np.ndarray] = []
+
+    def start(self, grid: np.ndarray, backfill_color: Optional[int]) -> None:
+        """
+        Start recording a trajectory.
+        :param grid: The initial grid.
+        :param backfill_color: The backfill color of the playground.
+        """
+        if self.initial_grid is not None:
+            raise ValueError("The recorder has already recorded a trajectory.")
+
+        self.initial_grid = grid.copy()
+        self.backfill_color = -1 if backfill_color is None else backfill_color
+
+    def record(self, agent_id: int, step: AgentStep) -> None:
+        """
+        Record a step of an agent, which is visible in the next frame.
+        :param agent_id: The index of the agent in the playground.
+        :param step: The step.
+        """
+        state = step.state
+        flags = 0
+        previous = self.positions.get(agent_id)
+        vector = translation(previous, state.position) if previous is not None else None
+
+        if vector is None or max(abs(vector[0]), abs(vector[1])) > _DELTA_LIMIT:
+            flags |= EXPLICIT_POSITION
+            vector = (0, 0)
+            self.explicit_positions.append(step.writes[0][0])
+
+        color = step.writes[0][1]
+        if not isinstance(color, (int, np.integer)):
+            flags |= EXPLICIT_COLOR
+            self.color_sequences.append(color)
+            color = -1
+
+        if len(step.writes) > 1:
+            flags |= BACKFILL
+            cells = step.writes[1][0]
+
+            if previous is None or set(map(tuple, cells.tolist())) != previous - state.position:
+                flags |= EXPLICIT_BACKFILL
+                self.explicit_backfill.append(cells)
+
+        self.positions[agent_id] = state.position
+        self.columns.append((
+            self.num_frames + 1, agent_id, vector[0], vector[1], DIRECTIONS.index(state.direction), int(color),
+            state.charge, flags
+        ))
+
+    def frame(self) -> None:
+        """
+        Mark the end of a frame.
+        """
+        self.num_frames += 1
+
+    def trace(self) -> Trace:
+        """
+        Build the trace of the recorded trajectory.
+        :return: The trace.
+        """
+        if self.initial_grid is None:
+            raise ValueError("The recorder has not recorded a trajectory.")
+
+        columns = np.array(self.columns, dtype=np.int64).reshape(-1, 8).T
+
+        return Trace(
+            initial_grid=self.initial_grid,
+            backfill_color=self.backfill_color,
+            num_frames=self.num_frames,
+            frame=columns[0].astype(np.uint32),
+            agent=columns[1].astype(np.uint32),
+            dx=columns[2].astype(np.int16),
+            dy=columns[3].astype(np.int16),
+            direction=columns[4].astype(np.uint8),
+            color=columns[5].astype(np.int16),
+            charge=columns[6].astype(np.int32),
+            flags=columns[7].astype(np.uint8),
+            positions=_concatenate_points(self.explicit_positions),
+            position_lengths=np.array([len(points) for points in self.explicit_positions], dtype=np.uint32),
+            colors=np.array([color for colors in self.color_sequences for color in colors], dtype=np.int16),
+            color_lengths=np.array([len(colors) for colors in self.color_sequences], dtype=np.uint32),
+            backfill=_concatenate_points(self.explicit_backfill),
+            backfill_lengths=np.array([len(points) for points in self.explicit_backfill], dtype=np.uint32),
+        )
+
+
+def _concatenate_points(points: list[np.ndarray]) -> np.ndarray:
+    if len(points) == 0:
+        return np.empty((0, 2), dtype=np.int32)
+
+    return np.concatenate(points).astype(np.int32)
+
+
+def transitions(trace: Trace) -> Iterator[Transition]:
+    """
+    Decode the transitions of a trace.
+    :param trace: The trace.
+    :return: An iterator over the transitions, in the order they were recorded.
+    """
+    positions: dict[int, PointSet] = {}
+    arrays: dict[int, np.ndarray] = {}
+    position_offsets = np.concatenate(([0], np.cumsum(trace.position_lengths, dtype=np.int64)))
+    color_offsets = np.concatenate(([0], np.cumsum(trace.color_lengths, dtype=np.int64)))
+    backfill_offsets = np.concatenate(([0], np.cumsum(trace.backfill_lengths, dtype=np.int64)))
+    position_idx = color_idx = backfill_idx = 0
+
+    for index in range(len(trace.frame)):
+        agent, flags = int(trace.agent[index]), int(trace.flags[index])
+        previous = positions.get(agent)
+
+        if flags & EXPLICIT_POSITION:
+            array = trace.positions[position_offsets[position_idx]:position_offsets[position_idx + 1]]
+            position = PointSet(map(tuple, array.tolist()))
+            position_idx += 1
+        else:
+            assert previous is not None
+            vector = (int(trace.dx[index]), int(trace.dy[index]))
+            position = previous.shift(vector)
+            array = arrays[agent] + np.array(vector)
+
+        color: Union[int, Sequence[int]] = int(trace.color[index])
+        if flags & EXPLICIT_COLOR:
+            color = trace.colors[color_offsets[color_idx]:color_offsets[color_idx + 1]].tolist()
+            color_idx += 1
+
+        writes: list[GridWrite] = [(array, color)]
+        if flags & EXPLICIT_BACKFILL:
+            writes.append((trace.backfill[backfill_offsets[backfill_idx]:backfill_offsets[backfill_idx + 1]],
+                           trace.backfill_color))
+            backfill_idx += 1
+        elif flags & BACKFILL:
+            assert previous is not None
+            writes.append((np.array(list(previous - position)), trace.backfill_color))
+
+        positions[agent], arrays[agent] = position, array
+        state = AgentState(
+            position=position,
+            direction=DIRECTIONS[trace.direction[index]],
+            color=color,
+            charge=int(trace.charge[index]),
+        )
+
+        yield Transition(frame=int(trace.frame[index]), agent=agent, step=AgentStep(state=state, writes=writes))
+
+
+class TraceReplay(Iterator[np.ndarray]):
+    """
+    Rebuilds the grids of a trajectory from its trace. Iterating over a replay yields the same grids as iterating
+    over the recorded playground, and `grid_at` rebuilds the grid of any frame.
+    """
+
+    def __init__(self, trace: Trace):
+        """
+        Initialize a replay at the initial grid.
+        :param trace: The trace to replay.
+        """
+        self.trace = trace
+        self._rewind()
+        self.next_frame = 0
+
+    def _rewind(self) -> None:
+        self.grid = self.trace.initial_grid.copy()
+        self.frame_idx = 0
+        self.transitions = transitions(self.trace)
+        self.pending: Optional[Transition] = None
+
+    def __len__(self) -> int:
+        return self.trace.num_frames + 1
+
+    def grid_at(self, frame: int) -> np.ndarray:
+        """
+        Rebuild the grid of a frame, replaying forward from the current frame or from the start if it is earlier.
+        :param frame: The frame, 0 is the initial grid.
+        :return: A copy of the grid.
+        """
+        if not 0 <= frame < len(self):
+            raise ValueError(f"The trace has no frame {frame}.")
+
+        if frame < self.frame_idx:
+            self._rewind()
+
+        while self.frame_idx < frame:
+            self.frame_idx += 1
+            self._apply(self.frame_idx)
+
+        return self.grid.copy()
+
+    def _apply(self, frame: int) -> None:
+        if self.pending is None:
+            self.pending = next(self.transitions, None)
+
+        while self.pending is not None and self.pending.frame <= frame:
+            for position, color in self.pending.step.writes:
+                self.grid[position[:, 0], position[:, 1]] = color
+
+            self.pending = next(self.transitions, None)
+
+    def __next__(self) -> np.ndarray:
+        if self.next_frame >= len(self):
+            raise StopIteration
+
+        self.next_frame += 1
+        return self.grid_at(self.next_frame - 1)
+
+    def __iter__(self) -> 'TraceReplay':
+        self.next_frame = 0
+        return self
+
+
+def save_trace(trace: Trace, path: Path) -> None:
+    """
+    Save a trace as a compressed numpy archive.
+    :param trace: The trace.
+    :param path: The path of the archive.
+    """
+    with path.open("wb") as file:
+        np.savez_compressed(file, **trace._asdict())
+
+
+def load_trace(path: Path) -> Trace:
+    """
+    Load a trace saved by `save_trace`.
+    :param path: The path of the archive.
+    :return: The trace.
+    """
+    with np.load(path) as archive:
+        fields: dict[str, Any] = {
+            field: archive[field] if archive[field].ndim > 0 else int(archive[field]) for field in Trace._fields
+        }
+
+    return Trace(**fields)
@@ -0,0 +1,128 @@
+from functools import lru_cache
+from math import lcm
+from typing import Iterable, Iterator, Sequence, Optional, Any
+
+import numpy as np
+
+MAX_PERIOD = 2 ** 16
+"""
+The maximum period of a color schedule which is computed as a table, longer schedules scan the color sequence instead.
+"""
+
+
+@lru_cache(maxsize=64)
+def color_table(color_sequence: tuple[tuple[int, int], ...], background_color: int) -> np.ndarray:
+    """
+    Computes one period of a color schedule, the least common multiple of the frequencies.
+    Tables are cached, so schedules with the same colors and frequencies share one read-only table.
+    :param color_sequence: A sequence of colors and their frequencies.
+    :param background_color: The background color to fill instead.
+    :return: The colors of one period, indexed by offset.
+    """
+
+    period = lcm(*(count for _, count in color_sequence))
+    colors = np.full(period, background_color, dtype=int)
+    offsets = np.arange(period)
+    # earlier colors take precedence, so they are written last
+    for color, count in reversed(color_sequence):
+        colors[offsets % count == 0] = color
+
+    colors.flags.writeable = False
+    return colors
+
+
+class ColorSchedule(Iterator[int], Iterable[int]):
+    """
+    Hands out a periodic sequence of colors: at every offset, the first color whose frequency divides the offset,
+    or the background color if there is none.
+    One period of the schedule, the least common multiple of the frequencies, is computed as a table on first use and
+    shared by all schedules with the same colors, so the color at any offset is looked up in constant time. Periods
+    beyond `MAX_PERIOD` are not computed, instead the color sequence is scanned for every color. Schedules can be copied
+    and pickled, copies advance independently.
+    """
+
+    def __init__(
+            self,
+            color_sequence: Sequence[tuple[int, int]],
+            background_color: int = 0,
+            offset: int = 0,
+    ) -> None:
+        """
+        Constructs a color schedule.
+        :param color_sequence: A sequence of colors and their frequencies.
+        :param background_color: The background color to fill instead.
+        :param offset: The offset of the next color.
+        """
+        self.color_sequence = list(color_sequence)
+        self.background_color = background_color
+        self.offset = offset
+
+        self._period = lcm(*(count for _, count in self.color_sequence))
+        self._colors: Optional[np.ndarray] = None
+
+    @property
+    def period(self) -> int:
+        return self._period
+
+    @property
+    def colors(self) -> Optional[np.ndarray]:
+        """
+        One period of the schedule, None if the period exceeds `MAX_PERIOD`.
+        """
+        if self._colors is None and self._period <= MAX_PERIOD:
+            self._colors = color_table(
+                tuple((color, count) for color, count in self.color_sequence), self.background_color,
+            )
+
+        return self._colors
+
+    def _scan(self, offset: int) -> int:
+        for color, count in self.color_sequence:
+            if offset % count == 0:
+                return color
+
+        return self.background_color
+
+    def color_at(self, offset: int) -> int:
+        """
+        The color at an offset of the schedule.
+        :param offset: The offset, 0 is the first color of the schedule.
+        :return: The color.
+        """
+        colors = self.colors
+        if colors is None:
+            return self._scan(offset % self._period)
+
+        return colors.item(offset % self._period)
+
+    def take(self, k: int) -> list[int]:
+        """
+        Hand out the next colors at once.
+        :param k: The number of colors.
+        :return: The next k colors.
+        """
+        colors = self.colors
+        if colors is None:
+            taken = [self._scan(offset % self._period) for offset in range(self.offset, self.offset + k)]
+        else:
+            taken = colors[(self.offset + np.arange(k)) % self._period].tolist()
+
+        self.offset += k
+        return taken
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the table is shared, it is looked up again instead of being copied
+        return {**self.__dict__, "_colors": None}
+
+    def __iter__(self) -> 'ColorSchedule':
+        return self
+
+    def __next__(self) -> int:
+        colors = self._colors if self._colors is not None else self.colors
+        if colors is None:
+            color = self._scan(self.offset % self._period)
+        else:
+            color = colors.item(self.offset % self._period)
+
+        self.offset += 1
+        return color
@@ -0,0 +1,52 @@
+from typing import Iterable, Iterator, Sequence, Union
+
+Color = Union[int, Sequence[int]]
+
+
+class ColorStream(Iterator[Color], Iterable[Color]):
+    """
+    Hands out a stream of colors: first the colors, once, and then the repeated colors forever.
+    The stream ends after the colors if there are no repeated colors. In contrast to iterators over lists and cycles,
+    the position of a stream is an attribute, so streams can be described, copied and pickled.
+    """
+
+    def __init__(
+            self,
+            colors: Sequence[Color] = (),
+            repeat: Sequence[Color] = (),
+            offset: int = 0,
+    ) -> None:
+        """
+        Constructs a color stream.
+        :param colors: The colors handed out once.
+        :param repeat: The colors repeated after the colors.
+        :param offset: The offset of the next color.
+        """
+        self.colors = list(colors)
+        self.repeat = list(repeat)
+        self.offset = offset
+
+    def remaining(self) -> tuple[list[Color], list[Color]]:
+        """
+        The colors which are handed out from the current offset on.
+        :return: The colors handed out once and the colors repeated after them, starting at the current offset.
+        """
+        if self.offset < len(self.colors) or len(self.repeat) == 0:
+            return self.colors[self.offset:], list(self.repeat)
+
+        shift = (self.offset - len(self.colors)) % len(self.repeat)
+        return [], self.repeat[shift:] + self.repeat[:shift]
+
+    def __iter__(self) -> 'ColorStream':
+        return self
+
+    def __next__(self) -> Color:
+        if self.offset < len(self.colors):
+            color = self.colors[self.offset]
+        elif len(self.repeat) > 0:
+            color = self.repeat[(self.offset - len(self.colors)) % len(self.repeat)]
+        else:
+            raise StopIteration
+
+        self.offset += 1
+        return color
@@ -0,0 +1,172 @@
+"""
+The frame_buffer module contains a lazily filled, memory-bounded store for the grids produced by a playground.
+"""
+import threading
+from collections import OrderedDict
+from typing import Iterator, Optional
+
+import numpy as np
+
+Delta = tuple[np.ndarray, np.ndarray]
+"""
+A delta between two consecutive frames, stored as flat indices and the new values at these indices.
+"""
+
+
+class FrameBuffer:
+    """
+    Pulls frames from an iterator on a background thread and stores them as keyframes and deltas.
+    Every `keyframe_interval` frames a full copy of the grid is kept, all other frames are stored as a delta to their
+    predecessor. Reconstructed frames are kept in a bounded LRU cache, so seeking back and forth stays cheap while the
+    memory footprint is proportional to the number of changed cells rather than the number of frames.
+    """
+
+    def __init__(
+            self,
+            frames: Iterator[np.ndarray],
+            keyframe_interval: int = 32,
+            cache_size: int = 64,
+            lookahead: int = 256,
+    ) -> None:
+        """
+        Create a frame buffer and start pulling frames in the background.
+        :param frames: The iterator producing the frames, e.g. a `Playground`.
+        :param keyframe_interval: The number of frames between two full copies of the grid.
+        :param cache_size: The maximum number of reconstructed frames kept in memory.
+        :param lookahead: The maximum number of frames produced ahead of the most recently requested frame.
+        """
+        if keyframe_interval < 1:
+            raise ValueError("The keyframe interval must be at least 1.")
+
+        self.keyframe_interval = keyframe_interval
+        self.cache_size = cache_size
+        self.lookahead = lookahead
+
+        self._frames = frames
+        self._keyframes: dict[int, np.ndarray] = {}
+        self._deltas: dict[int, Delta] = {}
+        self._cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._previous: Optional[np.ndarray] = None
+        self._count = 0
+        self._requested = 0
+        self._exhausted = False
+        self._closed = False
+        self._drain = False
+        self._error: Optional[BaseException] = None
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        """The number of frames produced so far."""
+        with self._condition:
+            return self._count
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the underlying iterator has been fully consumed."""
+        with self._condition:
+            return self._exhausted
+
+    def _store(self, frame: np.ndarray) -> None:
+        index = self._count
+        previous = self._previous
+
+        if index % self.keyframe_interval == 0 or previous is None or previous.shape != frame.shape:
+            self._keyframes[index] = frame.copy()
+        else:
+            indices = np.flatnonzero(previous != frame)
+            self._deltas[index] = (indices, frame.ravel()[indices])
+
+        self._previous = frame.copy()
+        self._count += 1
+
+    def _produce(self) -> None:
+        try:
+            for frame in self._frames:
+                with self._condition:
+                    while not self._closed and not self._drain and self._count > self._requested + self.lookahead:
+                        self._condition.wait()
+
+                    if self._closed:
+                        return
+
+                    self._store(frame)
+                    self._condition.notify_all()
+        except BaseException as e:
+            with self._condition:
+                self._error = e
+        finally:
+            with self._condition:
+                self._exhausted = True
+                self._condition.notify_all()
+
+    def _reconstruct(self, index: int) -> np.ndarray:
+        if index in self._cache:
+            self._cache.move_to_end(index)
+            return self._cache[index]
+
+        # start from the closest cached frame or keyframe before the requested index
+        start = index
+        while start not in self._keyframes and start not in self._cache:
+            start -= 1
+
+        frame = (self._cache[start] if start in self._cache else self._keyframes[start]).copy()
+        flat = frame.reshape(-1)
+        for delta_index in range(start + 1, index + 1):
+            indices, values = self._deltas[delta_index]
+            flat[indices] = values
+
+        self._cache[index] = frame
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return frame
+
+    def get(self, index: int, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Return the frame at a given index, waiting for the background thread to produce it if necessary.
+        :param index: The index of the frame.
+        :param timeout: The maximum time to wait in seconds, waits indefinitely if None.
+        :return: The frame or None if the frame does not exist (yet).
+        """
+        if index < 0:
+            return None
+
+        with self._condition:
+            if index > self._requested:
+                self._requested = index
+                self._condition.notify_all()
+
+            self._condition.wait_for(lambda: index < self._count or self._exhausted, timeout=timeout)
+
+            if self._error is not None:
+                raise self._error
+
+            if index >= self._count:
+                return None
+
+            return self._reconstruct(index)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Produce all remaining frames, e.g. to seek to the end.
+        :param timeout: The maximum time to wait in seconds, waits indefinitely if None.
+        :return: Whether the underlying iterator has been exhausted.
+        """
+        with self._condition:
+            self._drain = True
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._exhausted, timeout=timeout)
+
+            if self._error is not None:
+                raise self._error
+
+            return self._exhausted
+
+    def close(self) -> None:
+        """Stop pulling frames from the underlying iterator."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
@@ -0,0 +1,17 @@
+import numpy as np
+
+ARC_PALETTE = np.array([
+    [0, 0, 0],
+    [30, 147, 255],
+    [249, 60, 49],
+    [79, 204, 48],
+    [255, 220, 0],
+    [153, 153, 153],
+    [229, 58, 163],
+    [255, 133, 27],
+    [135, 216, 241],
+    [146, 18, 19]
+], dtype=np.uint8)
+"""
+The ARC color palette as 8-bit RGB values, indexed by color.
+"""
@@ -5,22 +5,40 @@ This module provides functionality to visualize the output of ARC puzzle generat
 using matplotlib for colorplots and tkinter for an interactive GUI.
 """
 import argparse
-import importlib
 import sys
 import tkinter as tk
 from pathlib import Path
 from tkinter import ttk
-from types import FunctionType
-from typing import Optional, Type
+from typing import Optional
 
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.colors import ListedColormap
 from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox
 
-from arc_puzzle_generator.playground import Playground
+from arc_puzzle_generator.playground import ModelSetup
+from arc_puzzle_generator.puzzles import get_puzzle
 from arc_puzzle_generator.utils.data_loader import load_puzzle, Puzzle
+from arc_puzzle_generator.utils.frame_buffer import FrameBuffer
+from arc_puzzle_generator.utils.palette import ARC_PALETTE
+
+ARC_COLORS = ARC_PALETTE / 255
+"""
+The ARC color palette as RGB values between 0 and 1, indexed by color.
+"""
+
+
+def _format_axes(grid: np.ndarray, ax: plt.Axes) -> None:
+    # Add grid lines
+    # ax.grid(which='major', axis='both', linestyle='-', color='k', linewidth=2)
+    ax.set_xticks(np.arange(-0.5, grid.shape[1], 1))
+    ax.set_yticks(np.arange(-0.5, grid.shape[0], 1))
+    ax.set_xticklabels([])
+    ax.set_yticklabels([])
 
 
 def plot_grid(grid: np.ndarray, ax: Optional[plt.Axes] = None) -> plt.Axes:
@@ -37,28 +55,10 @@ def plot_grid(grid: np.ndarray, ax: Optional[plt.Axes] = None) -> plt.Axes:
     if ax is None:
         _, ax = plt.subplots(figsize=(8, 8))
 
-    colors = np.array([
-        [0, 0, 0],
-        [30, 147, 255],
-        [249, 60, 49],
-        [79, 204, 48],
-        [255, 220, 0],
-        [153, 153, 153],
-        [229, 58, 163],
-        [255, 133, 27],
-        [135, 216, 241],
-        [146, 18, 19]
-    ]) / 255
-    cmap = ListedColormap(colors)
+    cmap = ListedColormap(ARC_COLORS)
 
     ax.imshow(grid, cmap=cmap, interpolation='nearest', vmin=0, vmax=9)
-
-    # Add grid lines
-    # ax.grid(which='major', axis='both', linestyle='-', color='k', linewidth=2)
-    ax.set_xticks(np.arange(-0.5, grid.shape[1], 1))
-    ax.set_yticks(np.arange(-0.5, grid.shape[0], 1))
-    ax.set_xticklabels([])
-    ax.set_yticklabels([])
+    _format_axes(grid, ax)
 
     # Add cell values as text
     for i in range(grid.shape[0]):
@@ -68,12 +68,113 @@ def plot_grid(grid: np.ndarray, ax: Optional[plt.Axes] = None) -> plt.Axes:
     return ax
 
 
+class GridRenderer:
+    """
+    Renders consecutive grids onto the same axes.
+    The image and text artists are created once and updated in place, only the region of changed cells is redrawn
+    and blitted onto the canvas, which keeps playback fast on large grids.
+    """
+
+    def __init__(self, ax: plt.Axes, show_values: bool = True) -> None:
+        """
+        Initialize the renderer.
+
+        :param ax: The matplotlib axes to render on.
+        :param show_values: Whether to show the cell values as text.
+        """
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.show_values = show_values
+        self.grid: Optional[np.ndarray] = None
+        self.image: Optional[AxesImage] = None
+        self.texts: list[list[Text]] = []
+        self.background = None
+
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event) -> None:
+        """Capture the static background after every full draw, e.g. after a resize."""
+        if self.image is None or self.image.axes is not self.ax:
+            # the axes have been cleared outside the renderer
+            self.image = None
+            return
+
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)  # type: ignore[attr-defined]
+        self.ax.draw_artist(self.image)
+        for row in self.texts:
+            for text in row:
+                self.ax.draw_artist(text)
+
+    def _setup(self, grid: np.ndarray) -> None:
+        self.ax.clear()
+        self.image = self.ax.imshow(
+            grid, cmap=ListedColormap(ARC_COLORS), interpolation='nearest', vmin=0, vmax=9, animated=True
+        )
+        _format_axes(grid, self.ax)
+
+        self.texts = [
+            [
+                self.ax.text(j, i, str(grid[i, j]), ha='center', va='center', color='w', animated=True,
+                             visible=self.show_values)
+                for j in range(grid.shape[1])
+            ]
+            for i in range(grid.shape[0])
+        ]
+
+        self.grid = grid.copy()
+        self.background = None
+        self.canvas.draw()
+
+    def render(self, grid: np.ndarray) -> None:
+        """
+        Render a grid, redrawing only the cells which changed since the previous grid.
+
+        :param grid: The grid to render.
+        """
+        if self.image is None or self.image.axes is not self.ax or self.grid is None or self.grid.shape != grid.shape:
+            self._setup(grid)
+            return
+
+        changed = np.argwhere(self.grid != grid)
+        if len(changed) == 0:
+            return
+
+        self.image.set_data(grid)
+        for i, j in changed.tolist():
+            self.texts[i][j].set_text(str(grid[i, j]))
+
+        self.grid = grid.copy()
+
+        if self.background is None or not self.canvas.supports_blit:
+            self.canvas.draw_idle()
+            return
+
+        (min_row, min_col), (max_row, max_col) = changed.min(axis=0), changed.max(axis=0)
+
+        # the background is restored for the whole axes, but only the changed region is blitted to the screen
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.image)
+        for row in self.texts[min_row:max_row + 1]:
+            for text in row[min_col:max_col + 1]:
+                self.ax.draw_artist(text)
+
+        corners = self.ax.transData.transform([
+            (min_col - 0.5, max_row + 0.5),
+            (max_col + 0.5, min_row - 0.5),
+        ])
+        region = Bbox.from_extents(
+            corners[:, 0].min() - 1, corners[:, 1].min() - 1,
+            corners[:, 0].max() + 1, corners[:, 1].max() + 1,
+        )
+        self.canvas.blit(Bbox.intersection(region, self.ax.bbox))
+
+
 class GeneratorVisualizer:
     """
     Tkinter-based GUI for visualizing generator steps.
     """
 
-    def __init__(self, model_function: FunctionType, puzzle: Puzzle):
+    def __init__(self, model_function: ModelSetup, puzzle: Puzzle):
         """
         Initialize the visualizer.
 
@@ -83,8 +184,7 @@ class GeneratorVisualizer:
         self.model_function = model_function
         self.puzzle = puzzle
         self.model = None
-        self.iterator = None
-        self.steps: list[np.ndarray] = []
+        self.frames: Optional[FrameBuffer] = None
         self.current_step = 0
         self.playing = False
         self.current_example_type = "train"
@@ -142,6 +242,7 @@ class GeneratorVisualizer:
         # Create the canvas
         self.canvas = FigureCanvasTkAgg(self.figure, master=self.main_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.renderer = GridRenderer(self.ax)
 
         # Create the control frame
         self.control_frame = ttk.Frame(self.parent_frame, padding=10, relief="raised", borderwidth=1)
@@ -201,27 +302,48 @@ class GeneratorVisualizer:
         else:  # test
             input_grid = self.puzzle.test[self.current_example_index].input
 
+        # Stop pulling frames from the previous generator
+        if self.frames is not None:
+            self.frames.close()
+
         # Create a new generator instance with the selected input
         self.model = self.model_function(input_grid)
 
-        # Reset steps and current step
-        self.steps = [step for step in self.model]
+        # Frames are pulled lazily in the background, so the first frame is shown immediately
+        self.frames = FrameBuffer(iter(self.model))
         self.current_step = 0
 
         # Update the display
         self.update_display()
 
+    @property
+    def last_step(self) -> Optional[int]:
+        """The index of the last step, or None if the generator has not been exhausted yet."""
+        if self.frames is None or not self.frames.exhausted:
+            return None
+
+        return len(self.frames) - 1
+
     def update_display(self):
         """Update the display with the current step."""
-        if 0 <= self.current_step < len(self.steps):
-            self.ax.clear()
-            plot_grid(self.steps[self.current_step], self.ax)
-            self.canvas.draw()
-            self.step_label.config(text=f"Step: {self.current_step}/{len(self.steps) - 1}")
+        if self.frames is None:
+            return
+
+        grid = self.frames.get(self.current_step)
+        if grid is not None:
+            self.renderer.render(grid)
+
+            last_step = self.last_step
+            total = f"{len(self.frames) - 1}+" if last_step is None else str(last_step)
+            self.step_label.config(text=f"Step: {self.current_step}/{total}")
+
+    def has_next_step(self) -> bool:
+        """Check if there is a step after the current one, producing it if necessary."""
+        return self.frames is not None and self.frames.get(self.current_step + 1) is not None
 
     def next_step(self):
         """Go to the next step."""
-        if self.current_step < len(self.steps) - 1:
+        if self.has_next_step():
             self.current_step += 1
             self.update_display()
 
@@ -238,8 +360,10 @@ class GeneratorVisualizer:
 
     def go_to_end(self):
         """Go to the last step by running the generator to completion."""
-        self.current_step = len(self.steps) - 1
-        self.update_display()
+        if self.frames is not None:
+            self.frames.wait()
+            self.current_step = len(self.frames) - 1
+            self.update_display()
 
     def toggle_play(self):
         """Toggle automatic playback of steps."""
@@ -254,7 +378,7 @@ class GeneratorVisualizer:
         """Play the next step and schedule the next one if still playing."""
         if self.playing:
             self.next_step()
-            if self.current_step < len(self.steps) - 1 or self.iterator is not None:
+            if self.has_next_step():
                 self.root.after(500, self.play_next_step)
             else:
                 self.playing = False
@@ -265,22 +389,18 @@ class GeneratorVisualizer:
         self.root.mainloop()
 
 
-def get_model_function(model_name: str) -> FunctionType:
+def get_model_function(model_name: str) -> ModelSetup:
     """
     Get a model function by name.
 
-    :param model_name: Name of the model function
+    :param model_name: Name of the model function or the ARC task id of its puzzle
     :returns: The model function
     """
-    module = importlib.import_module("arc_puzzle_generator.puzzles")
 
-    # Look for a class that matches the name
-    if hasattr(module, model_name):
-        attr = getattr(module, model_name)
-        if isinstance(attr, FunctionType):
-            return attr
-
-    raise AttributeError(f"No generator class found with name '{model_name}'")
+    try:
+        return get_puzzle(model_name)
+    except KeyError:
+        raise AttributeError(f"No generator class found with name '{model_name}'")
 
 
 def visualize_generator(generator_name: str, puzzle_id: str, base_dir: str = "tests/data"):
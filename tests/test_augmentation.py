@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+import numpy as np
+
+from arc_puzzle_generator.augmentation import apply_symmetry, SYMMETRIES, augment, Augmentation, augment_pairs, \
+    random_augmentation
+from arc_puzzle_generator.generation import sample_pairs
+from arc_puzzle_generator.puzzles import puzzle_two
+
+
+class AugmentationTestCase(TestCase):
+    def test_symmetries_are_distinct(self):
+        grid = np.arange(6).reshape(2, 3)
+        transformed = [apply_symmetry(grid, symmetry).tolist() for symmetry in SYMMETRIES]
+
+        self.assertEqual(8, len(set(str(t) for t in transformed)))
+        self.assertTrue(np.array_equal(grid.T[::-1, ::-1], apply_symmetry(grid, "anti_transpose")))
+
+    def test_augment_trajectory(self):
+        trajectory = np.random.default_rng(0).integers(0, 10, size=(5, 3, 4))
+        augmentation = random_augmentation(np.random.default_rng(1), fixed_colors=[0])
+        augmented = augment(trajectory, augmentation)
+
+        self.assertEqual(0, augmentation.permutation[0])
+        for grid, augmented_grid in zip(trajectory, augmented):
+            self.assertTrue(np.array_equal(augment(grid, augmentation), augmented_grid))
+
+    def test_augment_pairs_verification(self):
+        pairs = sample_pairs("puzzle_two", 5, seed=1)
+
+        # puzzle two is equivariant under color permutations
+        augmented_pairs = list(augment_pairs(
+            pairs, 2, seed=0, symmetries=["identity"], model_function=puzzle_two, verify_fraction=1.0
+        ))
+        self.assertEqual(10, len(augmented_pairs))
+
+        # but not under rotations, since the legend is part of the grid
+        with self.assertRaises(ValueError):
+            list(augment_pairs(pairs, 2, seed=0, symmetries=["rot90"], model_function=puzzle_two, verify_fraction=1.0))
+
+    def test_augment_color_permutation(self):
+        grid = np.array([[0, 1], [2, 3]])
+        permutation = np.array([0, 2, 1, 3, 4, 5, 6, 7, 8, 9])
+        augmented = augment(grid, Augmentation("identity", permutation))
+
+        self.assertTrue(np.array_equal(np.array([[0, 2], [1, 3]]), augmented))
@@ -0,0 +1,76 @@
+import copy
+import pickle
+from unittest import TestCase
+
+import numpy as np
+
+from arc_puzzle_generator.utils.color_schedule import ColorSchedule, MAX_PERIOD
+
+
+def scan(color_sequence: list[tuple[int, int]], background_color: int, offset: int) -> int:
+    for color, count in color_sequence:
+        if offset % count == 0:
+            return color
+
+    return background_color
+
+
+class ColorScheduleTestCase(TestCase):
+    def test_matches_scan(self):
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            color_sequence = [(int(rng.integers(1, 10)), int(rng.integers(1, 8))) for _ in range(rng.integers(0, 4))]
+            schedule = ColorSchedule(color_sequence, background_color=0)
+
+            expected = [scan(color_sequence, 0, offset) for offset in range(100)]
+            self.assertEqual(expected, [next(schedule) for _ in range(100)])
+            self.assertEqual(expected[37], schedule.color_at(37))
+            self.assertEqual(expected[5:25], ColorSchedule(color_sequence, offset=5).take(20))
+
+    def test_period(self):
+        schedule = ColorSchedule([(4, 2), (3, 3)])
+        self.assertEqual(6, schedule.period)
+        self.assertEqual([4, 0, 4, 3, 4, 0], schedule.colors.tolist())
+        self.assertEqual(3, schedule.color_at(6003))
+
+    def test_shared_table(self):
+        schedule = ColorSchedule([(4, 2), (3, 3)], offset=2)
+        other = ColorSchedule([(4, 2), (3, 3)])
+
+        # the table is only computed once colors are handed out, and then shared
+        self.assertIsNone(schedule._colors)
+        self.assertEqual(4, next(schedule))
+        self.assertIsNotNone(schedule._colors)
+        self.assertIs(schedule.colors, other.colors)
+        self.assertNotIn(b"numpy", pickle.dumps(schedule))
+
+    def test_long_period(self):
+        # the least common multiple of coprime frequencies exceeds the maximum period, the sequence is scanned instead
+        color_sequence = [(1, 101), (2, 103), (3, 107), (4, 109), (5, 113)]
+        schedule = ColorSchedule(color_sequence, background_color=9, offset=10_000)
+
+        self.assertGreater(schedule.period, MAX_PERIOD)
+        self.assertIsNone(schedule.colors)
+
+        expected = [scan(color_sequence, 9, offset) for offset in range(10_000, 10_200)]
+        self.assertEqual(expected[:100], [next(schedule) for _ in range(100)])
+        self.assertEqual(expected[100:], schedule.take(100))
+        self.assertEqual(scan(color_sequence, 9, 123_456), schedule.color_at(123_456 + schedule.period))
+
+    def test_take(self):
+        schedule = ColorSchedule([(1, 5)])
+        self.assertEqual([1, 0, 0], schedule.take(3))
+        self.assertEqual([0, 0, 1, 0], schedule.take(4))
+        self.assertEqual(0, next(schedule))
+        self.assertEqual(8, schedule.offset)
+
+    def test_copy_and_pickle(self):
+        schedule = ColorSchedule([(4, 2), (3, 3)])
+        schedule.take(3)
+
+        copied = copy.copy(schedule)
+        pickled = pickle.loads(pickle.dumps(schedule))
+        self.assertEqual([3, 4, 0], copied.take(3))
+        self.assertEqual([3, 4, 0], pickled.take(3))
+        self.assertEqual(3, next(schedule))
+        self.assertIs(schedule.colors, copied.colors)
@@ -0,0 +1,31 @@
+import pickle
+from itertools import chain, cycle, islice
+from unittest import TestCase
+
+from arc_puzzle_generator.utils.color_stream import ColorStream
+
+
+class ColorStreamTestCase(TestCase):
+    def test_matches_iterators(self):
+        self.assertEqual([1, 2, 3], list(ColorStream([1, 2, 3])))
+        self.assertEqual(list(islice(cycle([1, 2]), 7)), list(islice(ColorStream(repeat=[1, 2]), 7)))
+        self.assertEqual(
+            list(islice(chain([5, 6], cycle([1, 2, 3])), 10)),
+            list(islice(ColorStream([5, 6], repeat=[1, 2, 3]), 10)),
+        )
+        self.assertEqual([], list(ColorStream()))
+
+    def test_remaining(self):
+        for offset in range(8):
+            colors = ColorStream([5, 6], repeat=[1, 2, 3], offset=offset)
+            remaining, repeat = colors.remaining()
+
+            self.assertEqual(list(islice(colors, 10)), list(islice(ColorStream(remaining, repeat), 10)))
+
+    def test_pickle(self):
+        colors = ColorStream([[1, 2]], repeat=[[3, 4]])
+        next(colors)
+
+        copied = pickle.loads(pickle.dumps(colors))
+        self.assertEqual([[3, 4], [3, 4]], [next(copied), next(copied)])
+        self.assertEqual(1, colors.offset)
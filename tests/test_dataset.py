@@ -0,0 +1,92 @@
+import tempfile
+from multiprocessing import Process, Queue
+from pathlib import Path
+from typing import Optional
+from unittest import TestCase
+
+import numpy as np
+
+from arc_puzzle_generator.dataset import DatasetWriter, Record, read_dataset, pack_grid, unpack_grid, INDEX_ENTRY
+from arc_puzzle_generator.generation import sample_pairs
+
+
+def produce(queue: "Queue[Optional[Record]]", seed: int) -> None:
+    for pair in sample_pairs("puzzle_one", 5, seed=seed):
+        queue.put(Record(input=pair.input, output=pair.output))
+    queue.put(None)
+
+
+class DatasetTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_pack_grid(self):
+        grid = np.array([[0, 1, 2], [9, 15, 3], [4, 5, 6]])
+        self.assertEqual(5, len(pack_grid(grid)))
+        self.assertTrue(np.array_equal(grid, unpack_grid(pack_grid(grid), grid.shape)))
+
+        with self.assertRaises(ValueError):
+            pack_grid(np.array([[16]]))
+
+    def test_write_read_deduplicate(self):
+        pairs = sample_pairs("puzzle_two", 10, seed=3)
+        trajectory = np.stack([pairs[0].input, pairs[0].output])
+
+        with DatasetWriter(self.path, max_shard_size=512) as writer:
+            self.assertTrue(writer.write(Record(pairs[0].input, pairs[0].output, trajectory)))
+            self.assertFalse(writer.write(Record(pairs[0].input, pairs[0].output)))
+            for pair in pairs[1:]:
+                writer.write(Record(pair.input, pair.output))
+
+            self.assertEqual(1, writer.num_duplicates)
+
+        self.assertGreater(len(list(self.path.glob("shard-*.bin"))), 1)
+
+        records = list(read_dataset(self.path))
+        self.assertEqual(10, len(records))
+        assert records[0].trajectory is not None
+        self.assertTrue(np.array_equal(trajectory, records[0].trajectory))
+        self.assertIsNone(records[1].trajectory)
+        for pair, record in zip(pairs, records):
+            self.assertTrue(np.array_equal(pair.input, record.input))
+            self.assertTrue(np.array_equal(pair.output, record.output))
+
+    def test_resume_after_interruption(self):
+        pairs = sample_pairs("puzzle_one", 4, seed=1)
+
+        with DatasetWriter(self.path) as writer:
+            for pair in pairs[:3]:
+                writer.write(Record(pair.input, pair.output))
+
+        # simulate an interruption while writing the last record and its index entry
+        with (self.path / "shard-00000.bin").open("ab") as shard:
+            shard.write(b"\x01\x02\x03")
+        with (self.path / "shard-00000.idx").open("ab") as index:
+            index.write(b"\x00" * (INDEX_ENTRY.size // 2))
+
+        with DatasetWriter(self.path) as writer:
+            self.assertFalse(writer.write(Record(pairs[0].input, pairs[0].output)))
+            self.assertTrue(writer.write(Record(pairs[3].input, pairs[3].output)))
+
+        records = list(read_dataset(self.path))
+        self.assertEqual(4, len(records))
+        self.assertTrue(np.array_equal(pairs[3].input, records[3].input))
+
+    def test_consume_from_processes(self):
+        queue: "Queue[Optional[Record]]" = Queue()
+        producers = [Process(target=produce, args=(queue, seed)) for seed in (1, 1, 2)]
+        for producer in producers:
+            producer.start()
+
+        with DatasetWriter(self.path) as writer:
+            writer.consume(queue, num_producers=len(producers))
+
+        for producer in producers:
+            producer.join()
+
+        # the second producer writes the same records as the first one
+        self.assertEqual(10, len(list(read_dataset(self.path))))
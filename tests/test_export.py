@@ -0,0 +1,58 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+from PIL import Image
+
+from arc_puzzle_generator.export import rasterize, unique_frames, export_frames, export_puzzles, ExportJob, \
+    ARC_PALETTE
+from arc_puzzle_generator.puzzles import puzzle_two
+from arc_puzzle_generator.utils.data_loader import load_puzzle
+from tests.utils import test_dir
+
+
+class ExportTestCase(TestCase):
+    def test_rasterize(self):
+        grid = np.array([[0, 1], [2, 3]])
+        image = rasterize(grid, cell_size=4, line_width=0)
+
+        self.assertEqual((8, 8, 3), image.shape)
+        self.assertTrue(np.all(image[4:, :4] == ARC_PALETTE[2]))
+        self.assertTrue(np.all(image[:4, 4:] == ARC_PALETTE[1]))
+
+    def test_unique_frames(self):
+        frames = [np.zeros((2, 2)), np.zeros((2, 2)), np.ones((2, 2)), np.ones((2, 2)), np.zeros((2, 2))]
+        self.assertEqual(3, len(list(unique_frames(frames))))
+
+    def test_export_frames(self):
+        puzzle = load_puzzle(test_dir / "data" / "3e6067c3.json")
+
+        with tempfile.TemporaryDirectory() as directory:
+            gif_path = Path(directory) / "puzzle.gif"
+            num_frames = export_frames(puzzle_two(puzzle.train[0].input), gif_path)
+
+            with Image.open(gif_path) as image:
+                self.assertEqual(num_frames, image.n_frames)
+
+            png_path = Path(directory) / "puzzle.png"
+            export_frames(puzzle_two(puzzle.train[0].input), png_path, cell_size=8, columns=num_frames)
+
+            with Image.open(png_path) as image:
+                self.assertEqual(puzzle.train[0].input.shape[1] * 8 * num_frames + 4 * (num_frames - 1), image.width)
+
+    def test_export_puzzles(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = [
+                ExportJob(
+                    generator="puzzle_two",
+                    puzzle_path=test_dir / "data" / "3e6067c3.json",
+                    example_type="train",
+                    example_index=index,
+                    output_path=Path(directory) / f"{index}.png",
+                ) for index in range(2)
+            ]
+            num_frames = export_puzzles(jobs, processes=2)
+
+            self.assertEqual(2, len(num_frames))
+            self.assertTrue(all(job.output_path.exists() for job in jobs))
@@ -0,0 +1,40 @@
+from itertools import count
+from unittest import TestCase
+
+import numpy as np
+
+from arc_puzzle_generator.puzzles.puzzle_two import puzzle_two
+from arc_puzzle_generator.utils.data_loader import load_puzzle
+from arc_puzzle_generator.utils.frame_buffer import FrameBuffer
+from tests.utils import test_dir
+
+
+class FrameBufferTestCase(TestCase):
+    def test_frames_match_playground(self):
+        puzzle = load_puzzle(test_dir / "data" / "3e6067c3.json")
+        expected = list(puzzle_two(puzzle.train[0].input))
+        frames = FrameBuffer(puzzle_two(puzzle.train[0].input), keyframe_interval=4, cache_size=2)
+
+        self.assertTrue(frames.wait(timeout=10))
+        self.assertEqual(len(expected), len(frames))
+
+        # seek backwards to reconstruct frames from keyframes and deltas
+        for index in reversed(range(len(expected))):
+            frame = frames.get(index)
+            assert frame is not None
+            self.assertTrue(np.array_equal(expected[index], frame))
+
+        self.assertLessEqual(len(frames._cache), 2)
+        self.assertIsNone(frames.get(len(expected)))
+
+    def test_lazy_lookahead(self):
+        # an infinite generator must not be drained
+        frames = FrameBuffer((np.full((2, 2), i) for i in count()), lookahead=3)
+
+        frame = frames.get(5, timeout=10)
+        assert frame is not None
+        self.assertTrue(np.all(frame == 5))
+        self.assertFalse(frames.exhausted)
+        self.assertLessEqual(len(frames), 5 + 3 + 2)
+
+        frames.close()
@@ -0,0 +1,74 @@
+from itertools import combinations
+from unittest import TestCase
+
+import numpy as np
+
+from arc_puzzle_generator.generation import SAMPLERS, SamplerConfig, sample_pairs, generate_pairs
+from arc_puzzle_generator.puzzles.puzzle_hundredfive import same_diagonal
+from arc_puzzle_generator.utils.grid import unmask
+
+
+class GenerationTestCase(TestCase):
+    def test_samplers(self):
+        config = SamplerConfig(min_size=(10, 10), max_size=(30, 30), min_entities=2, max_entities=6)
+
+        for puzzle in SAMPLERS:
+            with self.subTest(puzzle=puzzle):
+                pairs = sample_pairs(puzzle, 20, config=config, seed=42)
+
+                self.assertEqual(20, len(pairs))
+                for pair in pairs:
+                    self.assertGreaterEqual(pair.input.shape[0], 10)
+                    self.assertLessEqual(pair.input.shape[1], 30)
+                    self.assertEqual(pair.input.shape, pair.output.shape)
+                    self.assertFalse(np.array_equal(pair.input, pair.output))
+
+    def test_sample_puzzle_two_path(self):
+        _, sampler = SAMPLERS["puzzle_two"]
+        input_grid = sampler(np.random.default_rng(0), (20, 20), 5)
+        background_color = input_grid[0, 0]
+
+        legend = [color for color in input_grid[-2, :] if color != background_color]
+        self.assertEqual(5, len(legend))
+
+    def test_sample_puzzle_one_gives_up(self):
+        _, sampler = SAMPLERS["puzzle_one"]
+
+        # a single row can never make the separator more frequent than the colors of the row
+        with self.assertRaises(ValueError):
+            sampler(np.random.default_rng(0), (1, 4), 3)
+
+        input_grid = sampler(np.random.default_rng(0), (3, 4), 3)
+        self.assertEqual((3, 4), input_grid.shape)
+
+    def test_sample_puzzle_hundredfive_entities(self):
+        _, sampler = SAMPLERS["puzzle_hundredfive"]
+
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                input_grid = sampler(np.random.default_rng(seed), (12, 12), 4)
+
+                # every blue point is paired up with exactly one other blue point
+                blue_points = sorted(unmask(input_grid == 1))
+                pairs = [
+                    (point1, point2) for point1, point2 in combinations(blue_points, 2)
+                    if same_diagonal(point1, point2)
+                ]
+                self.assertEqual(4, len(pairs))
+                self.assertEqual(8, len({point for pair in pairs for point in pair}))
+
+        with self.assertRaises(ValueError):
+            sampler(np.random.default_rng(0), (3, 3), 3)
+
+    def test_generate_pairs(self):
+        pairs = list(generate_pairs("puzzle_two", 10, processes=2, chunk_size=3, seed=7))
+        same_pairs = list(generate_pairs("puzzle_two", 10, processes=2, chunk_size=3, seed=7))
+
+        self.assertEqual(10, len(pairs))
+        self.assertTrue(all(
+            np.array_equal(pair.input, same_pair.input) for pair, same_pair in zip(pairs, same_pairs)
+        ))
+
+    def test_generate_pairs_unknown_puzzle(self):
+        with self.assertRaises(KeyError):
+            next(generate_pairs("puzzle_three", 1))
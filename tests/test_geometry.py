@@ -1,6 +1,7 @@
+import pickle
 from unittest import TestCase
 
-from arc_puzzle_generator.geometry import in_grid
+from arc_puzzle_generator.geometry import in_grid, PointSet, point_set_in_grid
 
 
 class GeometryTestCase(TestCase):
@@ -11,3 +12,32 @@ class GeometryTestCase(TestCase):
 
         self.assertTrue(in_grid(point_inside, grid_size))
         self.assertFalse(in_grid(point_outside, grid_size))
+
+    def test_point_set_bounds(self):
+        point_set = PointSet([(1, 2), (3, 0), (2, 5)])
+        self.assertEqual((1, 0, 3, 5), point_set.bounds)
+        self.assertIsNone(PointSet().bounds)
+
+        # the cached bounding box moves with the point set
+        shifted = point_set.shift((-1, 2))
+        self.assertEqual((0, 2, 2, 7), shifted._bounds)
+        self.assertEqual(PointSet([(0, 4), (2, 2), (1, 7)]), shifted)
+
+        point_set.add((4, 1))
+        self.assertEqual((1, 0, 4, 5), point_set.bounds)
+
+        point_set.discard((2, 5))
+        self.assertEqual((1, 0, 4, 2), point_set.bounds)
+
+        point_set -= {(4, 1)}
+        self.assertEqual((1, 0, 3, 2), point_set.bounds)
+
+        point_set |= {(9, 9)}
+        self.assertEqual((1, 0, 9, 9), point_set.bounds)
+        self.assertEqual(point_set.bounds, pickle.loads(pickle.dumps(point_set)).bounds)
+
+    def test_point_set_in_grid(self):
+        self.assertTrue(point_set_in_grid(PointSet([(0, 0), (2, 2)]), (3, 3)))
+        self.assertFalse(point_set_in_grid(PointSet([(0, 0), (2, 3)]), (3, 3)))
+        self.assertFalse(point_set_in_grid(PointSet([(-1, 0)]), (3, 3)))
+        self.assertTrue(point_set_in_grid(PointSet(), (3, 3)))
@@ -1,8 +1,9 @@
+import random
 from unittest import TestCase
 
-from arc_puzzle_generator.geometry import PointSet
+from arc_puzzle_generator.geometry import PointSet, Point
 from arc_puzzle_generator.neighbourhood import resolve_point_set_neighbourhood, VonNeumannNeighbourhood, \
-    MooreNeighbourhood, moore_neighbours, von_neumann_neighbours
+    MooreNeighbourhood, moore_neighbours, von_neumann_neighbours, dilate, AxisNeighbourhood
 
 
 class NeighbourhoodTestCase(TestCase):
@@ -46,3 +47,51 @@ class NeighbourhoodTestCase(TestCase):
         }
 
         self.assertEqual(expected_van_neumann, resolve_point_set_neighbourhood(point_set, von_neumann_neighbours))
+
+    def test_dilation_matches_point_wise_resolution(self):
+        rng = random.Random(0)
+        neighbourhoods = [
+            moore_neighbours, von_neumann_neighbours, MooreNeighbourhood(size=3), VonNeumannNeighbourhood(size=4)
+        ]
+
+        for size in (1, 5, 200):
+            point_set = PointSet((rng.randrange(-5, 20), rng.randrange(0, 20)) for _ in range(size))
+
+            for neighbourhood in neighbourhoods:
+                expected = set().union(*[neighbourhood(point) for point in point_set]) - point_set
+                self.assertEqual(expected, resolve_point_set_neighbourhood(point_set, neighbourhood))
+
+    def test_dilation_with_mask(self):
+        # a sparse stencil which does not fill its bounding box
+        stencil = PointSet([(0, 3), (-2, 0)])
+        point_set = PointSet((x, y) for x in range(100) for y in range(100) if (x + y) % 3 == 0)
+
+        expected = {(x + dx, y + dy) for x, y in point_set for dx, dy in stencil}
+        self.assertEqual(expected, dilate(point_set, stencil))
+
+    def test_dilation_without_origin(self):
+        # the stencil of a Moore neighbourhood fills its bounding box except for the origin
+        stencil = PointSet((dx, dy) for dx in range(-1, 2) for dy in range(-1, 2) if (dx, dy) != (0, 0))
+        rng = random.Random(3)
+
+        # small point sets are dilated with set operations, large ones separably on a mask
+        for size in (3, 400, 1000):
+            point_set = PointSet((rng.randrange(0, 60), rng.randrange(0, 60)) for _ in range(size))
+            point_set.add((100, 100))
+
+            expected = {(x + dx, y + dy) for x, y in point_set for dx, dy in stencil}
+            dilated = dilate(point_set, stencil)
+            self.assertEqual(expected, dilated)
+            self.assertNotIn((100, 100), dilated)
+
+        self.assertEqual(expected | point_set, dilate(point_set, PointSet(stencil | {(0, 0)})))
+
+    def test_neighbourhood_without_stencil(self):
+        def diagonal_neighbours(point: Point) -> PointSet:
+            return PointSet([(point[0] + 1, point[1] + 1)])
+
+        point_set = PointSet({(1, 1), (2, 2)})
+        self.assertEqual({(3, 3)}, resolve_point_set_neighbourhood(point_set, diagonal_neighbours))
+
+        axis = AxisNeighbourhood(grid_size=(3, 3), axis="horizontal")
+        self.assertEqual({(0, 1), (2, 1)}, resolve_point_set_neighbourhood(PointSet({(1, 1)}), axis))
@@ -0,0 +1,87 @@
+from collections import Counter
+from itertools import cycle
+from unittest import TestCase
+
+import numpy as np
+
+from arc_puzzle_generator.agent import Agent
+from arc_puzzle_generator.direction import identity_direction, clockwise_direction_90
+from arc_puzzle_generator.geometry import PointSet
+from arc_puzzle_generator.neighbourhood import von_neumann_neighbours
+from arc_puzzle_generator.observer import Observer, SampledObserver
+from arc_puzzle_generator.playground import Playground, ExecutionMode
+from arc_puzzle_generator.rule import RuleNode, CollisionConditionRule
+from arc_puzzle_generator.state import AgentState, AgentStep
+from arc_puzzle_generator.topology import all_topology
+
+
+class CountingObserver(Observer):
+    def __init__(self):
+        self.added: list[int] = []
+        self.fired: Counter[int] = Counter()
+        self.written: Counter[int] = Counter()
+        self.terminated: list[int] = []
+
+    def agent_added(self, agent_id: int, agent: Agent) -> None:
+        self.added.append(agent_id)
+
+    def rule_fired(self, agent_id: int, node: RuleNode, state: AgentState) -> None:
+        self.fired[agent_id] += 1
+
+    def cells_written(self, agent_id: int, step: AgentStep) -> None:
+        self.written[agent_id] += 1
+
+    def agent_terminated(self, agent_id: int, agent: Agent) -> None:
+        self.terminated.append(agent_id)
+
+
+def make_agents() -> list[Agent]:
+    node = RuleNode(
+        CollisionConditionRule(direction_rule=identity_direction, conditions=[(False, "none")]),
+        alternative_node=RuleNode(
+            CollisionConditionRule(direction_rule=clockwise_direction_90, update_position=False),
+        ),
+    )
+
+    return [
+        Agent(position=PointSet([(x, 4)]), direction="none", label="wall", colors=iter([5]), charge=0)
+        for x in range(6)
+    ] + [
+        Agent(position=PointSet([(1, 0)]), direction="right", label="beam", node=node, colors=cycle([1]), charge=5),
+        Agent(position=PointSet([(4, 0)]), direction="right", label="beam", node=node, colors=cycle([2]), charge=8),
+    ]
+
+
+class ObserverTestCase(TestCase):
+    def test_hooks(self):
+        modes: list[ExecutionMode] = ["sequential", "parallel", "synchronous", "event"]
+        for execution_mode in modes:
+            observer = CountingObserver()
+            agents = make_agents()
+            playground = Playground(np.zeros((12, 12), dtype=int), agents, neighbourhood=von_neumann_neighbours,
+                                    topology=all_topology, execution_mode=execution_mode, observers=[observer])
+            list(playground)
+
+            beams = playground.dynamic_agents
+            self.assertEqual(list(range(len(beams))), observer.added)
+            self.assertEqual(sorted(observer.terminated), list(range(len(beams))))
+
+            for agent_id, agent in enumerate(beams):
+                self.assertEqual(len(agent.history) - 1, observer.fired[agent_id])
+
+                # the initial position and every step with charge left are written
+                self.assertEqual(sum(1 for state in agent.history if state.charge > 0), observer.written[agent_id])
+
+    def test_sampled_observer(self):
+        for fraction, expected in ((0.0, set()), (1.0, {0, 1})):
+            observer = CountingObserver()
+            list(Playground(np.zeros((12, 12), dtype=int), make_agents(), neighbourhood=von_neumann_neighbours,
+                            topology=all_topology, observers=[SampledObserver(observer, fraction, seed=0)]))
+
+            self.assertEqual(expected, set(observer.added))
+            self.assertEqual(expected, set(observer.fired))
+            self.assertEqual(expected, set(observer.written))
+            self.assertEqual(expected, set(observer.terminated))
+
+        with self.assertRaises(ValueError):
+            SampledObserver(CountingObserver(), 1.5)
@@ -0,0 +1,79 @@
+from itertools import cycle
+from unittest import TestCase
+
+import numpy as np
+
+from arc_puzzle_generator.agent import Agent
+from arc_puzzle_generator.direction import identity_direction, clockwise_direction_90
+from arc_puzzle_generator.geometry import PointSet, Direction
+from arc_puzzle_generator.neighbourhood import von_neumann_neighbours
+from arc_puzzle_generator.partition import PartitionedPlayground, Tiling
+from arc_puzzle_generator.playground import Playground
+from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, CollisionConditionRule
+from arc_puzzle_generator.topology import all_topology
+
+
+def make_agents(grid_size: tuple[int, int], num_agents: int, seed: int) -> list[Agent]:
+    rng = np.random.default_rng(seed)
+    directions: list[Direction] = ["up", "down", "left", "right"]
+
+    # beams which turn when they are blocked, surrounded by a few walls
+    node = RuleNode(
+        OutOfGridRule(grid_size=grid_size),
+        alternative_node=RuleNode(
+            CollisionConditionRule(direction_rule=identity_direction, conditions=[(False, "none")]),
+            alternative_node=RuleNode(
+                CollisionConditionRule(direction_rule=clockwise_direction_90, update_position=False),
+            ),
+        ),
+    )
+
+    agents = [
+        Agent(position=PointSet([(x, 5)]), direction="none", label="wall", colors=iter([5]), charge=0)
+        for x in range(3, 9)
+    ]
+    cells = rng.choice(grid_size[0] * grid_size[1], size=num_agents, replace=False)
+    for index, cell in enumerate(cells):
+        x, y = divmod(int(cell), grid_size[1])
+        if y == 5 and 3 <= x < 9:
+            continue
+
+        agents.append(Agent(
+            position=PointSet([(x, y)]),
+            direction=directions[int(rng.integers(4))],
+            label="beam",
+            node=node,
+            colors=cycle([1 + index % 4, 6]),
+            charge=int(rng.integers(3, 12)),
+        ))
+
+    return agents
+
+
+class PartitionTestCase(TestCase):
+    def test_tiling(self):
+        tiling = Tiling(grid_size=(10, 9), tiles=(2, 3))
+        self.assertEqual(0, tiling.owner(PointSet([(4, 2), (7, 7)])))
+        self.assertEqual(5, tiling.owner(PointSet([(5, 6)])))
+        self.assertEqual(2, tiling.owner(PointSet([(-3, 12)])))
+
+    def test_matches_synchronous_playground(self):
+        grid_size = (12, 12)
+        kwargs = dict(neighbourhood=von_neumann_neighbours, topology=all_topology, backfill_color=0, max_steps=30)
+
+        expected = list(Playground(
+            np.zeros(grid_size, dtype=int), make_agents(grid_size, 24, seed=0), execution_mode="synchronous", **kwargs
+        ))
+
+        with PartitionedPlayground(
+                np.zeros(grid_size, dtype=int), make_agents(grid_size, 24, seed=0), tiles=(2, 2), **kwargs
+        ) as playground:
+            steps = list(playground)
+
+        self.assertEqual(len(expected), len(steps))
+        for expected_step, step in zip(expected, steps):
+            self.assertTrue(np.array_equal(expected_step, step))
+
+    def test_halo_required(self):
+        with self.assertRaises(ValueError):
+            PartitionedPlayground(np.zeros((4, 4), dtype=int), [], neighbourhood=lambda point: PointSet([point]))
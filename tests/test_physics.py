@@ -1,9 +1,11 @@
 import unittest
+from unittest.mock import patch
 
 import numpy as np
 
 from arc_puzzle_generator.geometry import PointSet
-from arc_puzzle_generator.physics import collision_axis
+from arc_puzzle_generator.physics import collision_axis, squared_distance_field, RayIndex, RAY_DIRECTIONS, \
+    direction_to_unit_vector, free_runs
 from arc_puzzle_generator.utils.entities import direction_to_numpy_unit_vector
 
 
@@ -28,3 +30,69 @@ class PhysicsTestCase(unittest.TestCase):
         orientation = collision_axis(agent)
 
         self.assertEqual("horizontal", orientation)
+
+    def test_squared_distance_field(self):
+        mask = np.zeros((4, 5), dtype=bool)
+        mask[0, 0] = True
+        mask[3, 4] = True
+
+        expected = np.array([
+            [min(x ** 2 + y ** 2, (x - 3) ** 2 + (y - 4) ** 2) for y in range(5)] for x in range(4)
+        ])
+        self.assertTrue(np.array_equal(expected, squared_distance_field(mask)))
+        self.assertTrue(np.all(squared_distance_field(np.zeros((2, 2), dtype=bool)) == -1))
+
+    def test_squared_distance_field_envelope(self):
+        def brute_force(mask: np.ndarray) -> np.ndarray:
+            marked = np.argwhere(mask)
+            cells = np.indices(mask.shape).reshape(2, -1).T
+            return ((cells[:, None, :] - marked[None, :, :]) ** 2).sum(axis=2).min(axis=1).reshape(mask.shape)
+
+        rng = np.random.default_rng(0)
+        for shape in [(1, 7), (9, 1), (13, 8), (60, 45)]:
+            for density in [0.001, 0.05, 0.5]:
+                mask = rng.random(shape) < density
+                mask[rng.integers(shape[0]), rng.integers(shape[1])] = True
+
+                with self.subTest(shape=shape, density=density):
+                    # grids beyond the limit are combined with the lower envelope, force it for the small ones
+                    with patch("arc_puzzle_generator.physics.DENSE_DISTANCE_LIMIT", 0):
+                        self.assertTrue(np.array_equal(brute_force(mask), squared_distance_field(mask)))
+
+    def test_ray_index(self):
+        def brute_force(occupied: np.ndarray, vector: tuple[int, int]) -> np.ndarray:
+            rows, cols = occupied.shape
+            free = np.zeros((rows, cols), dtype=int)
+            for x in range(rows):
+                for y in range(cols):
+                    px, py = x + vector[0], y + vector[1]
+                    while 0 <= px < rows and 0 <= py < cols and not occupied[px, py]:
+                        free[x, y] += 1
+                        px, py = px + vector[0], py + vector[1]
+            return free
+
+        rng = np.random.default_rng(0)
+        occupied = rng.random((6, 7)) < 0.3
+        index = RayIndex(occupied)
+
+        for _ in range(20):
+            points = [(int(rng.integers(6)), int(rng.integers(7))) for _ in range(3)]
+            value = bool(rng.random() < 0.5)
+            index.update(points, value)
+            for x, y in points:
+                occupied[x, y] = value
+
+            for direction_idx, direction in enumerate(RAY_DIRECTIONS):
+                expected = brute_force(occupied, direction_to_unit_vector(direction))
+                self.assertTrue(np.array_equal(expected, index.free[direction_idx]))
+
+        index = RayIndex(np.zeros((3, 5), dtype=bool))
+        index.update([(1, 3)], True)
+        self.assertEqual(2, index.free_run((1, 0), "right"))
+        self.assertEqual(0, index.free_run((1, 4), "left"))
+        self.assertEqual(
+            [True, False], index.collides_within(np.array([[1, 0], [0, 0]]), "right", 3).tolist()
+        )
+
+        with self.assertRaises(ValueError):
+            free_runs(np.zeros((2, 2), dtype=bool), (0, 0))
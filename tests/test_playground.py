@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from itertools import cycle
 from unittest import TestCase
 from unittest.mock import MagicMock
@@ -7,8 +8,11 @@ import numpy as np
 from arc_puzzle_generator.agent import Agent
 from arc_puzzle_generator.direction import identity_direction
 from arc_puzzle_generator.geometry import PointSet
+from arc_puzzle_generator.neighbourhood import moore_neighbours, resolve_point_set_neighbourhood, \
+    von_neumann_neighbours
 from arc_puzzle_generator.playground import Playground
 from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, CollisionConditionRule
+from arc_puzzle_generator.topology import all_topology, FixedGroupTopology
 
 
 class PlaygroundTestCase(TestCase):
@@ -210,3 +214,278 @@ class PlaygroundTestCase(TestCase):
         playground = Playground(grid, [agent], max_steps=max_steps)
         steps = list(playground)
         self.assertEqual(max_steps, len(steps))
+
+    def test_neighbourhood_moves_with_agent(self):
+        agent = Agent(
+            position=PointSet([(0, 0), (0, 1), (1, 0)]),
+            direction="right",
+            label="A",
+            node=RuleNode(CollisionConditionRule(
+                direction_rule=identity_direction,
+                conditions=[(False, "none")]
+            )),
+            colors=cycle([1]),
+            charge=-1,
+        )
+        playground = Playground(np.zeros((5, 10), dtype=int), [agent], neighbourhood=moore_neighbours)
+
+        for _ in range(3):
+            playground.step()
+            cached_position, neighbourhood = playground.neighbourhood_cache[agent]
+            self.assertEqual(resolve_point_set_neighbourhood(cached_position, moore_neighbours), neighbourhood)
+
+        # a teleported agent is resolved from scratch
+        agent.position = PointSet([(4, 4)])
+        self.assertEqual(moore_neighbours((4, 4)), playground._resolve_neighbourhood(agent))
+
+    def test_eligible_groups_cache(self):
+        def make_agent(label: str, position: tuple[int, int]) -> Agent:
+            return Agent(
+                position=PointSet([position]),
+                direction="none",
+                label=label,
+                node=RuleNode(OutOfGridRule(grid_size=(3, 3))),
+                colors=iter([1]),
+                charge=0,
+            )
+
+        playground = Playground(np.zeros((3, 3), dtype=int), [make_agent("a", (0, 0))], topology=all_topology)
+        self.assertEqual([playground.agents_by_label["a"]], playground._eligible_groups("a"))
+
+        # a new label invalidates dynamic topologies
+        playground.add_agent(make_agent("b", (1, 1)))
+        self.assertEqual({0: "a", 1: "b"}, {label_id: label for label, label_id in playground.label_ids.items()})
+        groups = playground._eligible_groups("a")
+        self.assertEqual([["a"], ["b"]], [[agent.label for agent in group] for group in groups])
+
+        # agents with a known label are part of the cached groups
+        playground.add_agent(make_agent("b", (2, 2)))
+        self.assertIs(groups, playground._eligible_groups("a"))
+        self.assertEqual(2, len(groups[1]))
+
+        static = Playground(np.zeros((3, 3), dtype=int), [make_agent("a", (0, 0))], topology=FixedGroupTopology({"b"}))
+        groups = static._eligible_groups("a")
+        self.assertEqual([[]], groups)
+        static.add_agent(make_agent("b", (1, 1)))
+        self.assertIs(groups, static._eligible_groups("a"))
+        self.assertEqual(1, len(groups[0]))
+
+    def test_static_layer(self):
+        obstacles = [
+            Agent(position=PointSet([(1, 3), (1, 4)]), direction="none", label="wall", colors=iter([5]), charge=0),
+            # inert agents may reach outside the grid
+            Agent(position=PointSet([(-1, 0), (0, 0)]), direction="none", label="corner", colors=iter([6]), charge=0),
+        ]
+        agent = Agent(
+            position=PointSet([(1, 1)]),
+            direction="right",
+            label="agent",
+            node=RuleNode(CollisionConditionRule(
+                direction_rule=identity_direction,
+                conditions=[(False, "none")]
+            )),
+            colors=cycle([1]),
+            charge=-1,
+        )
+
+        playground = Playground(
+            np.zeros((3, 5), dtype=int),
+            [*obstacles, agent],
+            neighbourhood=von_neumann_neighbours,
+            topology=all_topology,
+        )
+        self.assertEqual([agent], playground.dynamic_agents)
+        self.assertEqual(3, len(playground.agents))
+        self.assertEqual((-1, 0), playground.static_origin)
+        self.assertEqual(2, np.sum(playground.static_layers["wall"] >= 0))
+        self.assertEqual(2, np.sum(playground.static_layers["corner"] >= 0))
+
+        captured = MagicMock(wraps=agent.steps)
+        agent.steps = captured  # type: ignore[method-assign]
+
+        playground.step()
+        playground.step()
+        self.assertEqual(PointSet([(1, 2)]), agent.position)
+
+        collision, collision_mapping = captured.call_args.args
+        self.assertEqual({(1, 3)}, collision)
+        self.assertEqual(0, collision_mapping[(1, 3)].charge)
+        self.assertEqual(PointSet([(1, 3), (1, 4)]), collision_mapping[(1, 3)].position)
+
+    def test_synchronous_mode(self):
+        def make_agents() -> list[Agent]:
+            # the leading agent is processed first, the trailing agent only moves into free cells
+            return [
+                Agent(
+                    position=PointSet([(0, start)]),
+                    direction="right",
+                    label=label,
+                    node=RuleNode(CollisionConditionRule(
+                        direction_rule=identity_direction,
+                        conditions=[(False, "none")]
+                    )),
+                    colors=cycle([color]),
+                    charge=2,
+                )
+                for label, start, color in (("lead", 1, 1), ("trail", 0, 2))
+            ]
+
+        parallel_agents = make_agents()
+        parallel = Playground(np.zeros((1, 4), dtype=int), parallel_agents, execution_mode="parallel",
+                              neighbourhood=von_neumann_neighbours, topology=all_topology)
+        num_frames = len(parallel.steps)
+        parallel.step()
+        self.assertEqual(PointSet([(0, 1)]), parallel_agents[1].position)
+        self.assertEqual(num_frames + 2, len(parallel.steps))
+
+        # in synchronous mode the trailing agent still observes the leading agent at the start of the tick
+        for executor in (None, ThreadPoolExecutor(max_workers=2)):
+            agents = make_agents()
+            synchronous = Playground(np.zeros((1, 4), dtype=int), agents, execution_mode="synchronous",
+                                     neighbourhood=von_neumann_neighbours, topology=all_topology,
+                                     executor=executor)
+            synchronous.step()
+            self.assertEqual(PointSet([(0, 0)]), agents[1].position)
+            self.assertEqual(PointSet([(0, 2)]), agents[0].position)
+            self.assertEqual([2, 1, 1, 0], synchronous.output_grid[0].tolist())
+
+            # all writes of a tick are committed as a single frame
+            self.assertEqual(num_frames + 1, len(synchronous.steps))
+
+            if executor is not None:
+                executor.shutdown()
+
+    def test_event_mode(self):
+        def make_agents() -> list[Agent]:
+            # a queue of agents, only the head of the queue has a free path
+            return [
+                Agent(
+                    position=PointSet([(0, start)]),
+                    direction="right",
+                    label="queue",
+                    node=RuleNode(CollisionConditionRule(
+                        direction_rule=identity_direction,
+                        conditions=[(False, "none")]
+                    )),
+                    colors=cycle([color]),
+                    charge=charge,
+                )
+                for start, color, charge in ((0, 1, -1), (1, 2, -1), (2, 3, 2))
+            ]
+
+        trajectories = []
+        calls = []
+        for execution_mode in ("parallel", "event"):
+            agents = make_agents()
+            captured = MagicMock(wraps=agents[0].steps)
+            agents[0].steps = captured  # type: ignore[method-assign]
+
+            playground = Playground(np.zeros((1, 6), dtype=int), agents, neighbourhood=von_neumann_neighbours,
+                                    execution_mode=execution_mode, backfill_color=0, max_steps=20)
+            trajectories.append([step.tolist() for step in playground])
+            calls.append(captured.call_count)
+
+        self.assertEqual(trajectories[0], trajectories[1])
+        self.assertEqual([[0, 0, 1, 2, 0, 0]], trajectories[1][-1])
+        self.assertLess(calls[1], calls[0])
+
+        # sleeping agents can be woken up explicitly
+        agents = make_agents()[:2]
+        agents[1].direction = "left"
+        playground = Playground(np.zeros((1, 6), dtype=int), agents, neighbourhood=von_neumann_neighbours,
+                                execution_mode="event")
+        playground.step()
+        self.assertEqual({0, 1}, set(playground.subscribed))
+
+        agents[1].position = PointSet([(0, 4)])
+        playground.wake(agents[0], delay=1)
+        playground.step()
+        self.assertEqual(PointSet([(0, 0)]), agents[0].position)
+        playground.step()
+        self.assertEqual(PointSet([(0, 1)]), agents[0].position)
+
+    def test_fast_forward(self):
+        def make_agents() -> list[Agent]:
+            node = RuleNode(
+                OutOfGridRule(grid_size=(3, 8)),
+                alternative_node=RuleNode(CollisionConditionRule(
+                    direction_rule=identity_direction,
+                    conditions=[(False, "none")]
+                )),
+            )
+            return [
+                Agent(position=PointSet([(0, 6)]), direction="none", label="wall", colors=iter([5]), charge=0),
+                # a wide beam which leaves the grid, and a beam which is blocked by the wall
+                Agent(position=PointSet([(1, 0), (2, 0)]), direction="right", label="beam", node=node,
+                      colors=cycle([3]), charge=-1),
+                Agent(position=PointSet([(0, 0)]), direction="right", label="beam", node=node,
+                      colors=cycle([1, 2]), charge=-1),
+            ]
+
+        trajectories = []
+        evaluated_positions = []
+        for fast_forward in (False, True):
+            agents = make_agents()
+            beam_steps = agents[2].steps
+            positions: list[PointSet] = []
+
+            def record(*args, **kwargs):
+                positions.append(agents[2].position)
+                return beam_steps(*args, **kwargs)
+
+            agents[2].steps = record  # type: ignore[method-assign]
+
+            playground = Playground(np.zeros((3, 8), dtype=int), agents, neighbourhood=von_neumann_neighbours,
+                                    topology=all_topology, execution_mode="sequential", backfill_color=0,
+                                    fast_forward=fast_forward)
+            trajectories.append([step.tolist() for step in playground])
+            evaluated_positions.append(positions)
+
+        self.assertEqual(trajectories[0], trajectories[1])
+        self.assertEqual(PointSet([(1, 7), (2, 7)]), agents[1].position)
+        self.assertEqual(PointSet([(0, 5)]), agents[2].position)
+
+        # the rules of the beam are only evaluated once it is blocked
+        self.assertEqual(PointSet([(0, 0)]), evaluated_positions[0][0])
+        self.assertEqual({(0, 5)}, set.union(*evaluated_positions[1]))
+
+    def test_fast_forward_ray_index(self):
+        def make_agents() -> list[Agent]:
+            def node() -> RuleNode:
+                return RuleNode(
+                    OutOfGridRule(grid_size=(4, 10)),
+                    alternative_node=RuleNode(CollisionConditionRule(
+                        direction_rule=identity_direction,
+                        conditions=[(False, "none")]
+                    )),
+                )
+
+            return [
+                Agent(position=PointSet([(2, 8)]), direction="none", label="wall", colors=iter([5]), charge=0),
+                # a beam whose own cells are ahead of it, which runs out of charge before the wall
+                Agent(position=PointSet([(2, 0), (2, 2)]), direction="right", label="beam", node=node(),
+                      colors=cycle([3]), charge=4),
+                # a beam which stops at the first beam
+                Agent(position=PointSet([(0, 6)]), direction="down", label="beam", node=node(),
+                      colors=cycle([1, 2]), charge=-1),
+            ]
+
+        trajectories = []
+        for fast_forward in (False, True):
+            agents = make_agents()
+            playground = Playground(np.zeros((4, 10), dtype=int), agents, neighbourhood=von_neumann_neighbours,
+                                    topology=all_topology, execution_mode="sequential", fast_forward=fast_forward)
+            trajectories.append([step.tolist() for step in playground])
+
+        self.assertEqual(trajectories[0], trajectories[1])
+        self.assertEqual(PointSet([(2, 4), (2, 6)]), agents[1].position)
+        self.assertEqual(PointSet([(1, 6)]), agents[2].position)
+
+        # the ray indices follow the agents of their label
+        for label, index in playground.ray_indices.items():
+            occupied = np.zeros((4, 10), dtype=bool)
+            for agent in agents:
+                if agent.label == label:
+                    occupied[tuple(np.array(list(agent.position)).T)] = True
+
+            self.assertTrue(np.array_equal(occupied, index.occupied))
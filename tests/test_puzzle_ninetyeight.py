@@ -40,3 +40,9 @@ class PuzzleNinetyEight(TestCase):
         playground = puzzle_ninetyeight(self.puzzle.test[0].input)
         *_, output_grid = playground
         self.assertTrue(np.array_equal(output_grid, self.puzzle.test[0].output))
+
+    @unittest.skip("This test is not solvable with proximity or rewards")
+    def test_generate_cb2d8a2c_prompt_second(self):
+        playground = puzzle_ninetyeight(self.puzzle.test[1].input)
+        *_, output_grid = playground
+        self.assertTrue(np.array_equal(output_grid, self.puzzle.test[1].output))
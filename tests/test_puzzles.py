@@ -0,0 +1,68 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+import numpy as np
+
+import arc_puzzle_generator.puzzles as puzzles
+from arc_puzzle_generator.puzzles import PUZZLES, TASKS, get_puzzle
+from arc_puzzle_generator.utils.data_loader import load_puzzle
+from tests.utils import test_dir
+
+IMPORT_TIME_TARGET = 50_000
+"""
+The maximum cumulative import time of the puzzles package in microseconds.
+"""
+
+
+class PuzzlesTestCase(TestCase):
+    def test_registry(self):
+        for name, task in PUZZLES.items():
+            self.assertTrue((test_dir / "data" / f"{task}.json").exists())
+            self.assertEqual(name, get_puzzle(name).__name__)
+            self.assertIs(get_puzzle(name), get_puzzle(task))
+            self.assertIs(get_puzzle(name), getattr(puzzles, name))
+            self.assertEqual(name, TASKS[task])
+
+        with self.assertRaises(KeyError):
+            get_puzzle("puzzle_three")
+
+        with self.assertRaises(AttributeError):
+            getattr(puzzles, "puzzle_three")
+
+    def test_submodule_import(self):
+        # importing from a puzzle module must not shadow the setup of the puzzle
+        from arc_puzzle_generator.puzzles.puzzle_ten import puzzle_ten
+        from arc_puzzle_generator.puzzles import puzzle_ten as setup
+        import arc_puzzle_generator.puzzles.puzzle_ten as other_setup
+
+        self.assertIs(puzzle_ten, setup)
+        self.assertIs(puzzle_ten, other_setup)
+        self.assertIs(puzzle_ten, sys.modules["arc_puzzle_generator.puzzles.puzzle_ten"].puzzle_ten)
+
+    def test_package_setup(self):
+        from arc_puzzle_generator.puzzles import puzzle_two
+
+        puzzle = load_puzzle(test_dir / "data" / f"{PUZZLES['puzzle_two']}.json")
+        *_, output_grid = puzzle_two(puzzle.train[0].input)
+        np.testing.assert_array_equal(puzzle.train[0].output, output_grid)
+
+    def test_import_time(self):
+        result = subprocess.run(
+            [
+                sys.executable, "-X", "importtime", "-c",
+                "import sys, arc_puzzle_generator.puzzles; "
+                "print('arc_puzzle_generator.playground' in sys.modules)",
+            ],
+            capture_output=True, text=True, check=True,
+        )
+
+        # no puzzle module, and therefore none of their dependencies, is imported with the package
+        self.assertEqual("False", result.stdout.strip())
+
+        cumulative = [
+            int(line.split("|")[1]) for line in result.stderr.splitlines()
+            if line.split("|")[-1].strip() == "arc_puzzle_generator.puzzles"
+        ]
+        self.assertEqual(1, len(cumulative))
+        self.assertLess(cumulative[0], IMPORT_TIME_TARGET)
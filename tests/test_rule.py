@@ -1,14 +1,49 @@
-from typing import cast
+from collections import deque
+from typing import cast, Sequence
 from unittest import TestCase
 
-from arc_puzzle_generator.direction import orthogonal_direction, snake_direction, DirectionTransformer
-from arc_puzzle_generator.geometry import PointSet, Direction
+import numpy as np
+
+from arc_puzzle_generator.direction import orthogonal_direction, snake_direction, DirectionTransformer, \
+    identity_direction
+from arc_puzzle_generator.geometry import PointSet, Direction, Point, in_grid
+from arc_puzzle_generator.physics import direction_to_unit_vector, shift
 from arc_puzzle_generator.rule import OutOfGridRule, \
     TrappedCollisionRule, backtrack_rule, \
-    CollisionConditionRule, COLLIDE_ALL
+    CollisionConditionRule, COLLIDE_ALL, ProximityRule, RewardRule, RuleNode, straight_line_chain, StraightLine
 from arc_puzzle_generator.state import AgentState
 
 
+def breadth_first_rewards(
+        grid_size: Point,
+        directions: Sequence[Direction],
+        target: PointSet,
+        denylist: PointSet,
+        gamma: float,
+) -> dict[Point, float]:
+    # the value table as computed by RewardRule before it was stored in an array
+    q_table = {point: 1.0 for point in target}
+    visited = PointSet(target)
+    points = deque(target)
+
+    while len(points) > 0:
+        point = points.popleft()
+
+        for direction in directions:
+            next_point = shift(point, direction_to_unit_vector(direction))
+
+            if in_grid(next_point, grid_size) and next_point not in visited:
+                visited.add(next_point)
+                points.append(next_point)
+
+                if next_point in denylist:
+                    q_table[next_point] = 0.00001
+                else:
+                    q_table[next_point] = q_table[point] * (1 - gamma)
+
+    return q_table
+
+
 def dummy_direction_rule(direction: Direction) -> Direction:
     #  Returns a fixed direction for testing
     return "up"
@@ -197,3 +232,101 @@ class RuleTest(TestCase):
         new_state, new_colors, new_agents = result
 
         self.assertEqual(states[0], new_state)
+
+    def test_proximity_rule(self):
+        grid = PointSet([(x, y) for x in range(5) for y in range(5)])
+        rule = ProximityRule(target=PointSet([(x, 4) for x in range(5)]), points=grid)
+
+        states = [AgentState(PointSet([(2, 0)]), "right", 1, -1)]
+        result = rule(states, iter([1]), PointSet(), {})
+        assert result is not None
+        self.assertEqual(PointSet([(2, 1)]), result[0].position)
+        self.assertEqual("right", result[0].direction)
+
+        # an obstacle to the right forces a detour, ties are broken by the order of the candidates
+        result = rule(states, iter([1]), PointSet([(2, 1)]), {})
+        assert result is not None
+        self.assertIn(result[0].direction, ("up", "down"))
+        self.assertEqual(
+            min([(1, 0), (3, 0)], key=list(rule.candidates).index),
+            next(iter(result[0].position)),
+        )
+
+        # the choice does not depend on collisions away from the agent
+        collision = PointSet([(2, 1)] + [(x, 4) for x in range(5)] + [(0, 3), (4, 3)])
+        distant_result = rule(states, iter([1]), collision, {})
+        assert distant_result is not None
+        self.assertEqual(result[0].position, distant_result[0].position)
+
+        # the agent stops once it covers the target
+        rule = ProximityRule(target=PointSet([(2, 4)]), points=grid)
+        states = [AgentState(PointSet([(2, 4)]), "right", 1, -1)]
+        result = rule(states, iter([1]), PointSet(), {})
+        assert result is not None
+        self.assertEqual(PointSet([(2, 4)]), result[0].position)
+        self.assertEqual(0, result[0].charge)
+
+    def test_reward_rule(self):
+        directions: list[Direction] = ["down", "up", "right", "left"]
+        target = PointSet([(x, 4) for x in range(5)])
+        rule = RewardRule(grid_size=(5, 5), directions=directions, target=target, gamma=0.5)
+
+        self.assertEqual(1.0, rule.q_table[2, 4])
+        self.assertEqual(0.25, rule.q_table[2, 2])
+        self.assertIs(rule.q_table, RewardRule((5, 5), directions, PointSet(target), gamma=0.5).q_table)
+
+        states = [AgentState(PointSet([(2, 0), (2, 1)]), "right", 1, -1)]
+        result = rule(states, iter([1]), PointSet(), {})
+        assert result is not None
+        self.assertEqual(PointSet([(2, 1), (2, 2)]), result[0].position)
+        self.assertEqual("right", result[0].direction)
+
+        # the best direction is blocked
+        result = rule(states, iter([1]), PointSet([(2, 2)]), {})
+        assert result is not None
+        self.assertEqual("down", result[0].direction)
+
+        denied = RewardRule((5, 5), directions, target, denylist=PointSet([(2, 3)]), gamma=0.5)
+        self.assertEqual(0.00001, denied.q_table[2, 3])
+        self.assertAlmostEqual(0.000005, denied.q_table[2, 2])
+        self.assertEqual(0.25, denied.q_table[1, 2])
+
+    def test_reward_table_breadth_first(self):
+        rng = np.random.default_rng(0)
+        all_directions: list[Direction] = ["down", "up", "right", "left"]
+
+        for index in range(20):
+            grid_size = (int(rng.integers(3, 12)), int(rng.integers(3, 12)))
+            directions = [all_directions[index] for index in rng.permutation(4)[:int(rng.integers(2, 5))]]
+            target = PointSet((int(x), int(rng.integers(0, grid_size[1]))) for x in range(grid_size[0]))
+            # every other table is computed without a denylist
+            num_denied = 6 if index % 2 == 0 else 0
+            denylist = PointSet((int(x), int(y)) for x, y in zip(
+                rng.integers(0, grid_size[0], num_denied), rng.integers(0, grid_size[1], num_denied)
+            ))
+
+            with self.subTest(grid_size=grid_size, directions=directions):
+                rule = RewardRule(grid_size, directions, target, denylist=denylist, gamma=0.3)
+                expected = breadth_first_rewards(grid_size, directions, target, denylist, gamma=0.3)
+
+                for x in range(grid_size[0]):
+                    for y in range(grid_size[1]):
+                        self.assertEqual(expected.get((x, y), 0.0), rule.q_table[x, y])
+
+    def test_straight_line_chain(self):
+        line = CollisionConditionRule(direction_rule=identity_direction, conditions=[(False, "none")])
+
+        self.assertEqual(StraightLine(grid_size=None), straight_line_chain(RuleNode(line)))
+        self.assertEqual(
+            StraightLine(grid_size=(5, 5)),
+            straight_line_chain(RuleNode(OutOfGridRule(grid_size=(5, 5)), alternative_node=RuleNode(line))),
+        )
+
+        self.assertIsNone(straight_line_chain(None))
+        self.assertIsNone(straight_line_chain(RuleNode(line, next_node=RuleNode(line))))
+        self.assertIsNone(straight_line_chain(RuleNode(
+            CollisionConditionRule(direction_rule=identity_direction, conditions=[(False, "none")], border_color=2)
+        )))
+        self.assertIsNone(straight_line_chain(RuleNode(
+            OutOfGridRule(grid_size=(5, 5), terminate_on_grid_leave=False), alternative_node=RuleNode(line)
+        )))
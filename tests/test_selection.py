@@ -2,7 +2,8 @@ from unittest import TestCase
 
 from arc_puzzle_generator.geometry import PointSet
 from arc_puzzle_generator.neighbourhood import moore_neighbours
-from arc_puzzle_generator.selection import resolve_point_set_selectors_with_direction, resolve_cell_selection
+from arc_puzzle_generator.selection import resolve_point_set_selectors_with_direction, resolve_cell_selection, \
+    occupancy_code, direction_bit, OCCUPANCY_DIRECTIONS
 
 
 class SelectorsTestCase(TestCase):
@@ -75,3 +76,19 @@ class SelectorsTestCase(TestCase):
 
         points_bottom_right = PointSet([(2, 2)])
         self.assertEqual(points_bottom_right, resolve_cell_selection(points, "bottom_right"))
+
+    def test_occupancy_code(self):
+        point_set = PointSet([(1, 1), (1, 2), (2, 1)])
+        neighbourhood = PointSet([(0, 1), (3, 3), (2, 1), (2, 3)])
+
+        code = occupancy_code(point_set, neighbourhood)
+        for direction in OCCUPANCY_DIRECTIONS:
+            expected = len(resolve_point_set_selectors_with_direction(point_set, neighbourhood, direction)) > 0
+            self.assertEqual(expected, bool(code & direction_bit(direction)), direction)
+
+        # only the masked bits are computed, the result is independent of which set is iterated
+        mask = direction_bit("up") | direction_bit("left")
+        self.assertEqual(code & mask, occupancy_code(point_set, neighbourhood, mask))
+        self.assertEqual(code, occupancy_code(point_set, PointSet(list(neighbourhood)[:2])) | occupancy_code(
+            point_set, PointSet(list(neighbourhood)[2:])
+        ))
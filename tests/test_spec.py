@@ -0,0 +1,85 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from itertools import cycle, islice
+from unittest import TestCase
+
+import numpy as np
+
+from arc_puzzle_generator.agent import Agent
+from arc_puzzle_generator.geometry import PointSet
+from arc_puzzle_generator.playground import Playground
+from arc_puzzle_generator.puzzles import PUZZLES, get_puzzle
+from arc_puzzle_generator.spec import describe_playground, build_playground, describe_colors, build_colors, \
+    simulate, ColorSpec
+from arc_puzzle_generator.utils.color_stream import ColorStream
+from arc_puzzle_generator.utils.data_loader import load_puzzle
+from tests.utils import test_dir
+
+
+def load_inputs(name: str) -> list[np.ndarray]:
+    puzzle = load_puzzle(test_dir / "data" / f"{PUZZLES[name]}.json")
+    return [example.input for example in puzzle.train + puzzle.test]
+
+
+class SpecTestCase(TestCase):
+    def test_round_trip(self):
+        for name in ["puzzle_two", "puzzle_ten", "puzzle_eighteen", "puzzle_ninetyeight", "puzzle_hundredfive"]:
+            for input_grid in load_inputs(name):
+                with self.subTest(name=name):
+                    expected = list(get_puzzle(name)(input_grid.copy()))
+
+                    spec = pickle.loads(pickle.dumps(describe_playground(get_puzzle(name)(input_grid.copy()))))
+                    steps = list(build_playground(spec))
+
+                    self.assertEqual(len(expected), len(steps))
+                    for expected_step, step in zip(expected, steps):
+                        np.testing.assert_array_equal(expected_step, step)
+
+    def test_shared_nodes(self):
+        spec = describe_playground(get_puzzle("puzzle_ninetyeight")(load_inputs("puzzle_ninetyeight")[0]))
+        playground = build_playground(spec)
+
+        nodes = {id(agent.node) for agent in playground.agents if agent.node is not None}
+        self.assertLessEqual(len(nodes), len(spec.nodes))
+
+    def test_colors(self):
+        for consumed in range(7):
+            colors = ColorStream([1], repeat=[2, 3, 4])
+            for _ in range(consumed):
+                next(colors)
+
+            spec = describe_colors(colors)
+            self.assertEqual(list(islice(colors, 8)), list(islice(build_colors(spec), 8)))
+
+        colors = ColorStream([4, 5, 6])
+        next(colors)
+        self.assertEqual(ColorSpec(colors=[5, 6], repeat=[]), describe_colors(colors))
+
+        with self.assertRaises(ValueError):
+            describe_colors(cycle([1, 2]))
+
+    def test_undescribable(self):
+        grid = np.zeros((5, 5), dtype=int)
+        agent = Agent(position=PointSet([(0, 0)]), direction="right", label="agent", colors=ColorStream([1]))
+        playground = Playground(grid, [agent], topology=lambda *args: None)
+
+        with self.assertRaises(ValueError):
+            describe_playground(playground)
+
+        playground = Playground(grid, [agent])
+        next(iter(playground))
+        with self.assertRaises(ValueError):
+            describe_playground(playground)
+
+    def test_pool(self):
+        specs = [
+            describe_playground(get_puzzle("puzzle_two")(input_grid))
+            for input_grid in load_inputs("puzzle_two")
+        ]
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            output_grids = list(executor.map(simulate, specs))
+
+        for input_grid, output_grid in zip(load_inputs("puzzle_two"), output_grids):
+            *_, expected = get_puzzle("puzzle_two")(input_grid)
+            np.testing.assert_array_equal(expected, output_grid)
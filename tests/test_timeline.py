@@ -0,0 +1,70 @@
+import json
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from arc_puzzle_generator.neighbourhood import von_neumann_neighbours
+from arc_puzzle_generator.playground import Playground
+from arc_puzzle_generator.timeline import TimelineObserver
+from arc_puzzle_generator.topology import all_topology
+from tests.test_observer import make_agents
+
+
+class TimelineTestCase(TestCase):
+    def test_timeline(self):
+        timeline = TimelineObserver()
+        playground = Playground(np.zeros((12, 12), dtype=int), make_agents(), neighbourhood=von_neumann_neighbours,
+                                topology=all_topology, observers=[timeline])
+        list(playground)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "timeline.json"
+            timeline.save(path)
+            events = json.loads(path.read_text())["traceEvents"]
+
+        tracks = {event["tid"] for event in events if event["name"] == "thread_name"}
+        self.assertEqual({0, 1}, tracks)
+
+        for agent_id, agent in enumerate(playground.dynamic_agents):
+            steps = [event for event in events if event.get("tid") == agent_id and event["name"] == "step"]
+            rules = [event for event in events if event.get("tid") == agent_id and "fired" in event.get("args", {})]
+
+            # every rule span is nested in a step span
+            self.assertGreater(len(steps), 0)
+            for rule in rules:
+                self.assertTrue(any(
+                    step["ts"] <= rule["ts"] and rule["ts"] + rule["dur"] <= step["ts"] + step["dur"] for step in steps
+                ))
+
+            self.assertEqual(len(agent.history) - 1, sum(1 for rule in rules if rule["args"]["fired"]))
+            self.assertEqual({"CollisionConditionRule"}, {rule["args"]["rule"] for rule in rules})
+
+    def test_collision_span(self):
+        timeline = TimelineObserver()
+        playground = Playground(np.zeros((12, 12), dtype=int), make_agents(), neighbourhood=von_neumann_neighbours,
+                                topology=all_topology, observers=[timeline])
+        resolve_collisions = playground._resolve_collisions
+
+        def slow_resolve_collisions(*args, **kwargs):
+            time.sleep(0.01)
+            return resolve_collisions(*args, **kwargs)
+
+        with patch.object(playground, "_resolve_collisions", slow_resolve_collisions):
+            list(islice(playground, 4))
+
+        collisions = [event for event in timeline.events if event["name"] == "collisions"]
+        rules = [event for event in timeline.events if "fired" in event.get("args", {})]
+
+        # the collision resolution is recorded in its own span, the rule spans start after it
+        self.assertGreater(len(collisions), 0)
+        self.assertTrue(all(event["dur"] >= 10_000 for event in collisions))
+        self.assertTrue(all(rule["dur"] < 10_000 for rule in rules))
+        for collision in collisions:
+            self.assertTrue(any(
+                rule["tid"] == collision["tid"] and rule["ts"] == collision["ts"] + collision["dur"] for rule in rules
+            ))
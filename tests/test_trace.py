@@ -0,0 +1,87 @@
+import tempfile
+from itertools import cycle
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+
+from arc_puzzle_generator.agent import Agent
+from arc_puzzle_generator.direction import identity_direction, clockwise_direction_90
+from arc_puzzle_generator.geometry import PointSet
+from arc_puzzle_generator.neighbourhood import von_neumann_neighbours
+from arc_puzzle_generator.playground import Playground
+from arc_puzzle_generator.rule import RuleNode, OutOfGridRule, CollisionConditionRule
+from arc_puzzle_generator.topology import all_topology
+from arc_puzzle_generator.trace import TraceRecorder, TraceReplay, save_trace, load_trace, EXPLICIT_COLOR
+
+
+def make_playground(recorder: TraceRecorder) -> Playground:
+    grid_size = (10, 10)
+    node = RuleNode(
+        OutOfGridRule(grid_size=grid_size),
+        alternative_node=RuleNode(
+            CollisionConditionRule(direction_rule=identity_direction, conditions=[(False, "none")]),
+            alternative_node=RuleNode(
+                CollisionConditionRule(direction_rule=clockwise_direction_90, update_position=False),
+            ),
+        ),
+    )
+
+    agents = [
+        Agent(position=PointSet([(x, 6)]), direction="none", label="wall", colors=iter([5]), charge=0)
+        for x in range(2, 8)
+    ]
+    agents.append(Agent(
+        position=PointSet([(4, 1)]), direction="right", label="beam", node=node, colors=cycle([1, 2]), charge=12
+    ))
+    agents.append(Agent(
+        position=PointSet([(8, 1), (8, 2)]), direction="up", label="bar", node=node, colors=cycle([[3, 4]]), charge=6
+    ))
+
+    return Playground(
+        np.zeros(grid_size, dtype=int), agents, neighbourhood=von_neumann_neighbours, topology=all_topology,
+        backfill_color=0, recorder=recorder,
+    )
+
+
+class TraceTestCase(TestCase):
+    def test_replay(self):
+        recorder = TraceRecorder()
+        expected = list(make_playground(recorder))
+        trace = recorder.trace()
+
+        self.assertTrue(np.any(trace.flags & EXPLICIT_COLOR))
+        self.assertEqual(len(expected), trace.num_frames + 1)
+
+        replay = TraceReplay(trace)
+        steps = list(replay)
+        self.assertEqual(len(expected), len(steps))
+        for expected_step, step in zip(expected, steps):
+            self.assertTrue(np.array_equal(expected_step, step))
+
+        # random access, including going backwards
+        for frame in (len(expected) - 1, 3, 0, 7):
+            self.assertTrue(np.array_equal(expected[frame], replay.grid_at(frame)))
+
+        with self.assertRaises(ValueError):
+            replay.grid_at(len(expected))
+
+    def test_save_and_load(self):
+        recorder = TraceRecorder()
+        expected = list(make_playground(recorder))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "trace.npz"
+            save_trace(recorder.trace(), path)
+            trace = load_trace(path)
+
+        self.assertEqual(recorder.trace().num_frames, trace.num_frames)
+        for expected_step, step in zip(expected, TraceReplay(trace), strict=True):
+            self.assertTrue(np.array_equal(expected_step, step))
+
+    def test_single_trajectory(self):
+        recorder = TraceRecorder()
+        make_playground(recorder)
+
+        with self.assertRaises(ValueError):
+            make_playground(recorder)
@@ -0,0 +1,53 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from arc_puzzle_generator.visualization import GridRenderer
+
+
+class GridRendererTestCase(TestCase):
+    def setUp(self):
+        self.figure = Figure(figsize=(4, 4))
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        self.renderer = GridRenderer(self.ax)
+
+    def test_render_updates_artists_in_place(self):
+        grid = np.zeros((5, 5), dtype=int)
+        self.renderer.render(grid)
+        image = self.renderer.image
+        self.assertIsNotNone(self.renderer.background)
+
+        self.renderer.canvas.blit = MagicMock()
+        next_grid = grid.copy()
+        next_grid[1, 2] = 3
+        self.renderer.render(next_grid)
+
+        self.assertIs(image, self.renderer.image)
+        assert self.renderer.image is not None
+        self.assertTrue(np.array_equal(next_grid, self.renderer.image.get_array()))
+        self.assertEqual("3", self.renderer.texts[1][2].get_text())
+        self.renderer.canvas.blit.assert_called_once()
+
+        # the blitted region only covers the changed cell
+        region = self.renderer.canvas.blit.call_args.args[0]
+        self.assertLess(region.width, self.ax.bbox.width / 2)
+        self.assertLess(region.height, self.ax.bbox.height / 2)
+
+    def test_render_unchanged_grid_is_skipped(self):
+        grid = np.zeros((3, 3), dtype=int)
+        self.renderer.render(grid)
+
+        self.renderer.canvas.blit = MagicMock()
+        self.renderer.render(grid.copy())
+        self.renderer.canvas.blit.assert_not_called()
+
+    def test_render_new_shape(self):
+        self.renderer.render(np.zeros((3, 3), dtype=int))
+        self.renderer.render(np.ones((4, 2), dtype=int))
+
+        self.assertEqual(4, len(self.renderer.texts))
+        self.assertEqual(2, len(self.renderer.texts[0]))